@@ -0,0 +1,57 @@
+"""
+Benchmark DatabaseManager in open-per-call mode against pooled connections.
+
+Runs the miner's hot-path statement mix (insert, status update, existence check, finished-execution scan)
+against a scratch database and prints operations per second for each mode.
+
+    python benchmarks/bench_database_manager.py --ops 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pkg.database.database_manager as dm
+from pkg.database.database_manager import DatabaseManager
+from qbittensor.miner.miner_table_initializer import MinerTableInitializer
+
+
+def run(db_manager: DatabaseManager, ops: int) -> float:
+    """Run the statement mix `ops` times and return the elapsed seconds"""
+    start = time.perf_counter()
+    for i in range(ops):
+        execution_id = f"exec-{i}"
+        db_manager.query_and_commit_with_values(
+            "INSERT OR REPLACE INTO executions (execution_id, status, timestamp) VALUES (?, 'Pending', '2025-01-01 00:00:00')",
+            (execution_id,),
+        )
+        db_manager.query_and_commit_with_values(
+            "UPDATE executions SET status = 'Queued' WHERE execution_id = ?",
+            (execution_id,),
+        )
+        db_manager.row_exists("executions", "execution_id=?", (execution_id,))
+        db_manager.query_with_values(
+            "SELECT execution_id FROM executions WHERE timestamp > ? AND status != 'Running' LIMIT 10",
+            ("2024-01-01 00:00:00",),
+        )
+    return time.perf_counter() - start
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        dm.data_dir = os.path.join(tmp, "data")
+        for label, pooled in (("open-per-call", False), ("pooled", True)):
+            db_manager = DatabaseManager(f"bench_{label}", pooled=pooled)
+            MinerTableInitializer(db_manager).create_tables()
+            elapsed = run(db_manager, args.ops)
+            db_manager.close()
+            statements = args.ops * 4
+            print(f"{label:>14}: {elapsed:8.3f}s  {statements / elapsed:10.0f} statements/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseManager connection modes")
+    parser.add_argument("--ops", help="Number of iterations of the statement mix", type=int, default=2000)
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,58 @@
+"""
+Benchmark the execution storage backends on the miner's write path.
+
+Each iteration runs one execution through the repository lifecycle (Pending insert, Queued update, Completed
+upsert) plus an existence check, then a finished-execution scan is timed over the result.
+
+    python benchmarks/bench_execution_store.py --ops 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pkg.database.database_manager as dm
+from pkg.database.database_manager import DatabaseManager
+from qbittensor.miner.miner_table_initializer import MinerTableInitializer
+from qbittensor.miner.runtime.storage import ExecutionRecord, ExecutionStore, get_execution_store
+from qbittensor.miner.runtime.write_behind import WriteBehindWriter
+
+
+def run(store: ExecutionStore, ops: int) -> float:
+    """Run the lifecycle `ops` times and return the elapsed seconds"""
+    start = time.perf_counter()
+    for i in range(ops):
+        execution_id = f"exec-{i}"
+        ts = f"2025-01-01 {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}"
+        store.upsert(ExecutionRecord(execution_id=execution_id, status="Pending", timestamp=ts, shots=100))
+        store.update(execution_id, status="Queued", provider_job_id=f"prov-{i}", timestamp=ts)
+        store.upsert(ExecutionRecord(execution_id=execution_id, status="Completed", timestamp=ts, shots=100, metadata_json="{}"))
+        store.exists(execution_id)
+    store.flush()
+    return time.perf_counter() - start
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        dm.data_dir = os.path.join(tmp, "data")
+        for label in ("sqlite", "sqlite+write-behind", "mmap", "memory"):
+            db_manager = DatabaseManager(f"bench_{label.replace('+', '_')}", pooled=True)
+            MinerTableInitializer(db_manager).create_tables()
+            write_behind = WriteBehindWriter(db_manager) if label == "sqlite+write-behind" else None
+            store = get_execution_store(db_manager, label.split("+")[0], write_behind=write_behind)
+            store.start()
+            elapsed = run(store, args.ops)
+            scan_start = time.perf_counter()
+            found = len(store.finished_since("1970-01-01 00:00:00"))
+            scan = time.perf_counter() - scan_start
+            store.close()
+            db_manager.close()
+            print(f"{label:>20}: {elapsed:8.3f}s  {args.ops * 4 / elapsed:10.0f} ops/s  scan of {found} in {scan * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark execution storage backends")
+    parser.add_argument("--ops", help="Number of executions to run through the lifecycle", type=int, default=2000)
+    args = parser.parse_args()
+
+    main(args)
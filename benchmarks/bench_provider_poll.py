@@ -0,0 +1,69 @@
+"""
+Benchmark one provider-thread polling pass over many in-flight jobs: serial per-handle poll, per-handle poll on
+the provider call pool, and batched poll_many.
+
+The mock adapter charges a simulated round trip per provider request, so the difference is the number of
+requests a pass makes.
+
+    python benchmarks/bench_provider_poll.py --jobs 1000 --round-trip-ms 2 --batch-size 100 --concurrency 8
+"""
+import argparse
+import threading
+import time
+from types import SimpleNamespace
+
+import qbittensor.miner.runtime.threads.provider_thread as provider_thread
+from qbittensor.miner.providers.mock import MockProviderAdapter
+from qbittensor.miner.runtime.provider_pool import ProviderCallPool
+
+
+class _PerHandleAdapter:
+    """Hides poll_many so poll_once falls back to one poll per handle"""
+
+    def __init__(self, inner: MockProviderAdapter) -> None:
+        self._inner = inner
+
+    def poll(self, handle):
+        return self._inner.poll(handle)
+
+
+def _registry(adapter, jobs, batch_size: int, pool=None) -> SimpleNamespace:
+    # poll_once only needs the tracked jobs, the adapter and the batch size; long-running jobs keep every
+    # status QUEUED/RUNNING so nothing is finalized and each pass polls all of them
+    registry = SimpleNamespace(
+        _lock=threading.RLock(), _jobs=dict(jobs), adapter=adapter, _poll_batch_size=batch_size, _provider_pool=pool
+    )
+    registry._enqueue_error_event = lambda event: None
+    return registry
+
+
+def main(args):
+    inner = MockProviderAdapter(round_trip_s=args.round_trip_ms / 1000.0)
+    jobs = {}
+    for i in range(args.jobs):
+        handle = inner.submit("x" * 5000)
+        jobs[f"exec-{i}"] = SimpleNamespace(execution_id=f"exec-{i}", handle=handle, last_status=None)
+
+    provider_thread.update_status = lambda *a, **k: None  # Measure the provider side only
+
+    pool = ProviderCallPool(max_workers=args.concurrency)
+    variants = (("poll", _PerHandleAdapter(inner), None), ("poll (pool)", _PerHandleAdapter(inner), pool), ("poll_many", inner, None))
+    for label, adapter, variant_pool in variants:
+        inner.poll_requests = 0
+        registry = _registry(adapter, jobs, args.batch_size, variant_pool)
+        start = time.perf_counter()
+        provider_thread.poll_once(registry)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>12}: {elapsed * 1000:9.1f}ms per pass  {inner.poll_requests:6d} provider requests for {args.jobs} jobs")
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark provider polling, per-handle vs batched")
+    parser.add_argument("--jobs", help="Number of in-flight jobs", type=int, default=1000)
+    parser.add_argument("--round-trip-ms", help="Simulated provider round trip per request", type=float, default=2.0)
+    parser.add_argument("--batch-size", help="Handles per poll_many request", type=int, default=100)
+    parser.add_argument("--concurrency", help="Provider call pool workers", type=int, default=8)
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,62 @@
+"""
+Benchmark result-upload encodings for a large measurement distribution: bytes on the wire and encode time for
+today's json.dumps body against each format / content-encoding pair from upload_encoder.
+
+    python benchmarks/bench_upload_encoding.py --qubits 32 --shots 100000 --repeat 5
+"""
+import argparse
+import json
+import random
+import time
+
+from qbittensor.miner.runtime.io import upload_encoder
+
+
+def _counts(qubits: int, shots: int, seed: int) -> dict:
+    # Wide circuits with many shots give mostly unique bitstrings, the worst case for upload size
+    rng = random.Random(seed)
+    counts: dict = {}
+    for _ in range(shots):
+        key = format(rng.getrandbits(qubits), f"0{qubits}b")
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args):
+    counts = _counts(args.qubits, args.shots, args.seed)
+    print(f"{len(counts)} distinct bitstrings over {args.shots} shots on {args.qubits} qubits "
+          f"(orjson={'yes' if upload_encoder.orjson else 'no'}, zstd={'yes' if upload_encoder.zstandard else 'no'})")
+
+    baseline_bytes = len(json.dumps(counts).encode())
+    baseline_s = _time(lambda: json.dumps(counts).encode(), args.repeat)
+    print(f"{'baseline json.dumps':<24} {baseline_bytes:>12,d} B  {baseline_s * 1000:8.1f} ms")
+
+    for result_format in upload_encoder.supported_formats()[::-1]:
+        for encoding in upload_encoder.supported_encodings()[::-1]:
+            def encode():
+                body = upload_encoder.encode_counts(counts, result_format, encoding)
+                body.close()
+                return body.length
+
+            size = encode()
+            elapsed = _time(encode, args.repeat)
+            print(f"{result_format + '+' + encoding:<24} {size:>12,d} B  {elapsed * 1000:8.1f} ms  "
+                  f"({baseline_bytes / size:4.1f}x smaller, {baseline_s / elapsed:4.2f}x speed)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--qubits", type=int, default=32)
+    parser.add_argument("--shots", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
@@ -1,25 +1,36 @@
+import os
 import threading
 import time
 import typing
+from datetime import timedelta
 import bittensor as bt
 from typing import List, Tuple
 import argparse
 from types import SimpleNamespace
-import requests
 
 # Bittensor Miner Template:
 from pkg.database.database_manager import DatabaseManager
+from pkg.database.retention import RetentionPolicy
 from qbittensor.miner.miner_table_initializer import MinerTableInitializer
 
 # import base miner class which takes care of most of the boilerplate
 from qbittensor.base.miner import BaseMinerNeuron
 from qbittensor.protocol import COLLECT_SYNAPSE_ID, CircuitSynapse, ExecutionData
 from qbittensor.miner.runtime.registry import JobRegistry
+from qbittensor.miner.runtime.rate_limiter import DEFAULT_BURST_S, DEFAULT_MIN_SHARE, CapacityRateLimiter, RateLimiter
 from qbittensor.utils.request.RequestManager import RequestManager
 from qbittensor.utils.telemetry.TelemetryService import TelemetryService
-from qbittensor.utils.timestamping import timestamp_str
+from qbittensor.utils.Timer import Timer
+from qbittensor.utils.timestamping import TIMESTAMP_FORMAT, timestamp, timestamp_str
 
 COMPLETED_CIRCUIT_TTL = 14 # Keep circuits around for 2 weeks
+RETENTION_INTERVAL = timedelta(minutes=10) # How often old circuits are pruned
+DB_STATS_EXPORT_INTERVAL = timedelta(minutes=5) # How often statement stats go to telemetry (when DB_QUERY_STATS=1)
+COMPLETION_STATS_EXPORT_INTERVAL = timedelta(minutes=1) # How often completion pipeline backpressure stats go to telemetry
+SUBMIT_STATS_EXPORT_INTERVAL = timedelta(minutes=1) # How often submit pool backpressure stats go to telemetry
+RATE_LIMIT_STATS_EXPORT_INTERVAL = timedelta(minutes=1) # How often rate limiter decisions go to telemetry
+STAKE_REFRESH_INTERVAL = timedelta(minutes=5) # How often validator stakes are re-read for the per-validator rate limits
+STATE_STATS_EXPORT_INTERVAL = timedelta(minutes=1) # How often execution state transition and dwell stats go to telemetry
 
 
 class Miner(BaseMinerNeuron):
@@ -27,7 +38,7 @@ class Miner(BaseMinerNeuron):
     def __init__(self, config=None):
         super(Miner, self).__init__(config=config)
         my_hotkey = self.wallet.hotkey.ss58_address
-        self.database_manager = DatabaseManager(f"miner_{my_hotkey}")
+        self.database_manager = DatabaseManager(f"miner_{my_hotkey}", pooled=True)
         table_initializer = MinerTableInitializer(self.database_manager)
         table_initializer.create_tables()
         request_manager = RequestManager(self.wallet.hotkey, node_type="miner", network=self.subtensor.network)
@@ -38,6 +49,20 @@ class Miner(BaseMinerNeuron):
             setattr(self.jobs, "_miner_uid", self.uid)
         except Exception:
             pass
+        self.rate_limiter: RateLimiter = self._build_rate_limiter()
+        self.executions_retention = RetentionPolicy(
+            table="executions",
+            column="timestamp",
+            max_age=timedelta(days=COMPLETED_CIRCUIT_TTL),
+            format_cutoff=lambda cutoff: cutoff.strftime(TIMESTAMP_FORMAT),
+        )
+        self.retention_timer = Timer(RETENTION_INTERVAL, self._drop_old_circuit_data, run_on_start=True)
+        self.db_stats_timer = Timer(DB_STATS_EXPORT_INTERVAL, self._export_database_stats)
+        self.completion_stats_timer = Timer(COMPLETION_STATS_EXPORT_INTERVAL, self._export_completion_stats)
+        self.submit_stats_timer = Timer(SUBMIT_STATS_EXPORT_INTERVAL, self._export_submit_stats)
+        self.rate_limit_stats_timer = Timer(RATE_LIMIT_STATS_EXPORT_INTERVAL, self._export_rate_limit_stats)
+        self.stake_refresh_timer = Timer(STAKE_REFRESH_INTERVAL, self._refresh_validator_stakes, run_on_start=True)
+        self.state_stats_timer = Timer(STATE_STATS_EXPORT_INTERVAL, self._export_state_stats)
 
     def forward(self, synapse: CircuitSynapse) -> CircuitSynapse:
         """Forward for the miner. Parse data, start circuit, update database, send response"""
@@ -56,36 +81,78 @@ class Miner(BaseMinerNeuron):
         # Update the synapse by reference, adding all completed circuits from the database
         self._update_synapse_with_finished_executions(synapse)
 
-        # Maintain the database        
-        self._drop_old_circuit_data()
-        
         if synapse.execution_id == COLLECT_SYNAPSE_ID:
             bt.logging.trace(f"| {current_thread} | 📬 Received collect-only request from validator '{validator_hotkey}'")
             return synapse
 
-        if self._rate_limit():
+        # Known executions are answered without spending rate limit tokens
+        if not self._job_is_new(synapse.execution_id):
+            return synapse
+
+        if self._rate_limit(validator_hotkey):
             bt.logging.trace(f"| {current_thread} | 🚧 Rate limiting this request")
             synapse.rate_limited = True
-        
-        elif self._job_is_new(synapse.execution_id):
-            try:
-                response = requests.get(synapse.input_data_url, timeout=5)
-                response.raise_for_status()
-                self.jobs.submit(
-                    execution_id=synapse.execution_id,
-                    input_data_url=synapse.input_data_url,
-                    validator_hotkey=validator_hotkey,
-                    shots=synapse.shots,
-                )
-            except Exception as e:
-                bt.logging.debug(f"❌ Submit failed for execution {synapse.execution_id}: {e}")
+            return synapse
+
+        accepted = False
+        try:
+            # Queued for the submit workers; forward does not wait for the download or the provider
+            accepted = self.jobs.accept(
+                execution_id=synapse.execution_id,
+                input_data_url=synapse.input_data_url,
+                validator_hotkey=validator_hotkey,
+                shots=synapse.shots,
+            )
+            if not accepted:
+                bt.logging.trace(f"| {current_thread} | 🚧 Submit queue full, rate limiting this request")
+                synapse.rate_limited = True
+        except Exception as e:
+            bt.logging.debug(f"❌ Submit failed for execution {synapse.execution_id}: {e}")
+        if not accepted:
+            self._refund_rate_limit(validator_hotkey)
                 
         return synapse
     
-    def _rate_limit(self) -> bool:
+    def _rate_limit(self, validator_hotkey: str | None = None) -> bool:
         """Returns whether or not this request should be ignored due to rate limiting"""
-        # TODO Developer. When implementing your miner, add your own rate limiting logic here
-        return False
+        # Developers can plug in their own policy by assigning any RateLimiter to self.rate_limiter
+        reason = self.rate_limiter.allow(validator_hotkey)
+        if reason is not None:
+            bt.logging.trace(f"🚧 Rate limited request from '{validator_hotkey}': {reason}")
+        return reason is not None
+
+    def _refund_rate_limit(self, validator_hotkey: str | None) -> None:
+        """Return the tokens of a request that passed _rate_limit but was not accepted"""
+        refund = getattr(self.rate_limiter, "refund", None)
+        if refund is not None:
+            refund(validator_hotkey)
+
+    def _build_rate_limiter(self) -> RateLimiter:
+        """Capacity checks plus optional global and stake-weighted per-validator token buckets (MINER_RATE_LIMIT_*)"""
+        try:
+            rate_per_s = float(os.getenv("MINER_RATE_LIMIT_PER_S", "0"))
+            burst_s = float(os.getenv("MINER_RATE_LIMIT_BURST_S", str(DEFAULT_BURST_S)))
+            min_share = float(os.getenv("MINER_RATE_LIMIT_MIN_SHARE", str(DEFAULT_MIN_SHARE)))
+            provider_max_pending = int(os.getenv("MINER_PROVIDER_MAX_PENDING", "0"))
+        except Exception:
+            rate_per_s, burst_s, min_share, provider_max_pending = 0.0, DEFAULT_BURST_S, DEFAULT_MIN_SHARE, 0
+        return CapacityRateLimiter(self.jobs, rate_per_s=rate_per_s, burst_s=burst_s, min_share=min_share, provider_max_pending=provider_max_pending)
+
+    def _refresh_validator_stakes(self) -> None:
+        """Give the rate limiter the current stake of every hotkey in the metagraph"""
+        update_stakes = getattr(self.rate_limiter, "update_stakes", None)
+        if update_stakes is None:
+            return
+        try:
+            update_stakes({hotkey: float(stake) for hotkey, stake in zip(self.metagraph.hotkeys, self.metagraph.S)})
+        except Exception as e:
+            bt.logging.debug(f"Failed to refresh validator stakes for rate limiting: {e}")
+
+    def _export_rate_limit_stats(self) -> None:
+        """Send accepted and rejected (by reason) request counts to telemetry"""
+        stats = getattr(self.rate_limiter, "stats", None)
+        if stats is not None:
+            self.telemetry_service.record_rate_limit_stats(stats())
     
     def _update_synapse_with_finished_executions(self, synapse: CircuitSynapse) -> None:
         """Add completed circuits to the synapse"""
@@ -98,69 +165,69 @@ class Miner(BaseMinerNeuron):
 
         # Add completed jobs to synapse
         synapse.finished_executions.extend(finished_executions)
-        synapse.last_circuit = last_circuit # Update the synapse with the timestamp of the most recently returned circuit
+        synapse.last_circuit = last_circuit # Update the synapse with the cursor after the most recently returned circuit
         synapse.success = True # Lets the validator know that this request was serviced successfully
 
     def _get_finished_executions(self, last_update: str) -> Tuple[List[ExecutionData], str]:
-        """Get a list of ExecutionData objects from the database"""
-
-        # Query database for completed circuits
-        if not last_update:
-            last_update = "1970-01-01 00:00:00"
-        query="""
-            SELECT execution_id, COALESCE(shots, 0) as shots, upload_data_id, provider_job_id, status, errorMessage, timestamp
-            FROM executions
-            WHERE timestamp > ? AND status != 'Running'
-        """
-        values = (last_update,)
-        with self.database_manager.lock:
-            results = self.database_manager.query_with_values(query, values)
+        """Get ExecutionData for executions that changed after the validator's cursor, and the next cursor"""
+
+        # Changes after the validator's cursor: from the in-memory change log, or the database for old cursors
+        records, cursor = self.jobs.finished_since(last_update)
 
-        # Build list of ExecutionData objects from db query results
+        # Build list of ExecutionData objects from the records
         finished_executions = [
             ExecutionData(
-                execution_id=execution_id,
-                shots=shots,
-                upload_data_id=upload_data_id,
-                execution_data={"provider_job_id": provider_job_id},
-                status=status,
-                errorMessage=errorMessage,
+                execution_id=record.execution_id,
+                shots=record.shots or 0,
+                upload_data_id=record.upload_data_id,
+                execution_data={"provider_job_id": record.provider_job_id},
+                status=record.status,
+                errorMessage=record.error_message,
             )
-            for (execution_id, shots, upload_data_id, provider_job_id, status, errorMessage, _) in results
+            for record in records
         ]
 
-        # Build list of timestamps from db query results
-        timestamps = [timestamp for (_, _, _, _, _, _, timestamp) in results]
-
-        # Get the most recent timestamp. If no data came back from query, default this to the same timestamp the validator sent.
-        most_recent_timestamp = last_update
-        if len(timestamps) > 0:
-            most_recent_timestamp = max(timestamps)
-
         # Return a tuple
-        return finished_executions, most_recent_timestamp
+        return finished_executions, cursor
 
     def _drop_old_circuit_data(self) -> None:
-        """Drop any data from executions table older than n days"""
-        query = f"""
-            DELETE FROM executions
-            WHERE timestamp < date('now', '-{COMPLETED_CIRCUIT_TTL} days')
-        """
-        with self.database_manager.lock:
-            self.database_manager.query_and_commit(query)
+        """Drop any data from executions table older than n days. Runs from retention_timer, not per request"""
+        now = timestamp()
+        cutoff = self.executions_retention.cutoff(now)
+        policy = self.executions_retention
+        try:
+            deleted = self.jobs.store.delete_before(cutoff, policy.batch_size, policy.max_batches)
+            # A capped pass leaves expired rows behind; keep them in the state index until a pass deletes them all
+            if deleted < policy.batch_size * policy.max_batches:
+                self.jobs.prune_state_before(cutoff)
+        except Exception as e:
+            bt.logging.error(f"🗑️ Failed to drop old circuit data: {e}")
+
+    def _export_database_stats(self) -> None:
+        """Send per-statement database stats to telemetry. A no-op unless DB_QUERY_STATS is enabled"""
+        stats = self.database_manager.query_stats()
+        if stats:
+            self.telemetry_service.record_database_stats(self.database_manager.db_name, stats)
+
+    def _export_completion_stats(self) -> None:
+        """Send completion pipeline queue depth, refusals and stage timings to telemetry"""
+        stats = self.jobs.completion_stats()
+        if stats:
+            self.telemetry_service.record_completion_pipeline_stats(stats)
+
+    def _export_submit_stats(self) -> None:
+        """Send submit pool queue depth, refusals and queue wait to telemetry"""
+        stats = self.jobs.submit_stats()
+        if stats:
+            self.telemetry_service.record_submit_pool_stats(stats)
+
+    def _export_state_stats(self) -> None:
+        """Send execution state transition counts, per-status dwell times and stuck executions to telemetry"""
+        self.telemetry_service.record_execution_state_stats(self.jobs.state_stats())
 
     def _job_is_new(self, execution_id: str) -> bool:
-        """Check if this request id has been seen yet"""
-        try:
-            if hasattr(self, "jobs") and self.jobs.is_tracking(execution_id):
-                return False
-        except Exception:
-            pass
-        table = "executions"
-        conditions = "execution_id=?"
-        values = (execution_id,)
-        with self.database_manager.lock:
-            return not self.database_manager.row_exists(table, conditions, values)
+        """Check if this request id has been seen yet, from the registry's in-memory index"""
+        return not self.jobs.is_known(execution_id)
         
     def _execute_circuit(self, synapse: CircuitSynapse) -> None:
         """Execute the circuit in a separate thread"""
@@ -245,5 +312,12 @@ if __name__ == "__main__":
     with Miner() as miner:
         miner.jobs.start()
         while True:
+            miner.retention_timer.check_timer()
+            miner.db_stats_timer.check_timer()
+            miner.completion_stats_timer.check_timer()
+            miner.submit_stats_timer.check_timer()
+            miner.state_stats_timer.check_timer()
+            miner.rate_limit_stats_timer.check_timer()
+            miner.stake_refresh_timer.check_timer()
             bt.logging.info(f"Miner running... {timestamp_str()}")
             time.sleep(5)
@@ -1,9 +1,11 @@
 import threading
 import time
+from datetime import timedelta
 from typing import Any, List
 import bittensor as bt
 from time import sleep
 
+from pkg.database.async_database_manager import AsyncDatabaseManager
 from pkg.database.database_manager import DatabaseManager
 from qbittensor.validator.heartbeat import Heartbeat
 from qbittensor.validator.miner_manager.MinerManager import MinerManager
@@ -15,6 +17,9 @@ from qbittensor.validator.reward.score import Scorer
 from qbittensor.validator.synapse.SynapseManager import SynapseManager
 from qbittensor.validator.weights.WeightSetter import WeightSetter
 from qbittensor.validator.reward.cost import CostConfirmation
+from qbittensor.utils.Timer import Timer
+
+DB_STATS_EXPORT_INTERVAL = timedelta(minutes=5) # How often statement stats go to telemetry (when DB_QUERY_STATS=1)
 
 
 class Validator(BaseValidatorNeuron):
@@ -24,16 +29,20 @@ class Validator(BaseValidatorNeuron):
 
         # Database
         my_hotkey = self.wallet.hotkey.ss58_address
-        database_manager = DatabaseManager(f"validator_{my_hotkey}")
+        database_manager = DatabaseManager(f"validator_{my_hotkey}", pooled=True)
+        self.database_manager = database_manager
         table_initializer = ValidatorTableInitializer(database_manager)
         table_initializer.create_tables()
+        # Response handling queues its writes on a dedicated database thread instead of blocking the forward pass
+        self.async_db = AsyncDatabaseManager(database_manager)
+        self.async_db.start()
 
         # Request manager
         request_manager = RequestManager(self.wallet.hotkey, node_type="validator", network=self.subtensor.network)
 
         # Helpers
-        self.synapse_manager = SynapseManager(database_manager, request_manager)
-        self.scorer = Scorer(database_manager, self.metagraph, request_manager)
+        self.synapse_manager = SynapseManager(database_manager, request_manager, self.async_db)
+        self.scorer = Scorer(database_manager, self.metagraph, request_manager, self.async_db)
         self.next_miner = NextMiner(self.metagraph)
 
         # Miner management
@@ -54,6 +63,15 @@ class Validator(BaseValidatorNeuron):
         # Cost management
         self.cost = CostConfirmation(database_manager, request_manager)
 
+        # Database statement stats
+        self.db_stats_timer = Timer(DB_STATS_EXPORT_INTERVAL, self._export_database_stats)
+
+    def _export_database_stats(self) -> None:
+        """Send per-statement database stats to telemetry. A no-op unless DB_QUERY_STATS is enabled"""
+        stats = self.database_manager.query_stats()
+        if stats:
+            self.scorer.telemetry_service.record_database_stats(self.database_manager.db_name, stats)
+
     def forward(self):
         """Forward function for the validator"""
         current_thread = threading.current_thread().name
@@ -102,6 +120,7 @@ class Validator(BaseValidatorNeuron):
                 self.miner_manager.timer.check_timer()
                 self.cost.timer.check_timer()
                 self.weight_setter.timer.check_timer()
+                self.db_stats_timer.check_timer()
 
                 # Call to forward()
                 self.forward()
@@ -117,6 +136,7 @@ class Validator(BaseValidatorNeuron):
 
         finally:
             bt.logging.info("Stopping the validator")
+            self.async_db.close()
 
 # The main function parses the configuration and runs the validator.
 if __name__ == "__main__":
@@ -0,0 +1,185 @@
+"""
+Asyncio facade over DatabaseManager, backed by a dedicated database thread
+"""
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+import bittensor as bt
+
+from pkg.database.database_manager import DatabaseManager
+
+DEFAULT_MAX_BATCH = 128
+
+_STOP = object()
+
+
+class _Operation:
+    """A queued unit of work. Writes carry statements so consecutive writes can share a transaction"""
+
+    def __init__(self, future: Future, statements: Optional[List[Tuple[str, tuple]]] = None, read: Optional[Callable[[], Any]] = None) -> None:
+        self.future = future
+        self.statements = statements
+        self.read = read
+
+
+class AsyncDatabaseManager:
+    """
+    Runs every database call on one dedicated thread so event-loop code never blocks on sqlite.
+
+    Coroutines await query*/commit methods; synchronous callers use submit_read/submit_write, which return
+    concurrent.futures.Future. Operations run in submission order, so a read always observes writes submitted
+    before it. Writes that are queued back to back are committed together in one transaction (up to `max_batch`
+    operations); if that transaction fails each write is retried alone so only the bad one fails.
+    Cancelling an awaiting coroutine (or the returned future) before the thread picks the operation up skips it.
+    """
+
+    def __init__(self, database_manager: DatabaseManager, max_batch: int = DEFAULT_MAX_BATCH) -> None:
+        self.database_manager = database_manager
+        self.max_batch = max(1, int(max_batch))
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._carry: Optional[_Operation] = None  # A read pulled off the queue while collecting a write batch
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.batches_committed = 0
+        self.writes_committed = 0
+        self.cancelled = 0
+
+    # Coroutine API
+
+    async def query(self, query: str) -> List[tuple]:
+        return await self._await(self.submit_read(self.database_manager.query, query))
+
+    async def query_with_values(self, query: str, values: tuple) -> List[tuple]:
+        return await self._await(self.submit_read(self.database_manager.query_with_values, query, values))
+
+    async def query_one_with_values(self, query: str, values: tuple) -> tuple:
+        return await self._await(self.submit_read(self.database_manager.query_one_with_values, query, values))
+
+    async def row_exists(self, table: str, conditions: str, values: tuple) -> bool:
+        return await self._await(self.submit_read(self.database_manager.row_exists, table, conditions, values))
+
+    async def query_and_commit(self, query: str) -> None:
+        await self._await(self.submit_write(query, ()))
+
+    async def query_and_commit_with_values(self, query: str, values: tuple) -> None:
+        await self._await(self.submit_write(query, values))
+
+    async def query_and_commit_many(self, query: str, values: List[tuple]) -> None:
+        await self._await(self.submit_write_many(query, values))
+
+    # Thread-safe API
+
+    def submit_read(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Run a read function (usually a DatabaseManager method) on the database thread"""
+        future: Future = Future()
+        self._enqueue(_Operation(future, read=lambda: fn(*args)))
+        return future
+
+    def submit_write(self, query: str, values: tuple) -> Future:
+        """Queue one write statement. The future resolves once it is committed"""
+        future: Future = Future()
+        self._enqueue(_Operation(future, statements=[(query, values)]))
+        return future
+
+    def submit_write_many(self, query: str, values: List[tuple]) -> Future:
+        """Queue a statement for many rows; the rows commit atomically"""
+        future: Future = Future()
+        self._enqueue(_Operation(future, statements=[(query, row) for row in values]))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until everything submitted before this call has run"""
+        self.submit_read(lambda: None).result(timeout=timeout)
+
+    def pending_count(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="Database Thread", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Run what is already queued, then stop the database thread"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    async def _await(self, future: Future) -> Any:
+        # wrap_future propagates cancellation of the awaiting task to `future`, which the database thread then skips
+        return await asyncio.wrap_future(future)
+
+    def _enqueue(self, operation: _Operation) -> None:
+        if self._thread is None:
+            self.start()
+        self._queue.put(operation)
+
+    def _run(self) -> None:
+        bt.logging.info("| Database Thread | Database thread started")
+        while True:
+            operation = self._carry if self._carry is not None else self._queue.get()
+            self._carry = None
+            if operation is _STOP:
+                break
+            if operation.statements is None:
+                self._run_read(operation)
+                continue
+            batch = [operation]
+            while len(batch) < self.max_batch:
+                try:
+                    following = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if following is _STOP or following.statements is None:
+                    self._carry = following
+                    break
+                batch.append(following)
+            self._run_writes(batch)
+        bt.logging.info("| Database Thread | Database thread stopped")
+
+    def _run_read(self, operation: _Operation) -> None:
+        if not operation.future.set_running_or_notify_cancel():
+            self.cancelled += 1
+            return
+        try:
+            with self.database_manager.read_lock:
+                result = operation.read()
+        except Exception as e:
+            operation.future.set_exception(e)
+        else:
+            operation.future.set_result(result)
+
+    def _run_writes(self, batch: List[_Operation]) -> None:
+        live = [op for op in batch if op.future.set_running_or_notify_cancel()]
+        self.cancelled += len(batch) - len(live)
+        if not live:
+            return
+        statements = [statement for op in live for statement in op.statements]
+        try:
+            with self.database_manager.lock:
+                self.database_manager.execute_batch_and_commit(statements)
+        except Exception as e:
+            if len(live) > 1:
+                bt.logging.debug(f" Database batch of {len(live)} writes failed ({e}); retrying individually")
+            for op in live:
+                try:
+                    with self.database_manager.lock:
+                        self.database_manager.execute_batch_and_commit(op.statements)
+                except Exception as e2:
+                    bt.logging.error(f" Database write failed: {e2}")
+                    op.future.set_exception(e2)
+                else:
+                    op.future.set_result(None)
+                    self.writes_committed += 1
+            return
+        for op in live:
+            op.future.set_result(None)
+        self.batches_committed += 1
+        self.writes_committed += len(live)
@@ -0,0 +1,76 @@
+"""
+Thread-local pool of persistent SQLite connections
+"""
+import sqlite3
+import threading
+from typing import Dict
+
+# Pragmas applied once to every pooled connection
+DEFAULT_PRAGMAS: Dict[str, str] = {
+    "journal_mode": "WAL",       # Readers don't block the writer and vice versa
+    "synchronous": "NORMAL",     # Safe with WAL, fsync only at checkpoints
+    "cache_size": "-16000",      # ~16MB page cache per connection (negative => KiB)
+    "mmap_size": "268435456",    # Map up to 256MB of the db file
+    "temp_store": "MEMORY",
+    "busy_timeout": "5000",      # Wait for other writers instead of failing immediately
+}
+
+
+class ConnectionPool:
+    """
+    Hands out one persistent connection per thread for a single database file.
+    Connections are opened lazily and kept until close() is called or the owning thread exits.
+    """
+
+    def __init__(self, db_path: str, pragmas: Dict[str, str] | None = None):
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self._local = threading.local()
+        self._connections: Dict[int, tuple[threading.Thread, sqlite3.Connection]] = {}
+        self._lock = threading.Lock()
+
+    def get(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it if needed"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._open()
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        """Close every connection owned by the pool"""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for _, connection in connections:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def size(self) -> int:
+        """Number of open connections"""
+        with self._lock:
+            return len(self._connections)
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a new connection for the current thread and apply pragmas"""
+        connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            connection.execute(f"PRAGMA {name}={value}")
+        thread = threading.current_thread()
+        with self._lock:
+            self._prune_dead_threads()
+            self._connections[thread.ident] = (thread, connection)
+        return connection
+
+    def _prune_dead_threads(self) -> None:
+        """Close connections whose owning thread has exited. Caller holds self._lock"""
+        for ident, (thread, connection) in list(self._connections.items()):
+            if not thread.is_alive():
+                try:
+                    connection.close()
+                except sqlite3.Error:
+                    pass
+                del self._connections[ident]
@@ -2,21 +2,78 @@
 Helper class managing connections to the SQLite database
 """
 import sqlite3
-from typing import Tuple
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
 import os
-from threading import RLock
+
+from pkg.database.connection_pool import ConnectionPool
+from pkg.database.query_stats import QueryStats
+from pkg.database.rw_lock import ReadWriteLock
 
 data_dir = "data"
 
+
+class _Measurement:
+    """Rows returned or affected by the statement being measured"""
+    __slots__ = ("rows",)
+
+    def __init__(self) -> None:
+        self.rows = 0
+
+
+def _env_query_stats() -> Optional[QueryStats]:
+    """QueryStats configured from DB_QUERY_STATS / DB_SLOW_QUERY_MS, or None when disabled"""
+    if os.getenv("DB_QUERY_STATS", "0").lower() not in ("1", "true", "yes"):
+        return None
+    try:
+        slow_query_s = float(os.getenv("DB_SLOW_QUERY_MS", "250")) / 1000.0
+    except Exception:
+        slow_query_s = 0.25
+    return QueryStats(slow_query_s=slow_query_s)
+
+
 class DatabaseManager:
 
-    def __init__(self, db_name: str):
-        self.lock = RLock()  # Reentrant lock for thread safety
+    def __init__(self, db_name: str, pooled: bool = False, query_stats: Optional[QueryStats] = None):
+        """
+        Args:
+            db_name: name of the database file (without extension) inside the data directory
+            pooled: keep one persistent, WAL-tuned connection per thread instead of opening a connection per query
+            query_stats: collect per-statement latency/rows/lock-wait into this object. Defaults to one built from
+                the DB_QUERY_STATS and DB_SLOW_QUERY_MS environment variables (off unless DB_QUERY_STATS=1)
+        """
+        # Writers take `lock` (reentrant, exclusive). Pure reads take `read_lock`, which is shared between readers.
+        # Pooled connections run in WAL mode, so their reads see a snapshot and don't wait for the writer at all.
+        self._rw_lock = ReadWriteLock(snapshot_reads=pooled)
+        self.lock = self._rw_lock.write_lock
+        self.read_lock = self._rw_lock.read_lock
         os.makedirs(data_dir, exist_ok=True)  # Ensure data directory exists
         self.db_path = f'{data_dir}/{db_name}.db'  # Set db path
         db_dir = os.path.dirname(self.db_path)
         if not os.path.exists(db_dir):
             os.makedirs(db_dir)  # Create db dir
+        self._pool: ConnectionPool | None = ConnectionPool(self.db_path) if pooled else None
+        self.db_name = db_name
+        self._query_stats: QueryStats | None = query_stats if query_stats is not None else _env_query_stats()
+
+    @property
+    def pooled(self) -> bool:
+        """Whether this manager reuses pooled connections"""
+        return self._pool is not None
+
+    def lock_stats(self) -> Dict[str, Dict[str, float]]:
+        """Lock-wait metrics for the read and write sides of the database lock"""
+        return self._rw_lock.stats()
+
+    def query_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-statement stats keyed by normalized SQL. Empty when instrumentation is off"""
+        return self._query_stats.snapshot() if self._query_stats is not None else {}
+
+    def close(self) -> None:
+        """Close any pooled connections. Safe to call in non-pooled mode"""
+        if self._pool is not None:
+            self._pool.close()
 
     def query(self, query: str) -> list[tuple]:
         """
@@ -27,13 +84,11 @@ class DatabaseManager:
         Returns:
             All rows matching the query
         """
-        cursor, db_connection = self._get_cursor()
-        try:
+        with self._measure(query) as measurement, self._cursor() as (cursor, db_connection):
             cursor.execute(query)
-            return cursor.fetchall()
-        finally:
-            cursor.close()
-            db_connection.close()
+            rows = cursor.fetchall()
+            measurement.rows = len(rows)
+            return rows
 
     def query_with_values(self, query: str, values: tuple) -> list[tuple]:
         """
@@ -45,13 +100,11 @@ class DatabaseManager:
         Returns:
             All rows matching the query
         """
-        cursor, db_connection = self._get_cursor()
-        try:
+        with self._measure(query) as measurement, self._cursor() as (cursor, db_connection):
             cursor.execute(query, values)
-            return cursor.fetchall()
-        finally:
-            cursor.close()
-            db_connection.close()
+            rows = cursor.fetchall()
+            measurement.rows = len(rows)
+            return rows
 
     def query_one_with_values(self, query: str, values: tuple) -> tuple:
         """
@@ -63,13 +116,11 @@ class DatabaseManager:
         Returns:
             One row matching the query
         """
-        cursor, db_connection = self._get_cursor()
-        try:
+        with self._measure(query) as measurement, self._cursor() as (cursor, db_connection):
             cursor.execute(query, values)
-            return cursor.fetchone()
-        finally:
-            cursor.close()
-            db_connection.close()
+            row = cursor.fetchone()
+            measurement.rows = 0 if row is None else 1
+            return row
 
     def query_and_commit(self, query: str) -> None:
         """
@@ -80,13 +131,10 @@ class DatabaseManager:
         Returns:
             None
         """
-        cursor, db_connection = self._get_cursor()
-        try:
+        with self._measure(query) as measurement, self._cursor() as (cursor, db_connection):
             cursor.execute(query)
             db_connection.commit()
-        finally:
-            cursor.close()
-            db_connection.close()
+            measurement.rows = cursor.rowcount
 
     def query_and_commit_with_values(self, query: str, values: tuple) -> None:
         """
@@ -98,13 +146,26 @@ class DatabaseManager:
         Returns:
             None
         """
-        cursor, db_connection = self._get_cursor()
-        try:
+        with self._measure(query) as measurement, self._cursor() as (cursor, db_connection):
             cursor.execute(query, values)
             db_connection.commit()
-        finally:
-            cursor.close()
-            db_connection.close()
+            measurement.rows = cursor.rowcount
+
+    def execute_and_commit_with_values(self, query: str, values: tuple) -> int:
+        """
+        Use for updating the database when the number of affected rows matters
+        Args:
+            query: query string
+            values: a tuple of values
+
+        Returns:
+            The number of rows the statement inserted, updated or deleted
+        """
+        with self._measure(query) as measurement, self._cursor() as (cursor, db_connection):
+            cursor.execute(query, values)
+            db_connection.commit()
+            measurement.rows = cursor.rowcount
+            return cursor.rowcount
 
     def query_and_commit_many(self, query: str, values: list[tuple]) -> None:
         """
@@ -116,24 +177,52 @@ class DatabaseManager:
         Returns:
             None
         """
-        cursor, db_connection = self._get_cursor()
-        try:
+        with self._measure(query) as measurement, self._cursor() as (cursor, db_connection):
             cursor.executemany(query, values)
             db_connection.commit()
-        finally:
-            cursor.close()
-            db_connection.close()
+            measurement.rows = cursor.rowcount
+
+    def execute_batch_and_commit(self, statements: list[tuple[str, tuple]]) -> None:
+        """
+        Run several different statements in a single transaction
+        Args:
+            statements: a list of (query string, values) pairs, executed in order
+
+        Returns:
+            None
+        """
+        with self._cursor() as (cursor, db_connection):
+            try:
+                for query, values in statements:
+                    with self._measure(query) as measurement:
+                        cursor.execute(query, values)
+                        measurement.rows = cursor.rowcount
+                db_connection.commit()
+            except Exception:
+                db_connection.rollback()
+                raise
+
+    def execute_script(self, script: str) -> None:
+        """
+        Run one or more SQL statements to completion, committing any pending transaction first.
+        Use for maintenance statements such as PRAGMA incremental_vacuum, which a plain execute only steps once
+        Args:
+            script: SQL statements separated by semicolons
+
+        Returns:
+            None
+        """
+        with self._measure(script), self._cursor() as (cursor, db_connection):
+            cursor.executescript(script)
 
     def row_exists(self, table: str, conditions: str, values: tuple) -> bool:
         """Check if there is a row matching the query in the database"""
-        cursor, db_connection = self._get_cursor()
         query = f"SELECT 1 FROM {table} WHERE {conditions} LIMIT 1"
-        try:
+        with self._measure(query) as measurement, self._cursor() as (cursor, _):
             cursor.execute(query, values)
-            return cursor.fetchone() is not None
-        finally:
-            cursor.close()
-            db_connection.close()
+            exists = cursor.fetchone() is not None
+            measurement.rows = int(exists)
+            return exists
 
     def get_size_of_table(self, table_name: str):
         """Get the size of a table"""
@@ -146,6 +235,40 @@ class DatabaseManager:
         result = self.query(f"""SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}'""")
         return len(result) > 0
 
+    @contextmanager
+    def _measure(self, query: str) -> Iterator[_Measurement]:
+        """Record latency, rows and the caller's lock wait for one statement, when instrumentation is on"""
+        measurement = _Measurement()
+        if self._query_stats is None:
+            yield measurement
+            return
+        lock_wait_s = self._rw_lock.take_pending_wait()
+        start = time.perf_counter()
+        try:
+            yield measurement
+        except Exception:
+            self._query_stats.record(query, time.perf_counter() - start, measurement.rows, lock_wait_s, error=True)
+            raise
+        self._query_stats.record(query, time.perf_counter() - start, measurement.rows, lock_wait_s)
+
+    @contextmanager
+    def _cursor(self) -> Iterator[Tuple[sqlite3.Cursor, sqlite3.Connection]]:
+        """
+        Yield a cursor and connection, releasing them afterwards.
+        Pooled connections stay open; any uncommitted transaction is rolled back on error.
+        """
+        cursor, db_connection = self._get_cursor()
+        try:
+            yield cursor, db_connection
+        except Exception:
+            if self._pool is not None and db_connection.in_transaction:
+                db_connection.rollback()
+            raise
+        finally:
+            cursor.close()
+            if self._pool is None:
+                db_connection.close()
+
     def _get_cursor(self) -> Tuple[sqlite3.Cursor, sqlite3.Connection]:
         """
         Get a cursor and connection reference from the database
@@ -162,4 +285,6 @@ class DatabaseManager:
         Returns:
             A database connection
         """
+        if self._pool is not None:
+            return self._pool.get()
         return sqlite3.connect(self.db_path)
@@ -0,0 +1,125 @@
+"""
+Per-statement latency, row-count and lock-wait statistics for DatabaseManager
+"""
+import bisect
+import re
+import threading
+from typing import Dict, List, Optional
+
+import bittensor as bt
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS_S: List[float] = [0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0]
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w?])-?\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(query: str, max_length: int = 200) -> str:
+    """
+    Collapse a SQL string into a grouping key: literals become ?, placeholder lists such as IN (?, ?, ?) become
+    (...), whitespace is collapsed. Statements that only differ in their constants are counted together.
+    """
+    normalized = _STRING_LITERAL.sub("?", query)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PARAM_LIST.sub("(...)", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    return normalized[:max_length]
+
+
+class StatementStats:
+    """Running totals for one normalized statement"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.rows = 0
+        self.lock_wait_s = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_S) + 1)
+
+    def record(self, elapsed_s: float, rows: int, lock_wait_s: float, error: bool) -> None:
+        self.calls += 1
+        self.total_s += elapsed_s
+        self.rows += max(rows, 0)
+        self.lock_wait_s += lock_wait_s
+        if error:
+            self.errors += 1
+        if elapsed_s > self.max_s:
+            self.max_s = elapsed_s
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_S, elapsed_s)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Approximate latency quantile: the upper bound of the bucket holding it (max_s for the open bucket)"""
+        if self.calls == 0:
+            return 0.0
+        target = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return LATENCY_BUCKETS_S[i] if i < len(LATENCY_BUCKETS_S) else self.max_s
+        return self.max_s
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_s": self.total_s,
+            "avg_s": (self.total_s / self.calls) if self.calls else 0.0,
+            "max_s": self.max_s,
+            "p50_s": self.quantile(0.5),
+            "p95_s": self.quantile(0.95),
+            "p99_s": self.quantile(0.99),
+            "rows": self.rows,
+            "lock_wait_s": self.lock_wait_s,
+            "histogram": list(self.buckets),
+        }
+
+
+class QueryStats:
+    """
+    Statement statistics keyed by normalized SQL, plus slow-query logging.
+
+    Statements slower than `slow_query_s` (including the wait for the database lock) are logged at warning
+    level with their full text, so a regression shows up in the logs before anyone looks at the stats.
+    """
+
+    def __init__(self, slow_query_s: Optional[float] = None) -> None:
+        self.slow_query_s = slow_query_s
+        self._lock = threading.Lock()
+        self._statements: Dict[str, StatementStats] = {}
+        self.slow_queries = 0
+
+    def record(self, query: str, elapsed_s: float, rows: int = 0, lock_wait_s: float = 0.0, error: bool = False) -> None:
+        key = normalize_statement(query)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = StatementStats()
+            stats.record(elapsed_s, rows, lock_wait_s, error)
+            slow = self.slow_query_s is not None and elapsed_s + lock_wait_s >= self.slow_query_s
+            if slow:
+                self.slow_queries += 1
+        if slow:
+            bt.logging.warning(
+                f"🐢 Slow query: {elapsed_s * 1000:.1f}ms (+{lock_wait_s * 1000:.1f}ms lock wait), {rows} rows: {key}"
+            )
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Stats per normalized statement"""
+        with self._lock:
+            return {key: stats.snapshot() for key, stats in self._statements.items()}
+
+    def top(self, n: int = 10, by: str = "total_s") -> List[tuple]:
+        """The n statements with the highest `by` value, as (statement, stats) pairs"""
+        ranked = sorted(self.snapshot().items(), key=lambda item: item[1][by], reverse=True)
+        return ranked[:n]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self.slow_queries = 0
@@ -0,0 +1,122 @@
+"""
+Incremental, chunked retention pruning for time-partitioned tables
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import bittensor as bt
+
+from pkg.database.database_manager import DatabaseManager
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    How long rows of one table are kept.
+
+    Rows whose `column` sorts before now - `max_age` are deleted `batch_size` rows at a time, so the write lock
+    is only ever held for one small DELETE. `max_batches` bounds the work of a single pass; whatever is left
+    over is picked up by the next one. The column should be indexed.
+    """
+    table: str
+    column: str
+    max_age: timedelta
+    batch_size: int = 500
+    max_batches: int = 100
+    # Turns the cutoff datetime into the value stored in `column` (e.g. a strftime string). None passes the datetime as-is
+    format_cutoff: Optional[Callable[[datetime], Any]] = None
+
+    def cutoff(self, now: Optional[datetime] = None) -> Any:
+        """The value rows must sort before to be pruned"""
+        cutoff = (now or datetime.now(timezone.utc)) - self.max_age
+        return self.format_cutoff(cutoff) if self.format_cutoff is not None else cutoff
+
+
+class RetentionPruner:
+    """
+    Deletes expired rows for a set of retention policies, off the request path.
+
+    Each batch is its own short transaction under the database write lock, so foreground writers interleave
+    with a large backlog instead of waiting behind one long DELETE. After a pass, freed pages are handed back
+    to the filesystem with PRAGMA incremental_vacuum when the database uses auto_vacuum=INCREMENTAL.
+    """
+
+    def __init__(
+        self,
+        database_manager: DatabaseManager,
+        policies: List[RetentionPolicy],
+        vacuum_pages: int = 1000,
+        pause_s: float = 0.0,
+    ) -> None:
+        """
+        Args:
+            database_manager: the database holding the tables
+            policies: one policy per table to prune
+            vacuum_pages: free pages released per pass (0 disables incremental vacuum)
+            pause_s: sleep between batches, to leave the write lock to foreground writers
+        """
+        self.database_manager = database_manager
+        self.policies = list(policies)
+        self.vacuum_pages = vacuum_pages
+        self.pause_s = pause_s
+
+    def prune(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Run one pruning pass over every policy
+        Args:
+            now: reference time for the cutoffs (defaults to the current UTC time)
+
+        Returns:
+            Rows deleted per table
+        """
+        now = now or datetime.now(timezone.utc)
+        deleted: Dict[str, int] = {}
+        for policy in self.policies:
+            try:
+                deleted[policy.table] = self.prune_table(policy, now)
+            except Exception as e:
+                bt.logging.error(f"🗑️ Failed to prune {policy.table}: {e}")
+                deleted[policy.table] = 0
+        if any(deleted.values()):
+            self.incremental_vacuum()
+        return deleted
+
+    def prune_table(self, policy: RetentionPolicy, now: Optional[datetime] = None) -> int:
+        """Delete up to max_batches batches of expired rows from one table. Returns the number of rows deleted"""
+        return self.delete_before(policy, policy.cutoff(now))
+
+    def delete_before(self, policy: RetentionPolicy, cutoff: Any) -> int:
+        """Delete up to max_batches batches of rows whose policy column sorts before `cutoff`. Returns the number of rows deleted"""
+        query = f"""
+            DELETE FROM {policy.table}
+            WHERE rowid IN (
+                SELECT rowid FROM {policy.table}
+                WHERE {policy.column} < ?
+                LIMIT ?
+            )
+        """
+        values = (cutoff, policy.batch_size)
+        total = 0
+        for _ in range(policy.max_batches):
+            with self.database_manager.lock:
+                deleted = self.database_manager.execute_and_commit_with_values(query, values)
+            total += deleted
+            if deleted < policy.batch_size:
+                break
+            if self.pause_s > 0:
+                time.sleep(self.pause_s)
+        if total:
+            bt.logging.info(f"🗑️ Pruned {total} rows from {policy.table} older than {cutoff}")
+        return total
+
+    def incremental_vacuum(self) -> None:
+        """Release up to vacuum_pages free pages. A no-op unless the database uses auto_vacuum=INCREMENTAL"""
+        if self.vacuum_pages <= 0:
+            return
+        try:
+            with self.database_manager.lock:
+                self.database_manager.execute_script(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})")
+        except Exception as e:
+            bt.logging.warning(f"🗑️ Incremental vacuum failed: {e}")
@@ -0,0 +1,169 @@
+"""
+Reader/writer lock with lock-wait metrics for DatabaseManager
+"""
+import threading
+import time
+from typing import Dict
+
+
+class LockStats:
+    """Running totals of how long callers waited to acquire one side of the lock"""
+
+    def __init__(self) -> None:
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+
+    def record(self, waited_s: float, contended: bool) -> None:
+        self.acquisitions += 1
+        self.total_wait_s += waited_s
+        if contended:
+            self.contended += 1
+        if waited_s > self.max_wait_s:
+            self.max_wait_s = waited_s
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "total_wait_s": self.total_wait_s,
+            "max_wait_s": self.max_wait_s,
+            "avg_wait_s": (self.total_wait_s / self.acquisitions) if self.acquisitions else 0.0,
+        }
+
+
+class ReadWriteLock:
+    """
+    Many readers or one (reentrant) writer.
+
+    With snapshot_reads=True readers never wait for the writer: each reader works on its own WAL snapshot,
+    so the lock only serializes writers and the read side exists to collect metrics.
+    A thread holding the write lock may also take the read lock. Upgrading a read lock to a write lock is not
+    supported when readers exclude the writer, since two upgrading readers would deadlock.
+    """
+
+    def __init__(self, snapshot_reads: bool = False) -> None:
+        self.snapshot_reads = snapshot_reads
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: int | None = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+        self.read_stats = LockStats()
+        self.write_stats = LockStats()
+        self.read_lock = _ReadSide(self)
+        self.write_lock = _WriteSide(self)
+
+    def acquire_read(self) -> None:
+        me = threading.get_ident()
+        held = getattr(self._local, "reads", 0)
+        start = time.perf_counter()
+        contended = False
+        with self._cond:
+            if not self.snapshot_reads and self._writer != me:
+                # Prefer waiting writers, unless this thread already reads (it would block the writer it waits on)
+                while self._writer is not None or (self._writers_waiting > 0 and held == 0):
+                    contended = True
+                    self._cond.wait()
+            self._readers += 1
+            waited = time.perf_counter() - start
+            self.read_stats.record(waited, contended)
+        self._local.reads = held + 1
+        self._local.pending_wait = getattr(self._local, "pending_wait", 0.0) + waited
+
+    def release_read(self) -> None:
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+        self._local.reads = getattr(self._local, "reads", 1) - 1
+
+    def acquire_write(self, blocking: bool = True, timeout: float = -1) -> bool:
+        me = threading.get_ident()
+        start = time.perf_counter()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                self.write_stats.record(0.0, False)
+                return True
+            if not self.snapshot_reads and getattr(self._local, "reads", 0) > 0:
+                raise RuntimeError("Cannot acquire the database write lock while holding its read lock")
+            deadline = None if timeout is None or timeout < 0 else time.monotonic() + timeout
+            contended = False
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or (not self.snapshot_reads and self._readers > 0):
+                    if not blocking:
+                        return False
+                    contended = True
+                    if deadline is None:
+                        self._cond.wait()
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 or not self._cond.wait(remaining):
+                            if self._writer is not None or (not self.snapshot_reads and self._readers > 0):
+                                return False
+            finally:
+                self._writers_waiting -= 1
+                if self._writer != me:
+                    self._cond.notify_all()  # Gave up; wake readers that were yielding to us
+            self._writer = me
+            self._writer_depth = 1
+            waited = time.perf_counter() - start
+            self.write_stats.record(waited, contended)
+        self._local.pending_wait = getattr(self._local, "pending_wait", 0.0) + waited
+        return True
+
+    def release_write(self) -> None:
+        with self._cond:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("Cannot release a database write lock held by another thread")
+            self._writer_depth -= 1
+            if self._writer_depth == 0:
+                self._writer = None
+                self._cond.notify_all()
+
+    def take_pending_wait(self) -> float:
+        """Seconds this thread waited for the lock since it last asked, so the next statement can be charged for it"""
+        waited = getattr(self._local, "pending_wait", 0.0)
+        self._local.pending_wait = 0.0
+        return waited
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Lock-wait metrics for both sides"""
+        with self._cond:
+            return {"read": self.read_stats.snapshot(), "write": self.write_stats.snapshot()}
+
+
+class _ReadSide:
+    def __init__(self, rw_lock: ReadWriteLock) -> None:
+        self._rw_lock = rw_lock
+
+    def __enter__(self):
+        self._rw_lock.acquire_read()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._rw_lock.release_read()
+
+
+class _WriteSide:
+    """Exclusive side of a ReadWriteLock with the RLock interface (acquire, release, context manager)"""
+
+    def __init__(self, rw_lock: ReadWriteLock) -> None:
+        self._rw_lock = rw_lock
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        return self._rw_lock.acquire_write(blocking, timeout)
+
+    def release(self) -> None:
+        self._rw_lock.release_write()
+
+    def __enter__(self):
+        self._rw_lock.acquire_write()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._rw_lock.release_write()
@@ -1,8 +1,27 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import List
+
+import bittensor as bt
 
 from pkg.database.database_manager import DatabaseManager
 
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    A numbered schema change. Statements should be idempotent (IF NOT EXISTS etc.) so that a migration
+    interrupted before its version was recorded can safely run again.
+    """
+    version: int
+    description: str
+    statements: List[str] = field(default_factory=list)
+
+
 class TableInitializer(ABC):
+    # Name under which this initializer's schema version is stored in the schema_version table
+    schema_component: str = "default"
+
     def __init__(self, database_manager: DatabaseManager) -> None:
         self.database_manager = database_manager
 
@@ -10,3 +29,50 @@ class TableInitializer(ABC):
     def create_tables(self) -> None:
         """Create the necessary tables"""
         pass
+
+    def migrations(self) -> List[Migration]:
+        """Ordered schema migrations applied on top of the base tables. Override in subclasses"""
+        return []
+
+    def get_schema_version(self) -> int:
+        """Return the last applied migration version for this component (0 if none)"""
+        self._create_schema_version_table()
+        row = self.database_manager.query_one_with_values(
+            "SELECT version FROM schema_version WHERE component = ?", (self.schema_component,)
+        )
+        return int(row[0]) if row else 0
+
+    def migrate(self) -> int:
+        """
+        Apply every migration newer than the recorded schema version, in order.
+        Each migration's statements run in one batch with its version bump, but not every statement is transactional
+        (VACUUM commits on its own), so statements must be idempotent.
+        Returns:
+            The schema version after migrating
+        """
+        current = self.get_schema_version()
+        pending = sorted((m for m in self.migrations() if m.version > current), key=lambda m: m.version)
+        for migration in pending:
+            bt.logging.info(f"🗄️  Applying {self.schema_component} schema migration {migration.version}: {migration.description}")
+            statements = [(statement, ()) for statement in migration.statements]
+            statements.append((
+                """
+                    INSERT OR REPLACE INTO schema_version (component, version, applied_at)
+                    VALUES (?, ?, datetime('now'))
+                """,
+                (self.schema_component, migration.version),
+            ))
+            with self.database_manager.lock:
+                self.database_manager.execute_batch_and_commit(statements)
+            current = migration.version
+        return current
+
+    def _create_schema_version_table(self) -> None:
+        """Create the table tracking applied migrations"""
+        self.database_manager.query_and_commit('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                component TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                applied_at DATETIME
+            )
+        ''')
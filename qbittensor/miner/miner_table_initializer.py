@@ -1,14 +1,41 @@
 from pkg.database.database_manager import DatabaseManager
-from pkg.database.table_initializer import TableInitializer
+from pkg.database.table_initializer import Migration, TableInitializer
 
 
 class MinerTableInitializer(TableInitializer):
+    schema_component = "miner"
+
     def __init__(self, database_manager: DatabaseManager):
         super().__init__(database_manager)
 
     def create_tables(self) -> None:
-        """Create all miner tables"""
+        """Create all miner tables and bring them up to the latest schema version"""
         self._create_executions_table()
+        self.migrate()
+
+    def migrations(self) -> list[Migration]:
+        """Miner schema migrations, oldest first"""
+        return [
+            Migration(
+                version=1,
+                description="Index executions for finished-execution scans and status counts",
+                statements=[
+                    # Miner._get_finished_executions: WHERE timestamp > ? AND status != 'Running'
+                    "CREATE INDEX IF NOT EXISTS idx_executions_timestamp_status ON executions(timestamp, status)",
+                    # JobRegistry.get_inflight_count / get_pending_count: WHERE status ...
+                    "CREATE INDEX IF NOT EXISTS idx_executions_status ON executions(status)",
+                ],
+            ),
+            Migration(
+                version=2,
+                description="Switch to incremental auto-vacuum so retention pruning can release freed pages",
+                statements=[
+                    # Changing auto_vacuum on an existing database only takes effect after a full VACUUM (one-off)
+                    "PRAGMA auto_vacuum = INCREMENTAL",
+                    "VACUUM",
+                ],
+            ),
+        ]
 
     def _create_executions_table(self) -> None:
         """Create table for provider receipts/results for completed jobs"""
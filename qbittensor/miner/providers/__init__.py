@@ -1,7 +1,8 @@
 """Provider adapters for QPU integrations.
 
 This package contains:
-- base: ProviderAdapter protocol and shared domain models
+- base: ProviderAdapter / AsyncProviderAdapter protocols and shared domain models
+- async_shim: SyncToAsyncAdapter, which runs a synchronous adapter under the async provider runtime
 - mock: MockProviderAdapter for local testing
 - registry: Factory for resolving provider adapters by name
 """
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional
+
+from .base import (
+    AvailabilityStatus,
+    BaseExecutionStatus,
+    Capability,
+    Device,
+    JobHandle,
+    JobReceipt,
+    ProviderAdapter,
+    SupportsPollMany,
+)
+
+
+def is_async_adapter(adapter: Any) -> bool:
+    """Whether an adapter implements AsyncProviderAdapter (coroutine poll), rather than ProviderAdapter"""
+    return inspect.iscoroutinefunction(getattr(adapter, "poll", None))
+
+
+class SyncToAsyncAdapter:
+    """
+    Presents a synchronous ProviderAdapter as an AsyncProviderAdapter.
+
+    Each call runs the blocking method on `executor` (the event loop's default executor when None), so existing
+    adapters such as MockProviderAdapter work unchanged under the async provider runtime. poll_many is forwarded
+    when the wrapped adapter supports it and otherwise polls the handles concurrently.
+    """
+
+    def __init__(self, adapter: ProviderAdapter, executor: Optional[Executor] = None) -> None:
+        self.adapter = adapter
+        self.executor = executor
+
+    async def list_devices(self) -> List[Device]:
+        return await self._run(self.adapter.list_devices)
+
+    async def list_capabilities(self) -> List[Capability]:
+        return await self._run(self.adapter.list_capabilities)
+
+    async def get_capability(self, device_id: Optional[str] = None) -> Optional[Capability]:
+        return await self._run(self.adapter.get_capability, device_id)
+
+    async def submit(self, circuit_data: str, device_id: Optional[str] = None, shots: Optional[int] = None) -> JobHandle:
+        return await self._run(lambda: self.adapter.submit(circuit_data=circuit_data, device_id=device_id, shots=shots))
+
+    async def poll(self, handle: JobHandle) -> BaseExecutionStatus:
+        return await self._run(self.adapter.poll, handle)
+
+    async def poll_many(self, handles: List[JobHandle]) -> List[BaseExecutionStatus]:
+        if isinstance(self.adapter, SupportsPollMany):
+            return await self._run(self.adapter.poll_many, handles)
+        return list(await asyncio.gather(*(self.poll(handle) for handle in handles)))
+
+    async def cancel(self, handle: JobHandle) -> None:
+        await self._run(self.adapter.cancel, handle)
+
+    async def get_job_receipt(self, handle: JobHandle) -> JobReceipt:
+        return await self._run(self.adapter.get_job_receipt, handle)
+
+    async def get_availability(self, device_id: Optional[str] = None) -> Optional[AvailabilityStatus]:
+        return await self._run(self.adapter.get_availability, device_id)
+
+    async def get_pricing(self, device_id: Optional[str] = None) -> Optional[Dict[str, float]]:
+        return await self._run(self.adapter.get_pricing, device_id)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
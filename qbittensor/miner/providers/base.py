@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Protocol, Optional, Dict, Any, List
+from typing import Protocol, Optional, Dict, Any, List, runtime_checkable
 from pydantic import BaseModel, Field
 
 
@@ -121,3 +121,48 @@ class ProviderAdapter(Protocol):
         ...
 
 
+@runtime_checkable
+class SupportsPollMany(Protocol):
+    """
+    Optional batch-polling capability. Adapters whose provider can report many jobs in one request implement
+    poll_many; the provider thread detects it and falls back to per-handle poll otherwise.
+    """
+
+    def poll_many(self, handles: List[JobHandle]) -> List[BaseExecutionStatus]:
+        """Statuses for `handles`, in the same order. Raise if the batch as a whole cannot be polled"""
+        ...
+
+
+@runtime_checkable
+class AsyncProviderAdapter(Protocol):
+    """
+    Asyncio interface for QPU providers whose SDKs are natively async. Mirrors ProviderAdapter with coroutine
+    methods; poll_many is optional here too. Synchronous adapters are adapted with SyncToAsyncAdapter.
+    """
+
+    async def list_devices(self) -> List[Device]:
+        ...
+
+    async def list_capabilities(self) -> List[Capability]:
+        ...
+
+    async def get_capability(self, device_id: Optional[str] = None) -> Optional[Capability]:
+        ...
+
+    async def submit(self, circuit_data: str, device_id: Optional[str] = None, shots: Optional[int] = None) -> JobHandle:
+        ...
+
+    async def poll(self, handle: JobHandle) -> BaseExecutionStatus:
+        ...
+
+    async def cancel(self, handle: JobHandle) -> None:
+        ...
+
+    async def get_job_receipt(self, handle: JobHandle) -> JobReceipt:
+        ...
+
+    async def get_availability(self, device_id: Optional[str] = None) -> Optional[AvailabilityStatus]:
+        ...
+
+    async def get_pricing(self, device_id: Optional[str] = None) -> Optional[Dict[str, float]]:
+        ...
@@ -19,7 +19,10 @@ class _InMemoryJob(BaseModel):
 class MockProviderAdapter(ProviderAdapter):
     """mock provider adapter."""
 
-    def __init__(self) -> None:
+    def __init__(self, round_trip_s: float = 0.0) -> None:
+        # Simulated network latency charged once per provider request (poll or poll_many), for benchmarks
+        self.round_trip_s = round_trip_s
+        self.poll_requests = 0
         self._devices: List[Device] = [
             Device(device_id="mock_qpu_1", provider="mock", vendor="mockvendor", device_type="QPU"),
             Device(device_id="mock_sim_1", provider="mock", vendor="mockvendor", device_type="SIMULATOR"),
@@ -53,6 +56,19 @@ class MockProviderAdapter(ProviderAdapter):
         return JobHandle(provider_job_id=execution_id, device_id=target)
 
     def poll(self, handle: JobHandle) -> BaseExecutionStatus:
+        self._round_trip()
+        return self._status(handle)
+
+    def poll_many(self, handles: List[JobHandle]) -> List[BaseExecutionStatus]:
+        self._round_trip()
+        return [self._status(handle) for handle in handles]
+
+    def _round_trip(self) -> None:
+        self.poll_requests += 1
+        if self.round_trip_s > 0:
+            time.sleep(self.round_trip_s)
+
+    def _status(self, handle: JobHandle) -> BaseExecutionStatus:
         job = self._jobs.get(handle.provider_job_id)
         if not job:
             return BaseExecutionStatus(status="UNKNOWN", eta_seconds=None)
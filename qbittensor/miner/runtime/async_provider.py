@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+import bittensor as bt
+
+from qbittensor.miner.providers.async_shim import SyncToAsyncAdapter, is_async_adapter
+from qbittensor.miner.runtime.provider_pool import DEFAULT_CALL_TIMEOUT_S, ProviderCallTimeout
+
+# Outstanding provider calls allowed per operation; "other" covers devices, capabilities, availability and pricing
+DEFAULT_LIMITS: Dict[str, int] = {"submit": 64, "poll": 256, "receipt": 64, "cancel": 32, "other": 8}
+
+_OPERATIONS: Dict[str, str] = {
+    "submit": "submit",
+    "poll": "poll",
+    "poll_many": "poll",
+    "get_job_receipt": "receipt",
+    "cancel": "cancel",
+}
+
+
+class AsyncProviderRuntime:
+    """
+    Drives an AsyncProviderAdapter from one event loop on a dedicated "Provider Loop" thread.
+
+    It is a drop-in for ProviderCallPool: the provider thread and JobRegistry submit adapter methods, which run
+    as tasks on the loop, each under the semaphore of its operation (submit, poll, receipt, cancel, other), so
+    tens of thousands of outstanding jobs cost coroutines rather than threads. Results come back as
+    concurrent.futures.Future and are applied by the caller, on its own thread. A call that overruns the
+    timeout is cancelled, which releases its key; a late provider answer for it is never applied.
+
+    Synchronous adapters are wrapped in SyncToAsyncAdapter, whose blocking calls run on a small executor owned
+    by the runtime.
+    """
+
+    def __init__(
+        self,
+        adapter: Any,
+        limits: Optional[Dict[str, int]] = None,
+        timeout_s: float = DEFAULT_CALL_TIMEOUT_S,
+        executor_workers: int = 32,
+    ) -> None:
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if not is_async_adapter(adapter):
+            self._executor = ThreadPoolExecutor(max_workers=max(1, executor_workers), thread_name_prefix="Provider Shim")
+            adapter = SyncToAsyncAdapter(adapter, executor=self._executor)
+        self.adapter = adapter
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.timeout_s = float(timeout_s)
+        self._lock = threading.Lock()
+        self._busy: Set[str] = set()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self.submitted = 0
+        self.timed_out = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run_loop, args=(ready,), name="Provider Loop", daemon=True)
+            self._thread.start()
+        ready.wait()
+
+    def submit(self, keys: Iterable[str], fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Schedule an adapter call on the loop, marking `keys` busy until it finishes or is cancelled"""
+        if self._loop is None:
+            self.start()
+        keys = list(keys)
+        with self._lock:
+            self._busy.update(keys)
+            self.submitted += 1
+        operation = _OPERATIONS.get(getattr(fn, "__name__", ""), "other")
+        future = asyncio.run_coroutine_threadsafe(self._guarded(operation, fn, args, kwargs), self._loop)
+        future.add_done_callback(lambda _: self._release(keys))
+        return future
+
+    def call(self, fn: Callable[..., Any], *args: Any, timeout_s: Optional[float] = None, **kwargs: Any) -> Any:
+        """Run an adapter call on the loop and wait for its result, raising ProviderCallTimeout after the timeout"""
+        return self.result(self.submit((), fn, *args, **kwargs), timeout_s)
+
+    def result(self, future: Future, timeout_s: Optional[float] = None, cancel: bool = True) -> Any:
+        """Wait for a submitted call; on timeout it is cancelled (unless `cancel` is False) and ProviderCallTimeout is raised"""
+        timeout_s = self.timeout_s if timeout_s is None else timeout_s
+        try:
+            return future.result(timeout=max(0.0, timeout_s))
+        except FutureTimeoutError:
+            if cancel:
+                future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise ProviderCallTimeout(f"Provider call did not return within {timeout_s:.1f}s") from None
+
+    def is_busy(self, key: str) -> bool:
+        with self._lock:
+            return key in self._busy
+
+    def busy_count(self) -> int:
+        with self._lock:
+            return len(self._busy)
+
+    def shutdown(self) -> None:
+        """Cancel outstanding calls and stop the loop thread. The runtime restarts on the next submit"""
+        loop, thread = self._loop, self._thread
+        if loop is None:
+            return
+        bt.logging.debug(f"| Provider Loop | Shutting down ({self.submitted} calls, {self.timed_out} timed out)")
+
+        async def cancel_all() -> None:
+            for task in asyncio.all_tasks():
+                if task is not asyncio.current_task():
+                    task.cancel()
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_all(), loop).result(timeout=2.0)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=2.0)
+        self._loop = None
+        self._thread = None
+        self._semaphores = {}
+
+    async def _guarded(self, operation: str, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        semaphore = self._semaphores.get(operation)
+        if semaphore is None:
+            semaphore = self._semaphores[operation] = asyncio.Semaphore(max(1, int(self.limits.get(operation, 1))))
+        async with semaphore:
+            result = fn(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        ready.set()
+        bt.logging.info("| Provider Loop | Provider event loop started")
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+            bt.logging.info("| Provider Loop | Provider event loop stopped")
+
+    def _release(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            self._busy.difference_update(keys)
@@ -0,0 +1,115 @@
+"""
+Sequenced log of execution changes for delivering finished executions to validators.
+
+Every persisted change gets a sequence number; the most recent ones are kept, with a snapshot of the execution
+record, in a ring buffer. The cursor handed to validators in CircuitSynapse.last_circuit is
+"<timestamp>#<log id>:<sequence>". A cursor still inside the buffer is served from memory; any other cursor
+(another process's log, a sequence that left the buffer, a plain timestamp) falls back to a timestamp scan.
+"""
+from __future__ import annotations
+
+import collections
+import threading
+import uuid
+from dataclasses import replace
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from qbittensor.miner.runtime.storage.base import ExecutionRecord, normalize_changes
+from qbittensor.validator.utils.execution_status import ExecutionStatus
+
+DEFAULT_MAX_ENTRIES = 10000
+CURSOR_SEPARATOR = "#"
+# Running executions are not delivered to validators (same filter as ExecutionStore.finished_since)
+_UNDELIVERED = ExecutionStatus.RUNNING.value
+
+
+def parse_cursor(cursor: Optional[str]) -> Tuple[str, Optional[str], Optional[int]]:
+    """Split a last_circuit value into (timestamp, log id, sequence); plain timestamps have no log id or sequence"""
+    cursor = cursor or ""
+    timestamp, _, position = cursor.partition(CURSOR_SEPARATOR)
+    log_id, _, seq = position.partition(":")
+    if not log_id or not seq.isdigit():
+        return timestamp, None, None
+    return timestamp, log_id, int(seq)
+
+
+class ExecutionChangeLog:
+    """
+    Append-only, monotonically sequenced log of execution record changes with a bounded in-memory tail.
+
+    The repository appends a record snapshot after every persisted change. changes_since() returns the latest
+    snapshot of each execution changed after a cursor, in sequence order, or None when the cursor is not
+    servable from the buffer and the caller has to query the store.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.log_id = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._entries: Deque[Tuple[int, ExecutionRecord]] = collections.deque(maxlen=self.max_entries)
+        self._latest: Dict[str, ExecutionRecord] = {}  # execution_id -> newest snapshot still in the buffer
+        self._seq = 0
+        self.served = 0
+        self.fallbacks = 0
+
+    @property
+    def head(self) -> int:
+        with self._lock:
+            return self._seq
+
+    def append(self, record: ExecutionRecord) -> int:
+        """Log a full record snapshot. Returns its sequence number"""
+        with self._lock:
+            if len(self._entries) == self.max_entries:
+                _, evicted = self._entries[0]
+                if self._latest.get(evicted.execution_id) is evicted:
+                    del self._latest[evicted.execution_id]
+            self._seq += 1
+            self._entries.append((self._seq, record))
+            self._latest[record.execution_id] = record
+            return self._seq
+
+    def append_update(self, execution_id: str, changes: Dict[str, Any]) -> Optional[int]:
+        """Log a partial update on top of the execution's newest buffered snapshot; None if there is none"""
+        with self._lock:
+            base = self._latest.get(execution_id)
+        if base is None:
+            return None
+        return self.append(replace(base, **normalize_changes(changes)))
+
+    def cursor(self, timestamp: str, seq: int) -> str:
+        return f"{timestamp}{CURSOR_SEPARATOR}{self.log_id}:{seq}"
+
+    def changes_since(self, cursor: Optional[str]) -> Optional[Tuple[List[ExecutionRecord], str]]:
+        """(records changed after cursor, next cursor), or None when the buffer cannot serve the cursor"""
+        timestamp, log_id, seq = parse_cursor(cursor)
+        with self._lock:
+            oldest = self._entries[0][0] if self._entries else self._seq + 1
+            if log_id != self.log_id or seq is None or seq > self._seq or seq < oldest - 1:
+                self.fallbacks += 1
+                return None
+            newer: List[Tuple[int, ExecutionRecord]] = []
+            for entry in reversed(self._entries):
+                if entry[0] <= seq:
+                    break
+                newer.append(entry)
+            head = self._seq
+            self.served += 1
+        # Newest snapshot per execution, ordered by the sequence of that snapshot
+        seen = set()
+        records: List[ExecutionRecord] = []
+        for _, record in newer:
+            if record.execution_id in seen:
+                continue
+            seen.add(record.execution_id)
+            if record.status != _UNDELIVERED:
+                records.append(record)
+        records.reverse()
+        timestamps = [record.timestamp for record in records if record.timestamp]
+        if timestamps:
+            timestamp = max(timestamp, max(timestamps))
+        return records, self.cursor(timestamp, head)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"head": self._seq, "buffered": len(self._entries), "served": self.served, "fallbacks": self.fallbacks}
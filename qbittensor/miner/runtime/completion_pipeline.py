@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import bittensor as bt
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_QUEUE = 1000
+# Minimum seconds between "completion queue full" warnings
+SATURATION_LOG_INTERVAL_S = 30.0
+
+
+class StageTiming:
+    """Running totals for one completion stage"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def record(self, elapsed_s: float) -> None:
+        self.count += 1
+        self.total_s += elapsed_s
+        if elapsed_s > self.max_s:
+            self.max_s = elapsed_s
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_s": self.total_s,
+            "avg_s": self.total_s / self.count if self.count else 0.0,
+            "max_s": self.max_s,
+        }
+
+
+class CompletionPipeline:
+    """
+    Bounded queue plus worker threads that finalize COMPLETED jobs off the provider thread.
+
+    persist_completion fetches the receipt, requests a presigned URL, uploads the results and writes the
+    database; run inline, one slow upload held up polling for every other job. The provider thread now only
+    offers COMPLETED jobs here and carries on. A job stays in the pipeline (and is not polled) from the offer
+    until its worker finishes; finalized jobs are dropped from the registry, failed ones stay tracked and are
+    offered again after their next poll.
+
+    When the queue is full the offer is refused and the job is simply polled again later, so a slow completion
+    stage pushes back on the provider thread instead of growing without bound. stats() reports queue depth,
+    refusals, worker utilization and per-stage timings (queue_wait, receipt, upload_url, upload_put, db), which
+    together show whether completion is the bottleneck.
+    """
+
+    def __init__(self, registry, workers: int = DEFAULT_WORKERS, max_queue: int = DEFAULT_MAX_QUEUE) -> None:
+        self.registry = registry
+        self.workers = max(1, int(workers))
+        self.max_queue = max(1, int(max_queue))
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.max_queue)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._busy: Set[str] = set()
+        self._stages: Dict[str, StageTiming] = {}
+        self._active = 0
+        self._busy_s = 0.0
+        self._started_at: Optional[float] = None
+        self._last_saturation_log = 0.0
+        self.accepted = 0
+        self.rejected = 0
+        self.finalized = 0
+        self.failed = 0
+        self.high_water = 0
+
+    def offer(self, execution_id: str, tracked) -> bool:
+        """
+        Queue a COMPLETED job for finalization. Returns False if it is already in the pipeline or the queue is
+        full; in both cases the caller leaves the job tracked.
+        """
+        with self._lock:
+            if execution_id in self._busy:
+                return False
+            if not self._threads:
+                self._start_workers()
+            try:
+                self._queue.put_nowait((execution_id, tracked, time.monotonic()))
+            except queue.Full:
+                self.rejected += 1
+                self._log_saturation()
+                return False
+            self._busy.add(execution_id)
+            self.accepted += 1
+            self.high_water = max(self.high_water, self._queue.qsize())
+        return True
+
+    def is_busy(self, execution_id: str) -> bool:
+        with self._lock:
+            return execution_id in self._busy
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue, worker and per-stage metrics"""
+        with self._lock:
+            elapsed = time.monotonic() - self._started_at if self._started_at is not None else 0.0
+            return {
+                "workers": self.workers,
+                "active": self._active,
+                "queued": self._queue.qsize(),
+                "max_queue": self.max_queue,
+                "high_water": self.high_water,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "finalized": self.finalized,
+                "failed": self.failed,
+                "utilization": min(1.0, self._busy_s / (elapsed * self.workers)) if elapsed > 0 else 0.0,
+                "stages": {name: timing.as_dict() for name, timing in self._stages.items()},
+            }
+
+    def shutdown(self) -> None:
+        """Drop queued jobs (they stay tracked in the registry) and let idle workers exit"""
+        bt.logging.debug(f"| Completion Pipeline | Shutting down ({self.finalized} finalized, {self.failed} failed, {self.rejected} refused)")
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                with self._lock:
+                    self._busy.discard(item[0])
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+
+    def _start_workers(self) -> None:
+        self._started_at = time.monotonic()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"Completion Worker {i + 1}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self) -> None:
+        from qbittensor.miner.runtime.flows import completion_flow
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            execution_id, tracked, queued_at = item
+            started = time.monotonic()
+            timings: Dict[str, float] = {"queue_wait": started - queued_at}
+            with self._lock:
+                self._active += 1
+            finalized = False
+            try:
+                finalized = completion_flow.persist_completion(self.registry, tracked, timings=timings)
+            except Exception as e:
+                bt.logging.error(f" Completion worker failed for execution {execution_id}: {e}")
+            if finalized:
+                with self.registry._lock:
+                    self.registry._jobs.pop(execution_id, None)
+            with self._lock:
+                self._active -= 1
+                self._busy_s += time.monotonic() - started
+                self._busy.discard(execution_id)
+                if finalized:
+                    self.finalized += 1
+                else:
+                    self.failed += 1
+                for stage, elapsed in timings.items():
+                    self._stages.setdefault(stage, StageTiming()).record(elapsed)
+
+    def _log_saturation(self) -> None:
+        now = time.monotonic()
+        if now - self._last_saturation_log >= SATURATION_LOG_INTERVAL_S:
+            self._last_saturation_log = now
+            bt.logging.warning(
+                f"| Completion Pipeline | Queue full ({self.max_queue} jobs, {self.workers} workers); "
+                f"completed jobs will be retried after their next poll ({self.rejected} refused so far)"
+            )
@@ -1,33 +1,58 @@
 from __future__ import annotations
 
-import json
+import time
 import requests
 import bittensor as bt
-from typing import Any, Dict, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
 
 from qbittensor.utils.timestamping import timestamp_str
 from qbittensor.miner.runtime.repository import persist_failed as _db_persist_failed, persist_completed as _db_persist_completed
 from qbittensor.miner.runtime.observability.error_reporter import build_error_event
+from qbittensor.miner.runtime.provider_pool import call_provider
+from qbittensor.miner.runtime.io.upload_encoder import encode_counts
+from qbittensor.utils.measurement_counts import INT64_MAX, MeasurementCounts
 
 
 def _valid_counts(counts: Dict[str, Any]) -> bool:
+    """Non-empty, 0/1 string keys of any width, non-negative integer counts that fit in int64"""
     if not isinstance(counts, dict) or not counts:
         return False
     for k, v in counts.items():
         if not isinstance(k, str) or any(c not in ("0", "1") for c in k):
             return False
-        if not isinstance(v, int) or v < 0:
+        if not isinstance(v, int) or v < 0 or v > INT64_MAX:
             return False
     return True
 
 
-def _attempt_put(upload_url: str, payload: str) -> requests.Response:
-    headers = {"Content-Type": "application/json"}
-    response = requests.put(upload_url, data=payload, headers=headers, timeout=30)
+def _attempt_put(upload_data, measurement_counts: MeasurementCounts | Dict[str, int]) -> requests.Response:
+    """Encode the counts in the format and content encoding the upload slot asks for and PUT them"""
+    body = encode_counts(
+        measurement_counts,
+        result_format=getattr(upload_data, "result_format", None) or "json",
+        content_encoding=getattr(upload_data, "content_encoding", None),
+    )
+    try:
+        bt.logging.debug(f" Upload preflight: url_len={len(upload_data.upload_url or '')}, payload_bytes={body.length}, headers={body.headers}")
+        response = requests.put(upload_data.upload_url, data=body.file, headers=body.headers, timeout=30)
+    finally:
+        body.close()
     response.raise_for_status()
     return response
 
 
+@contextmanager
+def _stage(timings: Optional[Dict[str, float]], name: str) -> Iterator[None]:
+    """Add the wall time of the block to timings[name], when the caller collects timings"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
 def _persist_failed_record(registry, tracked, receipt, error_message: str, meta: Optional[Dict[str, Any]] = None) -> None:
     provider_val = None
     device_val = getattr(tracked.handle, "device_id", None)
@@ -76,10 +101,11 @@ def _fail(registry, tracked, receipt, *, stage: str, code: str, message: str, re
     return False
 
 
-def persist_completion(registry, tracked) -> bool:
+def persist_completion(registry, tracked, timings: Optional[Dict[str, float]] = None) -> bool:
     """Insert completed job into executions tables.
 
     Returns True only when results were uploaded and DB persisted; otherwise False.
+    When `timings` is given, seconds spent per stage (receipt, upload_url, upload_put, db) are added to it.
     """
     timestamp = timestamp_str()
 
@@ -87,7 +113,8 @@ def persist_completion(registry, tracked) -> bool:
 
     # receipt
     try:
-        receipt = registry.adapter.get_job_receipt(tracked.handle)
+        with _stage(timings, "receipt"):
+            receipt = call_provider(registry, registry.adapter.get_job_receipt, tracked.handle)
     except Exception as e:
         bt.logging.error(f" Provider receipt failed for execution {tracked.execution_id}: {e}")
         return _fail(
@@ -113,7 +140,8 @@ def persist_completion(registry, tracked) -> bool:
         pass
 
     try:
-        upload_data = registry._get_upload_data()
+        with _stage(timings, "upload_url"):
+            upload_data = registry._take_upload_data()
     except Exception as e:
         bt.logging.error(f" Exception while requesting upload URL for execution {tracked.execution_id}: {e}")
         upload_data = None
@@ -134,16 +162,16 @@ def persist_completion(registry, tracked) -> bool:
 
     results = getattr(receipt, "results", None) or {}
     measurement_counts = results.get("measurementCounts", {}) if isinstance(results, dict) else {}
-    try:
-        bt.logging.debug(
-            f" Extracted measurementCounts for execution_id={tracked.execution_id}: "
-            f"num_bitstrings={(len(measurement_counts) if isinstance(measurement_counts, dict) else 0)}, "
-            f"total_shots={(sum(measurement_counts.values()) if isinstance(measurement_counts, dict) and len(measurement_counts)>0 else 0)}"
-        )
-    except Exception:
-        pass
+    # Parsed once into packed arrays: validation, the log line and the upload all use the compact form
+    counts: Optional[MeasurementCounts | Dict[str, int]] = None
+    if isinstance(measurement_counts, dict) and measurement_counts:
+        try:
+            counts = MeasurementCounts.from_dict(measurement_counts)
+        except (ValueError, TypeError, UnicodeEncodeError):
+            # Bitstrings of different widths cannot share one packed array; they are uploaded as the provider sent them
+            counts = measurement_counts if _valid_counts(measurement_counts) else None
 
-    if not _valid_counts(measurement_counts):
+    if counts is None:
         bt.logging.error(f" Invalid or missing measurement counts for execution {tracked.execution_id}. Failing job.")
         return _fail(
             registry,
@@ -157,25 +185,29 @@ def persist_completion(registry, tracked) -> bool:
             ctx=None,
         )
 
+    if isinstance(counts, MeasurementCounts):
+        total_shots, width = counts.total(), counts.width
+    else:
+        total_shots, width = sum(counts.values()), max(map(len, counts))
+    bt.logging.debug(
+        f" Extracted measurementCounts for execution_id={tracked.execution_id}: "
+        f"num_bitstrings={len(counts)}, total_shots={total_shots}, width={width}"
+    )
+
     try:
-        counts_json = json.dumps(measurement_counts)
         bt.logging.info(f" Uploading results for execution {tracked.execution_id} to S3 (result_id={upload_data.id})")
         try:
-            bt.logging.debug(
-                f" Upload preflight: url_len={(len(upload_data.upload_url) if hasattr(upload_data, 'upload_url') and upload_data.upload_url else 0)}, "
-                f"payload_bytes={len(counts_json)}"
-            )
-        except Exception:
-            pass
-        try:
-            _attempt_put(upload_data.upload_url, counts_json)
+            with _stage(timings, "upload_put"):
+                _attempt_put(upload_data, counts)
         except requests.exceptions.RequestException as e:
             status_code = getattr(getattr(e, 'response', None), 'status_code', None)
             text = getattr(getattr(e, 'response', None), 'text', None)
             if status_code == 403:
+                # The refresh always asks the job server for a new URL rather than taking another prefetched slot
                 bt.logging.info(f" PUT returned 403; attempting single URL refresh for execution {tracked.execution_id}")
                 try:
-                    refreshed = registry._get_upload_data()
+                    with _stage(timings, "upload_url"):
+                        refreshed = registry._get_upload_data()
                     if not refreshed:
                         return _fail(
                             registry,
@@ -188,7 +220,8 @@ def persist_completion(registry, tracked) -> bool:
                             meta={"stage": "upload_put", "http_status": 403},
                             ctx={"http_status": 403},
                         )
-                    _attempt_put(refreshed.upload_url, counts_json)
+                    with _stage(timings, "upload_put"):
+                        _attempt_put(refreshed, counts)
                     upload_data = refreshed
                 except Exception as e2:
                     bt.logging.error(f" PUT retry after refresh failed for execution {tracked.execution_id}: {e2}")
@@ -238,7 +271,8 @@ def persist_completion(registry, tracked) -> bool:
         )
 
     try:
-        _db_persist_completed(registry, tracked=tracked, receipt=receipt, upload_data_id=upload_data.id)
+        with _stage(timings, "db"):
+            _db_persist_completed(registry, tracked=tracked, receipt=receipt, upload_data_id=upload_data.id)
     except Exception as e:
         bt.logging.error(f" DB persist of completion failed for execution {tracked.execution_id}: {e}")
         return _fail(
@@ -0,0 +1,162 @@
+"""Pooled, size-guarded and cached circuit (QASM) downloads for incoming executions."""
+from __future__ import annotations
+
+import collections
+import hashlib
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Optional, OrderedDict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_TIMEOUT_S = 5.0
+DEFAULT_CACHE_ENTRIES = 256
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_CACHE_TTL_S = 600.0
+# Connections kept per host; forward runs on the axon's thread pool
+POOL_SIZE = 16
+CHUNK_BYTES = 64 * 1024
+
+
+class CircuitFetchError(Exception):
+    """The circuit could not be downloaded, or was larger than the fetcher allows"""
+
+
+@dataclass(frozen=True)
+class FetchedCircuit:
+    url: str
+    text: str
+    sha256: str
+    size: int
+
+
+class CircuitFetcher:
+    """
+    Downloads circuits with a pooled session and caches them by URL and content hash.
+
+    fetch() returns the cached circuit for a URL fetched less than ttl_s seconds ago, otherwise downloads it. A
+    body larger than max_bytes (by Content-Length or as streamed) raises CircuitFetchError. The cache keeps at
+    most max_entries URLs and cache_max_bytes of distinct bodies, evicting least recently used URLs first.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        ttl_s: float = DEFAULT_CACHE_TTL_S,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self.max_bytes = int(max_bytes)
+        self.timeout_s = float(timeout_s)
+        self.max_entries = max(0, int(max_entries))
+        self.cache_max_bytes = max(0, int(cache_max_bytes))
+        self.ttl_s = float(ttl_s)
+        if session is None:
+            session = requests.Session()
+            # No retries: a failed fetch fails the request instead of stalling the axon thread in back-off
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self._session = session
+        self._lock = threading.Lock()
+        self._urls: OrderedDict[str, Tuple[float, str]] = collections.OrderedDict()  # url -> (expires_at, sha256), LRU first
+        self._bodies: Dict[str, FetchedCircuit] = {}
+        self._refs: Counter = Counter()
+        self._cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.too_large = 0
+        self.errors = 0
+
+    def fetch(self, url: str) -> FetchedCircuit:
+        """Return the circuit at url, from the cache when fresh. Raises CircuitFetchError"""
+        cached = self.get(url)
+        if cached is not None:
+            return cached
+        try:
+            circuit = self._download(url)
+        except CircuitFetchError:
+            raise
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            raise CircuitFetchError(f"failed to download circuit from {url}: {e}") from e
+        self._store(circuit)
+        return circuit
+
+    def get(self, url: str) -> Optional[FetchedCircuit]:
+        """The cached circuit for url, or None when it is missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._urls.get(url)
+            if entry is not None and entry[0] > now:
+                self._urls.move_to_end(url)
+                self.hits += 1
+                body = self._bodies[entry[1]]
+                return body if body.url == url else FetchedCircuit(url, body.text, body.sha256, body.size)
+            if entry is not None:
+                self._drop(url)
+            self.misses += 1
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._urls),
+                "bodies": len(self._bodies),
+                "cached_bytes": self._cached_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "too_large": self.too_large,
+                "errors": self.errors,
+            }
+
+    def close(self) -> None:
+        self._session.close()
+
+    def _download(self, url: str) -> FetchedCircuit:
+        with self._session.get(url, stream=True, timeout=self.timeout_s) as response:
+            response.raise_for_status()
+            declared = response.headers.get("Content-Length")
+            if declared is not None and declared.isdigit() and int(declared) > self.max_bytes:
+                self._reject(url, int(declared))
+            body = bytearray()
+            for chunk in response.iter_content(CHUNK_BYTES):
+                body += chunk
+                if len(body) > self.max_bytes:
+                    self._reject(url, len(body))
+            text = bytes(body).decode(response.encoding or "utf-8", errors="replace")
+        return FetchedCircuit(url=url, text=text, sha256=hashlib.sha256(body).hexdigest(), size=len(body))
+
+    def _reject(self, url: str, size: int) -> None:
+        with self._lock:
+            self.too_large += 1
+        raise CircuitFetchError(f"circuit at {url} is larger than {self.max_bytes} bytes ({size})")
+
+    def _store(self, circuit: FetchedCircuit) -> None:
+        if self.max_entries == 0 or self.ttl_s <= 0 or circuit.size > self.cache_max_bytes:
+            return
+        with self._lock:
+            if circuit.url in self._urls:
+                self._drop(circuit.url)
+            if circuit.sha256 not in self._bodies:
+                self._bodies[circuit.sha256] = circuit
+                self._cached_bytes += circuit.size
+            self._refs[circuit.sha256] += 1
+            self._urls[circuit.url] = (time.monotonic() + self.ttl_s, circuit.sha256)
+            while self._urls and (len(self._urls) > self.max_entries or self._cached_bytes > self.cache_max_bytes):
+                self._drop(next(iter(self._urls)))
+
+    def _drop(self, url: str) -> None:
+        """Remove a URL entry, and its body once no URL refers to it. Call with the lock held"""
+        _, digest = self._urls.pop(url)
+        self._refs[digest] -= 1
+        if self._refs[digest] <= 0:
+            del self._refs[digest]
+            self._cached_bytes -= self._bodies.pop(digest).size
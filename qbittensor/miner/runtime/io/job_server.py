@@ -152,3 +152,9 @@ def send_error_to_job_server(registry, error_data: dict) -> None:
         bt.logging.trace(f"[job_server_ops] Failed to send error to job server: {e}")
 
 
+def send_transition_to_job_server(registry, transition) -> None:
+    """Report a non-terminal status change via PATCH /v{API_VERSION}/executions/:execution_id."""
+    try:
+        registry._request_manager.patch(endpoint=f"executions/{transition.execution_id}", json={"status": transition.new_status})
+    except Exception as e:
+        bt.logging.trace(f"[job_server_ops] Failed to send status transition to job server: {e}")
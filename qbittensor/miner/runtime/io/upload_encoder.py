@@ -0,0 +1,137 @@
+"""
+Encoders for measurement-count uploads.
+
+Two body formats, chosen per upload slot by the job server (UploadDataResponse.result_format):
+- "json": the {"bitstring": count} object uploaded today, written with orjson when it is installed
+- "packed": compact binary counts, the MeasurementCounts wire format. Header b"QBC1", varint bitstring width,
+  varint entry count, then per entry the bitstring as a big-endian integer in ceil(width / 8) bytes followed by a
+  varint count
+
+Either body can be compressed with "gzip" or, when the zstandard package is installed, "zstd"
+(UploadDataResponse.content_encoding). Bodies are produced as chunks and spooled to a temporary file that
+moves to disk past SPOOL_MAX_MEMORY_BYTES, so a large distribution is never held in memory twice; the file is
+uploaded with an explicit Content-Length, which presigned S3 PUTs require.
+"""
+from __future__ import annotations
+
+import json
+import tempfile
+import zlib
+from dataclasses import dataclass, field
+from typing import IO, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from qbittensor.utils.measurement_counts import MeasurementCounts
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+PACKED_CONTENT_TYPE = "application/vnd.qbittensor.counts"
+JSON_CONTENT_TYPE = "application/json"
+# Entries serialized per chunk
+CHUNK_ENTRIES = 4096
+SPOOL_MAX_MEMORY_BYTES = 1 << 20
+# Fast levels: bitstring payloads compress well even at level 1, and encode time sits on the completion path
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+
+
+def supported_formats() -> List[str]:
+    return ["packed", "json"]
+
+
+def supported_encodings() -> List[str]:
+    """Content encodings this miner can produce, preferred first"""
+    return (["zstd"] if zstandard is not None else []) + ["gzip", "identity"]
+
+
+def dumps_json(counts: Mapping[str, int]) -> bytes:
+    """Serialize counts as compact JSON"""
+    if orjson is not None:
+        return orjson.dumps(counts)
+    return json.dumps(counts, separators=(",", ":")).encode()
+
+
+def iter_json(counts: "MeasurementCounts | Mapping[str, int]", chunk_entries: int = CHUNK_ENTRIES) -> Iterator[bytes]:
+    """Yield the JSON object for counts in pieces of up to chunk_entries entries"""
+    items = list((counts.to_dict() if isinstance(counts, MeasurementCounts) else counts).items())
+    if not items:
+        yield b"{}"
+        return
+    for start in range(0, len(items), chunk_entries):
+        piece = dumps_json(dict(items[start:start + chunk_entries]))
+        # Strip each piece's braces and rejoin them as one object
+        yield (b"{" if start == 0 else b",") + piece[1:-1]
+    yield b"}"
+
+
+def iter_packed(counts: "MeasurementCounts | Mapping[str, int]", chunk_entries: int = CHUNK_ENTRIES) -> Iterator[bytes]:
+    """Yield the packed binary form of counts. Dict bitstrings of different widths are left-padded to the widest"""
+    return MeasurementCounts.coerce(counts, pad=True).iter_packed(chunk_entries)
+
+
+def decode_packed(data: bytes) -> Dict[str, int]:
+    """Inverse of iter_packed"""
+    return MeasurementCounts.from_packed_bytes(data).to_dict()
+
+
+def _compress(chunks: Iterable[bytes], encoding: Optional[str]) -> Iterator[bytes]:
+    if encoding in (None, "", "identity"):
+        yield from chunks
+        return
+    if encoding == "gzip":
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            yield compressor.compress(chunk)
+        yield compressor.flush()
+        return
+    if encoding == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd content encoding requires the zstandard package")
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        for chunk in chunks:
+            yield compressor.compress(chunk)
+        yield compressor.flush()
+        return
+    raise ValueError(f"unsupported content encoding: {encoding}")
+
+
+@dataclass
+class EncodedBody:
+    """A spooled upload body and the headers that describe it. Close it once the upload is done"""
+    file: IO[bytes]
+    length: int
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def encode_counts(counts: "MeasurementCounts | Mapping[str, int]", result_format: str = "json", content_encoding: Optional[str] = None) -> EncodedBody:
+    """Encode counts in `result_format`, compress with `content_encoding` and spool the result for upload"""
+    if result_format == "packed":
+        chunks, content_type = iter_packed(counts), PACKED_CONTENT_TYPE
+    elif result_format == "json":
+        chunks, content_type = iter_json(counts), JSON_CONTENT_TYPE
+    else:
+        raise ValueError(f"unsupported result format: {result_format}")
+
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES)
+    try:
+        for piece in _compress(chunks, content_encoding):
+            spool.write(piece)
+        length = spool.tell()
+        spool.seek(0)
+    except Exception:
+        spool.close()
+        raise
+    headers = {"Content-Type": content_type, "Content-Length": str(length)}
+    if content_encoding not in (None, "", "identity"):
+        headers["Content-Encoding"] = content_encoding
+    return EncodedBody(file=spool, length=length, headers=headers)
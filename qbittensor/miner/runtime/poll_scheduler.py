@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Fraction of the provider's remaining-time estimate to wait before polling again: polls get tighter as the ETA shrinks
+ETA_FRACTION = 0.5
+# RUNNING jobs without an ETA never back off further than this, so completion is still noticed promptly
+RUNNING_MAX_INTERVAL_S = 5.0
+TERMINAL_PROVIDER_STATUSES = ("COMPLETED", "FAILED", "CANCELLED")
+
+
+class PollScheduler:
+    """
+    Decides when each tracked job is polled next, instead of re-polling every job on every provider-thread pass.
+
+    Jobs sit in a min-heap keyed on their next poll time. After each poll the interval is derived from the
+    provider status: with an ETA the job is polled again after a fraction of it (clamped to
+    [min_interval_s, max_interval_s]); without one it backs off exponentially while it stays in the same state
+    (QUEUED jobs up to max_interval_s, RUNNING jobs up to RUNNING_MAX_INTERVAL_S). New jobs, terminal statuses
+    that still need finalizing and state changes are polled at min_interval_s.
+
+    Only the provider thread uses the scheduler, so it is not locked.
+    """
+
+    def __init__(self, min_interval_s: float, max_interval_s: float = 30.0, backoff: float = 2.0) -> None:
+        self.min_interval_s = max(0.0, float(min_interval_s))
+        self.max_interval_s = max(self.min_interval_s, float(max_interval_s))
+        self.backoff = max(1.0, float(backoff))
+        self._heap: List[Tuple[float, int, str]] = []
+        self._next: Dict[str, float] = {}  # execution_id -> scheduled time; heap entries that disagree are stale
+        self._streak: Dict[str, Tuple[Optional[str], int]] = {}  # execution_id -> (last state, consecutive polls in it)
+        self._interval: Dict[str, float] = {}  # execution_id -> interval chosen by its last reschedule
+        self._seq = 0
+        self.polls = 0
+
+    def __len__(self) -> int:
+        return len(self._next)
+
+    def sync(self, execution_ids: Iterable[str], now: float) -> None:
+        """Track new jobs (due immediately) and forget jobs that are no longer in `execution_ids`"""
+        live = set(execution_ids)
+        for execution_id in live:
+            if execution_id not in self._next:
+                self._push(execution_id, now)
+        for execution_id in [eid for eid in self._next if eid not in live]:
+            self.forget(execution_id)
+
+    def forget(self, execution_id: str) -> None:
+        self._next.pop(execution_id, None)
+        self._streak.pop(execution_id, None)
+        self._interval.pop(execution_id, None)
+
+    def pop_due(self, now: float) -> List[str]:
+        """Remove and return the jobs due at `now`, earliest first. Each must be rescheduled after its poll"""
+        due: List[str] = []
+        while self._heap and self._heap[0][0] <= now:
+            at, _, execution_id = heapq.heappop(self._heap)
+            if self._next.get(execution_id) != at:
+                continue
+            del self._next[execution_id]
+            due.append(execution_id)
+        self.polls += len(due)
+        return due
+
+    def reschedule(self, execution_id: str, status: Optional[str], eta_seconds: Optional[float], now: float) -> float:
+        """
+        Schedule the next poll after a poll returned `status` (None if the poll failed). Returns the interval.
+        """
+        state = status if status is not None else "ERROR"
+        last_state, streak = self._streak.get(execution_id, (None, 0))
+        streak = streak + 1 if state == last_state else 0
+        self._streak[execution_id] = (state, streak)
+        interval = self.interval_for(status, eta_seconds, streak)
+        self._interval[execution_id] = interval
+        self._push(execution_id, now + interval)
+        return interval
+
+    def defer(self, execution_id: str, now: float) -> float:
+        """Push back a popped job that was not polled (its previous call is still running), keeping its streak"""
+        interval = self._interval.get(execution_id, self.min_interval_s)
+        self.polls -= 1
+        self._push(execution_id, now + interval)
+        return interval
+
+    def interval_for(self, status: Optional[str], eta_seconds: Optional[float], streak: int) -> float:
+        """Seconds until the next poll of a job that has been in `status` for `streak` consecutive polls"""
+        if status in TERMINAL_PROVIDER_STATUSES:
+            return self.min_interval_s
+        if eta_seconds is not None and eta_seconds >= 0:
+            return self._clamp(eta_seconds * ETA_FRACTION)
+        cap = min(self.max_interval_s, RUNNING_MAX_INTERVAL_S) if status == "RUNNING" else self.max_interval_s
+        return min(cap, max(self.min_interval_s, self.min_interval_s * self.backoff ** streak))
+
+    def next_due(self) -> Optional[float]:
+        """The earliest scheduled poll time, or None if nothing is tracked"""
+        while self._heap and self._next.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval_s, max(self.min_interval_s, interval))
+
+    def _push(self, execution_id: str, at: float) -> None:
+        self._seq += 1
+        self._next[execution_id] = at
+        heapq.heappush(self._heap, (at, self._seq, execution_id))
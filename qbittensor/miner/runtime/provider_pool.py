@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Iterable, List, Optional, Set
+
+import bittensor as bt
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_CALL_TIMEOUT_S = 30.0
+# Submits create a billed provider job, so they are waited for much longer than polls and never cancelled
+DEFAULT_SUBMIT_TIMEOUT_S = 300.0
+
+
+class ProviderCallTimeout(TimeoutError):
+    """A provider call did not return within the pool's per-call timeout"""
+
+
+class ProviderCallPool:
+    """
+    Bounded worker pool for blocking provider calls (poll, receipt, cancel, availability, pricing).
+
+    At most `max_workers` calls run at once. Callers wait up to `timeout_s` for a result; a call that overruns
+    is reported as ProviderCallTimeout but keeps its worker until the provider returns, since Python threads
+    cannot be interrupted. Workers are daemon threads, so a hung call never blocks process exit.
+
+    Calls can be tagged with keys (execution ids): a key stays busy until its call finishes, so the provider
+    thread never issues a second call for a job while the first is outstanding, and results for one job are
+    always applied in the order they were requested.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, timeout_s: float = DEFAULT_CALL_TIMEOUT_S) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.timeout_s = float(timeout_s)
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._busy: Set[str] = set()
+        self.submitted = 0
+        self.timed_out = 0
+
+    def submit(self, keys: Iterable[str], fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Run fn(*args, **kwargs) on a worker, marking `keys` busy until it finishes"""
+        keys = list(keys)
+        future: Future = Future()
+        with self._lock:
+            self._busy.update(keys)
+            self.submitted += 1
+            if not self._workers:
+                self._start_workers()
+        future.add_done_callback(lambda _: self._release(keys))
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def call(self, fn: Callable[..., Any], *args: Any, timeout_s: Optional[float] = None, **kwargs: Any) -> Any:
+        """Run fn on a worker and wait for its result, raising ProviderCallTimeout after the timeout"""
+        return self.result(self.submit((), fn, *args, **kwargs), timeout_s)
+
+    def result(self, future: Future, timeout_s: Optional[float] = None, cancel: bool = True) -> Any:
+        """
+        Wait for a submitted call, raising ProviderCallTimeout after `timeout_s` (default: the pool timeout).
+        Threads cannot be interrupted, so `cancel` only exists for parity with AsyncProviderRuntime.result
+        """
+        timeout_s = self.timeout_s if timeout_s is None else timeout_s
+        try:
+            return future.result(timeout=max(0.0, timeout_s))
+        except FutureTimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            raise ProviderCallTimeout(f"Provider call did not return within {timeout_s:.1f}s") from None
+
+    def is_busy(self, key: str) -> bool:
+        with self._lock:
+            return key in self._busy
+
+    def busy_count(self) -> int:
+        with self._lock:
+            return len(self._busy)
+
+    def shutdown(self) -> None:
+        """Cancel queued calls and let idle workers exit. Running calls are not interrupted"""
+        bt.logging.debug(f"| Provider Pool | Shutting down ({self.submitted} calls, {self.timed_out} timed out)")
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._queue.put(None)
+
+    def _start_workers(self) -> None:
+        for i in range(self.max_workers):
+            worker = threading.Thread(target=self._work, name=f"Provider Call {i + 1}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def _release(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            self._busy.difference_update(keys)
+
+
+def call_provider(registry, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a provider call through the registry's pool (with its timeout), or inline if the registry has none"""
+    pool: Optional[ProviderCallPool] = getattr(registry, "_provider_pool", None)
+    if pool is None:
+        return fn(*args, **kwargs)
+    return pool.call(fn, *args, **kwargs)
@@ -0,0 +1,164 @@
+"""
+Admission control for new executions (Miner._rate_limit).
+
+RateLimiter is the extension point: any object with allow(validator_hotkey) -> Optional[str] (None to accept,
+otherwise the rejection reason) can be assigned to Miner.rate_limiter; an optional refund(validator_hotkey) is
+called when an allowed request is then not accepted. CapacityRateLimiter, the default, checks
+in order:
+
+1. capacity: the registry's executions with a provider job (Queued or Running) against MINER_MAX_INFLIGHT, the
+   provider's cached availability, and (optionally) the provider's pending queue;
+2. a global token bucket of `rate_per_s` new executions per second;
+3. a token bucket per validator hotkey whose rate is the validator's share of total stake (at least
+   `min_share`) times `rate_per_s`.
+
+Every check is a few attribute reads or one bucket update, so a decision is O(1) and only takes the lock of the
+bucket it touches.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from typing import Dict, Mapping, Optional, Protocol
+
+DEFAULT_BURST_S = 10.0
+DEFAULT_MIN_SHARE = 0.05
+
+
+class RateLimiter(Protocol):
+    def allow(self, validator_hotkey: Optional[str]) -> Optional[str]:
+        """None to accept a new execution from this validator, otherwise the reason it is rejected"""
+        ...
+
+
+class TokenBucket:
+    """`rate` tokens per second up to `capacity`; take() spends one token if there is one"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "_lock")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+    def refund(self) -> None:
+        """Return a token taken for a request that was rejected by a later check"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1.0)
+
+    def reconfigure(self, rate: float, capacity: float) -> None:
+        with self._lock:
+            self.rate = float(rate)
+            self.capacity = max(1.0, float(capacity))
+            self.tokens = min(self.tokens, self.capacity)
+
+
+class CapacityRateLimiter:
+    """
+    Default RateLimiter: registry and provider capacity, then global and stake-weighted per-validator buckets.
+
+    rate_per_s <= 0 disables both token buckets and leaves only the capacity checks. provider_max_pending <= 0
+    ignores the provider's pending_jobs. Stakes come from update_stakes() (hotkey -> stake); until it is called,
+    or for hotkeys it does not list, a validator gets min_share of the rate.
+    """
+
+    def __init__(
+        self,
+        registry,
+        rate_per_s: float = 0.0,
+        burst_s: float = DEFAULT_BURST_S,
+        min_share: float = DEFAULT_MIN_SHARE,
+        provider_max_pending: int = 0,
+    ) -> None:
+        self.registry = registry
+        self.rate_per_s = max(0.0, float(rate_per_s))
+        self.burst_s = max(0.0, float(burst_s))
+        self.min_share = min(max(0.0, float(min_share)), 1.0)
+        self.provider_max_pending = int(provider_max_pending)
+        self._global = TokenBucket(self.rate_per_s, self.rate_per_s * self.burst_s) if self.rate_per_s > 0 else None
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._shares: Dict[str, float] = {}
+        self._stats_lock = threading.Lock()
+        self.allowed = 0
+        self.refunded = 0
+        self.rejected: Counter = Counter()
+
+    def update_stakes(self, stakes: Mapping[str, float]) -> None:
+        """Recompute every validator's share of the rate from hotkey -> stake"""
+        total = sum(max(0.0, float(stake)) for stake in stakes.values())
+        self._shares = {hotkey: max(0.0, float(stake)) / total for hotkey, stake in stakes.items()} if total > 0 else {}
+        for hotkey, bucket in list(self._buckets.items()):
+            bucket.reconfigure(*self._bucket_params(hotkey))
+
+    def allow(self, validator_hotkey: Optional[str]) -> Optional[str]:
+        reason = self._check_capacity()
+        if reason is None and self._global is not None:
+            if not self._global.take():
+                reason = "global"
+            elif not self._bucket(validator_hotkey or "").take():
+                self._global.refund()
+                reason = "validator"
+        with self._stats_lock:
+            if reason is None:
+                self.allowed += 1
+            else:
+                self.rejected[reason] += 1
+        return reason
+
+    def refund(self, validator_hotkey: Optional[str]) -> None:
+        """Give back the tokens of an allowed request that was not accepted after all (e.g. the submit pool was full)"""
+        if self._global is not None:
+            self._global.refund()
+            bucket = self._buckets.get(validator_hotkey or "")
+            if bucket is not None:
+                bucket.refund()
+        with self._stats_lock:
+            self.refunded += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._stats_lock:
+            return {
+                "allowed": self.allowed,
+                "refunded": self.refunded,
+                "rejected": dict(self.rejected),
+                "validators": len(self._buckets),
+            }
+
+    def _check_capacity(self) -> Optional[str]:
+        max_inflight = getattr(self.registry, "_max_inflight", None)
+        # Pending executions have no provider job yet; the submit pool bounds them on its own
+        if max_inflight is not None:
+            submitted = self.registry.get_inflight_count() - self.registry.get_pending_count()
+            if submitted >= max_inflight:
+                return "inflight"
+        availability = self.registry.get_cached_availability()
+        if availability is not None:
+            if availability.is_available is False:
+                return "provider_unavailable"
+            pending = availability.pending_jobs
+            if self.provider_max_pending > 0 and pending is not None and pending >= self.provider_max_pending:
+                return "provider_queue"
+        return None
+
+    def _bucket(self, hotkey: str) -> TokenBucket:
+        bucket = self._buckets.get(hotkey)
+        if bucket is None:
+            bucket = self._buckets.setdefault(hotkey, TokenBucket(*self._bucket_params(hotkey)))
+        return bucket
+
+    def _bucket_params(self, hotkey: str):
+        rate = self.rate_per_s * max(self.min_share, self._shares.get(hotkey, 0.0))
+        return rate, rate * self.burst_s
@@ -4,23 +4,71 @@ import time
 from datetime import timedelta
 from typing import Dict, Optional
 import queue
-from typing import Dict, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from bittensor_wallet import Keypair
 from typing import Optional, Dict
-import requests
 import os
 
 
 from pkg.database.database_manager import DatabaseManager
-from qbittensor.miner.providers.base import Capabilities, MinerIdentity, ProviderAdapter
+from qbittensor.miner.providers.async_shim import is_async_adapter
+from qbittensor.miner.providers.base import AsyncProviderAdapter, Capabilities, MinerIdentity, ProviderAdapter
 from qbittensor.miner.providers.registry import get_adapter
 from qbittensor.utils.request.RequestManager import RequestManager
 from qbittensor.miner.runtime.observability.error_reporter import build_error_event
 from qbittensor.miner.runtime.flows.completion_flow import persist_completion as _persist_completion_external
-from qbittensor.miner.runtime.repository import insert_pending
+from qbittensor.miner.runtime.repository import insert_pending, persist_failed
 from qbittensor.miner.runtime.types import UploadDataResponse, _TrackedJob
+from qbittensor.miner.runtime.io.circuit_fetcher import (
+    DEFAULT_CACHE_ENTRIES as DEFAULT_QASM_CACHE_ENTRIES,
+    DEFAULT_CACHE_TTL_S as DEFAULT_QASM_CACHE_TTL_S,
+    DEFAULT_MAX_BYTES as DEFAULT_QASM_MAX_BYTES,
+    CircuitFetcher,
+    FetchedCircuit,
+)
+from qbittensor.miner.runtime.io.upload_encoder import supported_encodings, supported_formats
+from qbittensor.miner.runtime.storage import ExecutionRecord, ExecutionStore, get_execution_store
+from qbittensor.miner.runtime.write_behind import WriteBehindWriter
+from qbittensor.miner.runtime.state_index import ExecutionStateIndex, TERMINAL_STATUSES
+from qbittensor.validator.utils.execution_status import ExecutionStatus
+from qbittensor.miner.runtime.change_log import (
+    DEFAULT_MAX_ENTRIES as DEFAULT_CHANGE_LOG_SIZE,
+    ExecutionChangeLog,
+    parse_cursor,
+)
+from qbittensor.miner.runtime.state_machine import ExecutionStateMachine, Transition
+from qbittensor.utils.bloom_filter import BloomFilter
+from qbittensor.miner.runtime.poll_scheduler import PollScheduler
+from qbittensor.miner.runtime.async_provider import AsyncProviderRuntime
+from qbittensor.miner.runtime.upload_slots import (
+    DEFAULT_MAX_AGE_S as DEFAULT_UPLOAD_URL_MAX_AGE_S,
+    DEFAULT_MAX_SLOTS as DEFAULT_UPLOAD_SLOTS,
+    UploadSlotPool,
+)
+from qbittensor.miner.runtime.submit_pool import (
+    DEFAULT_MAX_PER_VALIDATOR as DEFAULT_SUBMIT_PER_VALIDATOR,
+    DEFAULT_MAX_QUEUE as DEFAULT_SUBMIT_QUEUE,
+    DEFAULT_WORKERS as DEFAULT_SUBMIT_WORKERS,
+    SubmitPool,
+    SubmitRequest,
+)
+from qbittensor.miner.runtime.completion_pipeline import (
+    DEFAULT_MAX_QUEUE as DEFAULT_COMPLETION_QUEUE,
+    DEFAULT_WORKERS as DEFAULT_COMPLETION_WORKERS,
+    CompletionPipeline,
+)
+from qbittensor.miner.runtime.provider_pool import (
+    DEFAULT_CALL_TIMEOUT_S,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_SUBMIT_TIMEOUT_S,
+    ProviderCallPool,
+    ProviderCallTimeout,
+    call_provider,
+)
 
 STATUS_UPDATE_INTERVAL_S = 30
+DEDUP_BLOOM_CAPACITY = 1_000_000
+DEDUP_BLOOM_ERROR_RATE = 0.001
 LOCK_TIMEOUT_S = 5.0
 
 TIMER_COUNTDOWN: timedelta = timedelta(seconds=30)
@@ -29,10 +77,12 @@ TIMER_COUNTDOWN: timedelta = timedelta(seconds=30)
 class JobRegistry:
     """
     Main thread: Bittensor operations (handled by Miner class)
+    Submit workers: Circuit download and provider submission for accepted executions
     Provider thread: All provider calls (submit, poll, cancel, get_availability, get_pricing)
+    Completion workers: Receipt, result upload and persistence for COMPLETED jobs
     Job server thread: All job endpoint communication
     """
-    def __init__(self, db: DatabaseManager, keypair: Keypair, poll_interval_s: float = 1.0, adapter: Optional[ProviderAdapter] = None) -> None:
+    def __init__(self, db: DatabaseManager, keypair: Keypair, poll_interval_s: float = 1.0, adapter: Optional[ProviderAdapter | AsyncProviderAdapter] = None, write_behind: Optional[bool] = None, store: Optional[ExecutionStore] = None) -> None:
         self.database_manager = db
         self.db = db
         self.keypair = keypair
@@ -55,6 +105,7 @@ class JobRegistry:
         
         self._status_queue: "queue.Queue[Dict]" = queue.Queue(maxsize=10)   
         self._error_queue: "queue.Queue[Dict]" = queue.Queue(maxsize=100)   
+        self._transition_queue: "queue.Queue[Transition]" = queue.Queue(maxsize=1000)
         
         self._last_status_update = time.time()
         self._availability_cache = None
@@ -68,11 +119,124 @@ class JobRegistry:
             self._max_inflight: int = int(os.getenv("MINER_MAX_INFLIGHT", "1000"))
         except Exception:
             self._max_inflight = 1000
+
+        # Handles per poll_many request, for adapters that support batch polling
+        try:
+            self._poll_batch_size: int = max(1, int(os.getenv("MINER_POLL_BATCH_SIZE", "100")))
+        except Exception:
+            self._poll_batch_size = 100
+
+        # Per-job poll timing from provider ETAs/states; poll_interval_s is the tightest cadence
+        try:
+            poll_max_interval_s = float(os.getenv("MINER_POLL_MAX_INTERVAL_S", "30"))
+        except Exception:
+            poll_max_interval_s = 30.0
+        self._poll_scheduler = PollScheduler(min_interval_s=poll_interval_s, max_interval_s=poll_max_interval_s)
+
+        # Provider calls (submit, poll, receipt, cancel, availability, pricing) run on a bounded pool
+        try:
+            provider_concurrency = int(os.getenv("MINER_PROVIDER_CONCURRENCY", str(DEFAULT_MAX_WORKERS)))
+            provider_timeout_s = float(os.getenv("MINER_PROVIDER_CALL_TIMEOUT_S", str(DEFAULT_CALL_TIMEOUT_S)))
+        except Exception:
+            provider_concurrency, provider_timeout_s = DEFAULT_MAX_WORKERS, DEFAULT_CALL_TIMEOUT_S
+        try:
+            self._submit_timeout_s: float = float(os.getenv("MINER_PROVIDER_SUBMIT_TIMEOUT_S", str(DEFAULT_SUBMIT_TIMEOUT_S)))
+        except Exception:
+            self._submit_timeout_s = DEFAULT_SUBMIT_TIMEOUT_S
+
+        # Completed jobs are finalized (receipt, upload, persist) by worker threads; MINER_COMPLETION_WORKERS=0 runs it inline
+        try:
+            completion_workers = int(os.getenv("MINER_COMPLETION_WORKERS", str(DEFAULT_COMPLETION_WORKERS)))
+            completion_queue = int(os.getenv("MINER_COMPLETION_QUEUE", str(DEFAULT_COMPLETION_QUEUE)))
+        except Exception:
+            completion_workers, completion_queue = DEFAULT_COMPLETION_WORKERS, DEFAULT_COMPLETION_QUEUE
+        self._completion_pipeline: Optional[CompletionPipeline] = None
+        if completion_workers > 0:
+            self._completion_pipeline = CompletionPipeline(self, workers=completion_workers, max_queue=completion_queue)
+
+        # Accepted executions are downloaded and submitted by worker threads; MINER_SUBMIT_WORKERS=0 submits inside forward
+        try:
+            submit_workers = int(os.getenv("MINER_SUBMIT_WORKERS", str(DEFAULT_SUBMIT_WORKERS)))
+            submit_queue = int(os.getenv("MINER_SUBMIT_QUEUE", str(DEFAULT_SUBMIT_QUEUE)))
+            submit_per_validator = int(os.getenv("MINER_SUBMIT_PER_VALIDATOR", str(DEFAULT_SUBMIT_PER_VALIDATOR)))
+        except Exception:
+            submit_workers, submit_queue, submit_per_validator = DEFAULT_SUBMIT_WORKERS, DEFAULT_SUBMIT_QUEUE, DEFAULT_SUBMIT_PER_VALIDATOR
+        self._submit_pool: Optional[SubmitPool] = None
+        if submit_workers > 0:
+            self._submit_pool = SubmitPool(self, workers=submit_workers, max_queue=submit_queue, max_per_validator=submit_per_validator)
+
+        # Presigned upload slots fetched ahead of completions; MINER_UPLOAD_PREFETCH_MAX=0 fetches one per completion
+        try:
+            upload_prefetch_max = int(os.getenv("MINER_UPLOAD_PREFETCH_MAX", str(DEFAULT_UPLOAD_SLOTS)))
+            upload_url_max_age_s = float(os.getenv("MINER_UPLOAD_URL_MAX_AGE_S", str(DEFAULT_UPLOAD_URL_MAX_AGE_S)))
+        except Exception:
+            upload_prefetch_max, upload_url_max_age_s = DEFAULT_UPLOAD_SLOTS, DEFAULT_UPLOAD_URL_MAX_AGE_S
+        self._upload_slots: Optional[UploadSlotPool] = None
+        if upload_prefetch_max > 0:
+            self._upload_slots = UploadSlotPool(lambda: self._get_upload_data(), max_slots=upload_prefetch_max, max_age_s=upload_url_max_age_s)
+
+        # Circuit downloads: pooled and size-guarded; the submit worker fetches once, and the cache absorbs validator retries
+        try:
+            qasm_max_bytes = int(os.getenv("MINER_QASM_MAX_BYTES", str(DEFAULT_QASM_MAX_BYTES)))
+            qasm_cache_entries = int(os.getenv("MINER_QASM_CACHE_ENTRIES", str(DEFAULT_QASM_CACHE_ENTRIES)))
+            qasm_cache_ttl_s = float(os.getenv("MINER_QASM_CACHE_TTL_S", str(DEFAULT_QASM_CACHE_TTL_S)))
+        except Exception:
+            qasm_max_bytes, qasm_cache_entries, qasm_cache_ttl_s = DEFAULT_QASM_MAX_BYTES, DEFAULT_QASM_CACHE_ENTRIES, DEFAULT_QASM_CACHE_TTL_S
+        self._circuit_fetcher = CircuitFetcher(max_bytes=qasm_max_bytes, max_entries=qasm_cache_entries, ttl_s=qasm_cache_ttl_s)
+
+        # Optional group-commit writer for execution state transitions (MINER_WRITE_BEHIND=1)
+        if write_behind is None:
+            write_behind = os.getenv("MINER_WRITE_BEHIND", "0").lower() in ("1", "true", "yes")
+        self._write_behind: Optional[WriteBehindWriter] = None
+        if write_behind:
+            try:
+                max_batch = int(os.getenv("MINER_WRITE_BEHIND_MAX_BATCH", "256"))
+                flush_interval_s = float(os.getenv("MINER_WRITE_BEHIND_FLUSH_S", "0.05"))
+            except Exception:
+                max_batch, flush_interval_s = 256, 0.05
+            self._write_behind = WriteBehindWriter(db, max_batch=max_batch, flush_interval_s=flush_interval_s)
+
+        # Where execution records live (MINER_STORAGE_BACKEND=sqlite|memory|mmap); write-behind only applies to sqlite
+        self.store: ExecutionStore = store if store is not None else get_execution_store(db, write_behind=self._write_behind)
+
+        # Sequenced record of execution changes; recent ones serve validators' finished-execution requests from memory
+        try:
+            change_log_size = int(os.getenv("MINER_CHANGE_LOG_SIZE", str(DEFAULT_CHANGE_LOG_SIZE)))
+        except Exception:
+            change_log_size = DEFAULT_CHANGE_LOG_SIZE
+        self._change_log = ExecutionChangeLog(change_log_size)
+
+        # Optional Bloom filter over known execution ids (MINER_DEDUP_BLOOM=1): ids missing from the state index are
+        # only looked up in the store when the filter says they may exist
+        try:
+            dedup_bloom = os.getenv("MINER_DEDUP_BLOOM", "0").lower() in ("1", "true", "yes")
+            self._dedup_bloom_capacity = int(os.getenv("MINER_DEDUP_BLOOM_CAPACITY", str(DEDUP_BLOOM_CAPACITY)))
+        except Exception:
+            dedup_bloom, self._dedup_bloom_capacity = False, DEDUP_BLOOM_CAPACITY
+        self._seen_filter: Optional[BloomFilter] = BloomFilter(self._dedup_bloom_capacity, DEDUP_BLOOM_ERROR_RATE) if dedup_bloom else None
+        self._state_index_complete = False
+
+        # execution_id -> status mirror of the executions table; kept current by the repository functions
+        self._state_index = ExecutionStateIndex()
+        # Validates status writes against the index: unchanged statuses are not rewritten, changes are emitted
+        self._state_machine = ExecutionStateMachine(self._state_index)
+        self._state_machine.add_listener(self._enqueue_transition)
+        if self._seen_filter is not None:
+            self._state_machine.add_listener(self._record_seen)
+        self._rebuild_state_index()
         
-        self.adapter: ProviderAdapter = adapter if adapter is not None else get_adapter()
+        adapter = adapter if adapter is not None else get_adapter()
+        # MINER_PROVIDER_RUNTIME=async drives the adapter from one event loop; async adapters always need it
+        runtime = os.getenv("MINER_PROVIDER_RUNTIME", "threads").lower()
+        if runtime == "async" or is_async_adapter(adapter):
+            self._provider_pool = AsyncProviderRuntime(adapter, timeout_s=provider_timeout_s)
+            adapter = self._provider_pool.adapter
+        else:
+            self._provider_pool = ProviderCallPool(max_workers=provider_concurrency, timeout_s=provider_timeout_s)
+        self.adapter: ProviderAdapter | AsyncProviderAdapter = adapter
         devices = []
         try:
-            devices = self.adapter.list_devices() if hasattr(self.adapter, "list_devices") else []
+            devices = call_provider(self, self.adapter.list_devices) if hasattr(self.adapter, "list_devices") else []
         except Exception as e:
             bt.logging.error(f" [provider] list_devices failed: {e}")
             try:
@@ -91,6 +255,7 @@ class JobRegistry:
                 pass
         self._default_device = devices[0] if len(devices) > 0 else None
         self.default_device_id: str | None = self._default_device.device_id if self._default_device else None
+        self._fail_unsubmitted()
             
     def set_on_job_completed(self, callback: Callable[[str, Optional[float]], None]) -> None:
         """
@@ -108,7 +273,7 @@ class JobRegistry:
             availability = None
             pricing = None
             try:
-                availability = self.adapter.get_availability(self.default_device_id)
+                availability = call_provider(self, self.adapter.get_availability, self.default_device_id)
             except Exception as e:
                 try:
                     event = build_error_event(
@@ -125,7 +290,7 @@ class JobRegistry:
                 except Exception:
                     pass
             try:
-                pricing = self.adapter.get_pricing(self.default_device_id)
+                pricing = call_provider(self, self.adapter.get_pricing, self.default_device_id)
             except Exception as e:
                 try:
                     event = build_error_event(
@@ -149,7 +314,7 @@ class JobRegistry:
                 device_type=(self._default_device.device_type if self._default_device else ("QPU" if (self.default_device_id and "qpu" in self.default_device_id) else "SIMULATOR"))
             )
 
-            caps_list = self.adapter.list_capabilities()
+            caps_list = call_provider(self, self.adapter.list_capabilities)
             caps = None
             if len(caps_list) > 0:
                 cap0 = caps_list[0]
@@ -188,6 +353,10 @@ class JobRegistry:
 
     def start(self) -> None:
         """Start the provider and job server threads."""
+        self.store.start()
+        if self._upload_slots is not None:
+            self._upload_slots.start()
+
         if self._provider_thread is None or not self._provider_thread.is_alive():
             from qbittensor.miner.runtime.threads.provider_thread import run_provider
             self._provider_thread = threading.Thread(target=run_provider, args=(self,), name="Provider Thread", daemon=True)
@@ -205,22 +374,106 @@ class JobRegistry:
             self._provider_thread.join(timeout=2.0)
         if self._job_server_thread is not None:
             self._job_server_thread.join(timeout=2.0)
+        if self._submit_pool is not None:
+            self._submit_pool.shutdown()
+        if self._completion_pipeline is not None:
+            self._completion_pipeline.shutdown()
+        if self._upload_slots is not None:
+            self._upload_slots.stop()
+        self._provider_pool.shutdown()
+        self._circuit_fetcher.close()
+        self.store.stop()
 
-    def submit(self, execution_id: str, input_data_url: str, validator_hotkey: str, shots: int | None = None) -> None:
-        """Accept locally, then submit to provider and mark Queued/Running downstream."""
+    def flush_writes(self) -> None:
+        """Commit any queued execution-state writes so that subsequent reads observe them."""
+        self.store.flush()
+
+    def accept(self, execution_id: str, input_data_url: str, validator_hotkey: str, shots: int | None = None) -> bool:
+        """
+        Take a new execution from forward. With the submit pool, persist it as Pending and queue it without waiting
+        for the download or the provider; returns False if the pool is full. Without it, fetch and submit inline.
+        """
+        if self._submit_pool is None:
+            circuit = self.fetch_circuit(input_data_url)
+            self.submit(execution_id=execution_id, input_data_url=input_data_url, validator_hotkey=validator_hotkey, shots=shots, qasm=circuit.text)
+            return True
+        if not self._submit_pool.has_room(validator_hotkey):
+            return False
+        # Pending is written before a worker can see the execution, so it can never land after the worker's Queued
+        insert_pending(self, execution_id=execution_id, validator_hotkey=validator_hotkey, handle=type("H", (), {"provider_job_id": None, "device_id": None})(), shots=shots)
+        if not self._submit_pool.offer(execution_id, input_data_url, validator_hotkey, shots):
+            # The pool filled up after the room check; fail the execution rather than leave it Pending
+            persist_failed(
+                self,
+                execution_id=execution_id,
+                validator_hotkey=validator_hotkey,
+                provider=getattr(self._default_device, "provider", None),
+                provider_job_id=None,
+                device_id=self.default_device_id,
+                error_message="Submit queue full",
+            )
+            return False
+        return True
+
+    def _submit_request(self, request: SubmitRequest) -> bool:
+        """Submit worker body: download the circuit and submit it. An unreachable circuit fails the execution."""
         try:
-            insert_pending(self, execution_id=execution_id, validator_hotkey=validator_hotkey, handle=type("H", (), {"provider_job_id": None, "device_id": None})(), shots=shots)
+            circuit = self.fetch_circuit(request.input_data_url)
         except Exception as e:
-            bt.logging.debug(f" Failed to persist initial Pending state for {execution_id}: {e}")
+            bt.logging.debug(f" Failed to download QASM for execution {request.execution_id}: {e}")
+            try:
+                persist_failed(
+                    self,
+                    execution_id=request.execution_id,
+                    validator_hotkey=request.validator_hotkey,
+                    provider=getattr(self._default_device, "provider", None),
+                    provider_job_id=None,
+                    device_id=self.default_device_id,
+                    error_message=f"Circuit download failed: {e}",
+                )
+                self._enqueue_error_event(build_error_event(
+                    stage="circuit.fetch",
+                    code="EXCEPTION",
+                    message=str(e),
+                    retryable=False,
+                    execution_id=request.execution_id,
+                    provider_job_id=None,
+                    device_id=self.default_device_id,
+                    context=None,
+                ))
+            except Exception:
+                pass
+            return False
+        return self.submit(
+            execution_id=request.execution_id,
+            input_data_url=request.input_data_url,
+            validator_hotkey=request.validator_hotkey,
+            shots=request.shots,
+            qasm=circuit.text,
+            pending_persisted=True,
+        )
+
+    def submit_stats(self) -> Dict:
+        """Submit pool queue, fairness and wait metrics ({} when executions are submitted inline)."""
+        return self._submit_pool.stats() if self._submit_pool is not None else {}
+
+    def submit(self, execution_id: str, input_data_url: str, validator_hotkey: str, shots: int | None = None, qasm: str | None = None, pending_persisted: bool = False) -> bool:
+        """Accept locally, then submit to provider and mark Queued/Running downstream. Pass `qasm` if the circuit was already fetched, and `pending_persisted` if accept() already wrote the Pending row. Returns whether the provider took the job."""
+        if not pending_persisted:
+            try:
+                insert_pending(self, execution_id=execution_id, validator_hotkey=validator_hotkey, handle=type("H", (), {"provider_job_id": None, "device_id": None})(), shots=shots)
+            except Exception as e:
+                bt.logging.debug(f" Failed to persist initial Pending state for {execution_id}: {e}")
 
-        qasm = self._download_qasm(input_data_url)
-        bt.logging.info(f" Successfully downloaded QASM for execution {execution_id}")
         if qasm is None:
-            bt.logging.debug(f" Failed to download QASM for execution {execution_id}")
-            return
+            qasm = self._download_qasm(input_data_url)
+            if qasm is None:
+                bt.logging.debug(f" Failed to download QASM for execution {execution_id}")
+                return False
+            bt.logging.info(f" Successfully downloaded QASM for execution {execution_id}")
 
         try:
-            handle = self.adapter.submit(circuit_data=qasm, device_id=self.default_device_id, shots=shots)
+            handle = self._provider_submit(execution_id, validator_hotkey, qasm, shots)
         except Exception as e:
             bt.logging.error(f"Provider submit failed for execution {execution_id}: {e}")
             try:
@@ -237,8 +490,27 @@ class JobRegistry:
                 self._enqueue_error_event(event)
             except Exception:
                 pass
-            return
+            # Forward has already answered the validator, so a submit worker's failure must resolve the execution;
+            # a timed-out submit is left Pending for _adopt_late_submit
+            if pending_persisted and not isinstance(e, ProviderCallTimeout):
+                try:
+                    persist_failed(
+                        self,
+                        execution_id=execution_id,
+                        validator_hotkey=validator_hotkey,
+                        provider=getattr(self._default_device, "provider", None),
+                        provider_job_id=None,
+                        device_id=self.default_device_id,
+                        error_message=f"Provider submit failed: {e}",
+                    )
+                except Exception as persist_error:
+                    bt.logging.error(f" Failed to persist failed submit for {execution_id}: {persist_error}")
+            return False
+
+        self._track_submitted(execution_id, validator_hotkey, handle)
+        return True
 
+    def _track_submitted(self, execution_id: str, validator_hotkey: str, handle) -> None:
         tracked = _TrackedJob(execution_id=execution_id, validator_hotkey=validator_hotkey, handle=handle)
         with self._lock:
             self._jobs[execution_id] = tracked
@@ -248,16 +520,50 @@ class JobRegistry:
             update_to_queued(self, execution_id=execution_id, handle=handle)
         except Exception as e:
             bt.logging.trace(f"Failed to persist Queued state for {execution_id}: {e}")
-        
-        
+
+    def _provider_submit(self, execution_id: str, validator_hotkey: str, qasm: str, shots: int | None):
+        """
+        Submit a circuit to the provider, waiting up to MINER_PROVIDER_SUBMIT_TIMEOUT_S. The call is not cancelled on
+        timeout: a submit that returns afterwards is adopted by _adopt_late_submit instead of running untracked.
+        """
+        pool = getattr(self, "_provider_pool", None)
+        if pool is None:
+            return self.adapter.submit(circuit_data=qasm, device_id=self.default_device_id, shots=shots)
+        future = pool.submit([execution_id], self.adapter.submit, circuit_data=qasm, device_id=self.default_device_id, shots=shots)
+        try:
+            return pool.result(future, self._submit_timeout_s, cancel=False)
+        except ProviderCallTimeout:
+            future.add_done_callback(lambda done: threading.Thread(
+                target=self._adopt_late_submit, args=(execution_id, validator_hotkey, done), name="Late Submit", daemon=True,
+            ).start())
+            raise
+
+    def _adopt_late_submit(self, execution_id: str, validator_hotkey: str, future) -> None:
+        """Track a provider job whose submit returned after its timeout, or cancel it if the execution moved on."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        handle = future.result()
+        status = self._state_index.get(execution_id)
+        if self._stop.is_set() or self.is_tracking(execution_id) or status in TERMINAL_STATUSES:
+            bt.logging.warning(f" Cancelling provider job {getattr(handle, 'provider_job_id', None)} for execution {execution_id}: its submit returned after the timeout")
+            try:
+                call_provider(self, self.adapter.cancel, handle)
+            except Exception as e:
+                bt.logging.error(f" Failed to cancel late provider job for execution {execution_id}: {e}")
+            return
+        bt.logging.info(f" Provider submit for execution {execution_id} returned after the timeout; tracking it")
+        self._track_submitted(execution_id, validator_hotkey, handle)
+
+    def fetch_circuit(self, url: str) -> FetchedCircuit:
+        """Download (or reuse the cached) circuit at `url`. Raises CircuitFetchError."""
+        return self._circuit_fetcher.fetch(url)
+
     def _download_qasm(self, url: str) -> str | None:
         """Download QASM data from a URL."""
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            return response.text
-        except requests.exceptions.RequestException as req_e:
-            bt.logging.debug(f"HTTP request failed for execution url: {url}: {req_e}")
+            return self.fetch_circuit(url).text
+        except Exception as e:
+            bt.logging.debug(f"HTTP request failed for execution url: {url}: {e}")
 
     def cancel(self, execution_id: str) -> None:
         with self._lock:
@@ -265,7 +571,7 @@ class JobRegistry:
         if not tracked:
             return
         try:
-            self.adapter.cancel(tracked.handle)
+            call_provider(self, self.adapter.cancel, tracked.handle)
         except Exception as e:
             bt.logging.debug(f"Cancel failed for job {execution_id}: {e}")
             try:
@@ -287,6 +593,19 @@ class JobRegistry:
         """Legacy method for test compatibility - now a no-op since we submit directly."""
         pass
     
+    def _send_transition_to_job_server(self, transition: Transition) -> None:
+        from qbittensor.miner.runtime.io.job_server import send_transition_to_job_server
+        send_transition_to_job_server(self, transition)
+
+    def _enqueue_transition(self, transition: Transition) -> None:
+        """Queue a Queued/Running transition for the job server thread; Pending and terminal statuses are reported elsewhere."""
+        if transition.new_status not in (ExecutionStatus.QUEUED.value, ExecutionStatus.RUNNING.value):
+            return
+        try:
+            self._transition_queue.put_nowait(transition)
+        except queue.Full:
+            bt.logging.trace(f" Transition queue full; dropping {transition.execution_id} -> {transition.new_status}")
+
     def _send_error_to_job_server(self, error_data: Dict) -> None:
         from qbittensor.miner.runtime.io.job_server import send_error_to_job_server
         send_error_to_job_server(self, error_data)
@@ -310,6 +629,26 @@ class JobRegistry:
         """Get cached pricing (for throttling decisions)."""
         return self._pricing_cache
 
+    def is_known(self, execution_id: str) -> bool:
+        """
+        Return True if an execution was already accepted. Answered from memory: the state index holds every
+        execution in the retention window. The store is only asked about Bloom filter hits, or about every miss
+        when the state index could not be loaded.
+        """
+        if execution_id in self._state_index or self.is_tracking(execution_id):
+            return True
+        if self._state_index_complete and (self._seen_filter is None or execution_id not in self._seen_filter):
+            return False
+        return self.store.exists(execution_id)
+
+    def _record_seen(self, transition: Transition) -> None:
+        if transition.old_status is None:
+            self._seen_filter.add(transition.execution_id)
+
+    def _rebuild_seen_filter(self) -> None:
+        if self._seen_filter is not None:
+            self._seen_filter = BloomFilter.from_keys(self._state_index.ids(), self._dedup_bloom_capacity, DEDUP_BLOOM_ERROR_RATE)
+
     def is_tracking(self, execution_id: str) -> bool:
         """Return True if a execution_id is currently being tracked (submitted but not finalized)."""
         with self._lock:
@@ -319,49 +658,107 @@ class JobRegistry:
         """Insert completed job into executions tables (delegated)."""
         _persist_completion_external(self, tracked)
             
+    def _take_upload_data(self):
+        """Get upload data for a completing job, from the prefetched slots when one is ready."""
+        if self._upload_slots is None:
+            return self._get_upload_data()
+        return self._upload_slots.take()
+
     def _get_upload_data(self):
         """Get upload data from the jobs api."""
         endpoint = "executions/upload"
-        result = self._request_manager.post(endpoint, json={})
+        # Offer the result formats and encodings we can produce; the response says which one this URL takes
+        offer = {"accept_formats": supported_formats(), "accept_encodings": supported_encodings()}
+        result = self._request_manager.post(endpoint, json=offer)
         data = result.json()
         return UploadDataResponse(**data)
 
+    def completion_stats(self) -> Dict:
+        """Completion pipeline queue, worker and per-stage timing metrics ({} when completions run inline)."""
+        if self._completion_pipeline is None:
+            return {}
+        stats = self._completion_pipeline.stats()
+        if self._upload_slots is not None:
+            stats["upload_slots"] = self._upload_slots.stats()
+        return stats
+
+    def state_stats(self) -> Dict:
+        """Execution state transition counters, per-status dwell times and stuck executions."""
+        return self._state_machine.stats()
+
+    def finished_since(self, cursor: Optional[str]) -> Tuple[List[ExecutionRecord], str]:
+        """
+        Executions that changed after a validator's last_circuit cursor, and the cursor to hand back. Served from
+        the change log when the cursor is recent enough; otherwise (first contact, miner restart, a cursor older than
+        the buffer) from the store by the cursor's timestamp.
+        """
+        served = self._change_log.changes_since(cursor)
+        if served is not None:
+            return served
+        timestamp, _, _ = parse_cursor(cursor)
+        timestamp = timestamp or "1970-01-01 00:00:00"
+        # Read the head first: changes logged during the scan are sent again next time rather than missed
+        head = self._change_log.head
+        records = self.store.finished_since(timestamp)
+        newest = max([timestamp] + [record.timestamp for record in records if record.timestamp])
+        return records, self._change_log.cursor(newest, head)
+
     def get_inflight_count(self) -> int:
-        """Count non-terminal executions in the local DB (queued/running/pending)."""
-        try:
-            query = """
-                SELECT COUNT(1) FROM executions
-                WHERE status NOT IN ('Completed', 'Failed')
-            """
-            with self.database_manager.lock:
-                rows = self.database_manager.query(query)
-            if isinstance(rows, list) and rows:
-                cnt = rows[0][0]
-                try:
-                    return int(cnt)
-                except Exception:
-                    return 0
-        except Exception:
-            return 0
+        """Count non-terminal executions (queued/running/pending) from the in-memory state index."""
+        return self._state_index.inflight_count()
 
     def get_pending_count(self) -> int:
-        """Count locally accepted but not yet submitted jobs (Pending)."""
-        try:
-            query = """
-                SELECT COUNT(1) FROM executions
-                WHERE status = 'Pending'
-            """
-            with self.database_manager.lock:
-                rows = self.database_manager.query(query)
-            if isinstance(rows, list) and rows:
-                cnt = rows[0][0]
-                try:
-                    return int(cnt)
-                except Exception:
-                    return 0
-        except Exception:
-            return 0
+        """Count locally accepted but not yet submitted jobs (Pending) from the in-memory state index."""
+        return self._state_index.count("Pending")
 
-        
+    def prune_state_before(self, cutoff: str) -> int:
+        """Forget executions whose timestamp sorts before `cutoff`, after they were deleted from the DB."""
+        pruned = self._state_index.prune_before(cutoff)
+        if pruned:
+            self._state_machine.forget_unindexed()
+            # Bloom filters cannot drop keys; start over from the executions still held
+            self._rebuild_seen_filter()
+        return pruned
 
+    def _fail_unsubmitted(self) -> None:
+        """
+        Fail Pending executions that never reached the provider: a previous run accepted them but stopped before
+        submitting. Their circuit URLs are not stored, so they cannot be resubmitted, and is_known() would keep
+        them Pending forever.
+        """
+        if not self._state_index_complete:
+            return
+        failed = 0
+        for execution_id in self._state_index.ids(ExecutionStatus.PENDING):
+            try:
+                record = self.store.get(execution_id)
+                if record is None or record.provider_job_id:
+                    continue
+                persist_failed(
+                    self,
+                    execution_id=execution_id,
+                    validator_hotkey=record.validator_hotkey,
+                    provider=record.provider,
+                    provider_job_id=None,
+                    device_id=record.device_id,
+                    error_message="Miner restarted before submission",
+                )
+                failed += 1
+            except Exception as e:
+                bt.logging.error(f" Failed to fail unsubmitted execution {execution_id}: {e}")
+        if failed:
+            bt.logging.warning(f" Failed {failed} executions accepted but not submitted before the last restart")
 
+    def _rebuild_state_index(self) -> None:
+        """Load the execution state index from the execution store."""
+        try:
+            rows = self.store.states()
+            self._state_index.load(rows)
+            # Entry times are not stored; dwell clocks for loaded in-flight executions start now
+            self._state_machine.seed(execution_id for execution_id, status, _ in rows if self._state_index.get(execution_id) not in TERMINAL_STATUSES)
+            self._rebuild_seen_filter()
+            self._state_index_complete = True
+            bt.logging.debug(f" Loaded {len(rows)} executions into the state index")
+        except Exception as e:
+            self._state_index_complete = False
+            bt.logging.error(f" Failed to rebuild execution state index: {e}")
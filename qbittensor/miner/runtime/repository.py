@@ -1,51 +1,116 @@
 from __future__ import annotations
 
 import json
+from contextlib import contextmanager
 from typing import Any, Dict, Optional
 
+from qbittensor.miner.runtime.storage import ExecutionRecord, ExecutionStore, SQLiteExecutionStore
+from qbittensor.miner.runtime.state_index import _status_key
 from qbittensor.validator.utils.execution_status import ExecutionStatus
 from qbittensor.utils.timestamping import timestamp_str
 
 
-def insert_pending(registry, *, execution_id: str, validator_hotkey: str, handle, shots: Optional[int]) -> None:
-    ts = timestamp_str()
-    query = """
-        INSERT OR REPLACE INTO executions (
-            execution_id, upload_data_id, validator_hotkey, provider, provider_job_id, device_id, status,
-            shots, timestamp
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+def _store(registry) -> ExecutionStore:
+    """The registry's execution store; registries without one write to the executions table directly."""
+    store = getattr(registry, "store", None)
+    if store is not None:
+        return store
+    return SQLiteExecutionStore(registry.database_manager, getattr(registry, "_write_behind", None))
+
+
+def _index(registry, execution_id: str, status, ts: str, *, upsert: bool) -> None:
+    """Mirror a status write into the registry's in-memory state index, when it has one."""
+    index = getattr(registry, "_state_index", None)
+    if index is None:
+        return
+    if upsert:
+        index.set(execution_id, status, ts)
+    else:
+        index.update(execution_id, status, ts)
+
+
+def _log(registry, record: Optional[ExecutionRecord] = None, execution_id: Optional[str] = None, **changes: Any) -> None:
+    """Append a persisted change to the registry's change log, when it has one: a full record, or an update."""
+    change_log = getattr(registry, "_change_log", None)
+    if change_log is None:
+        return
+    if record is None and change_log.append_update(execution_id, changes) is not None:
+        return
+    if record is None:
+        # Not buffered any more: log the stored record, which already has the update applied
+        record = _store(registry).get(execution_id)
+    if record is not None:
+        change_log.append(record)
+
+
+@contextmanager
+def _advance(registry, execution_id: str, status):
+    """
+    Check a status write against the registry's state machine, holding the execution's lock until the block ends.
+    Yields (write, transition): write is False when the write would not change the status or is not an allowed
+    transition, and the caller skips it. Registries without a state machine always write.
     """
-    values = (
-        execution_id,
-        None,
-        validator_hotkey,
-        getattr(getattr(registry, "_default_device", None), "provider", None) if hasattr(registry, "_default_device") else None,
-        getattr(handle, "provider_job_id", None),
-        getattr(handle, "device_id", None),
-        "Pending",
-        shots,
-        ts,
-    )
-    with registry.database_manager.lock:
-        registry.database_manager.query_and_commit_with_values(query, values)
+    machine = getattr(registry, "_state_machine", None)
+    if machine is None:
+        yield True, None
+        return
+    with machine.lock(execution_id):
+        transition = machine.advance(execution_id, status)
+        yield transition is not None, transition
+
+
+def _is_status(registry, execution_id: str, status) -> bool:
+    machine = getattr(registry, "_state_machine", None)
+    return machine is not None and machine.index.get(execution_id) == _status_key(status)
+
+
+def _emit(registry, transition) -> None:
+    if transition is not None:
+        registry._state_machine.emit(transition)
+
+
+def insert_pending(registry, *, execution_id: str, validator_hotkey: str, handle, shots: Optional[int]) -> None:
+    with _advance(registry, execution_id, ExecutionStatus.PENDING) as (write, transition):
+        if not write:
+            return
+        ts = timestamp_str()
+        record = ExecutionRecord(
+            execution_id=execution_id,
+            validator_hotkey=validator_hotkey,
+            provider=getattr(getattr(registry, "_default_device", None), "provider", None) if hasattr(registry, "_default_device") else None,
+            provider_job_id=getattr(handle, "provider_job_id", None),
+            device_id=getattr(handle, "device_id", None),
+            status=ExecutionStatus.PENDING,
+            shots=shots,
+            timestamp=ts,
+        )
+        _store(registry).upsert(record)
+        _index(registry, execution_id, ExecutionStatus.PENDING, ts, upsert=True)
+        _log(registry, record)
+        _emit(registry, transition)
 
 
 def update_to_queued(registry, *, execution_id: str, handle) -> None:
-    ts = timestamp_str()
-    query = """
-        UPDATE executions 
-        SET status = ?, provider_job_id = ?, device_id = ?, timestamp = ?
-        WHERE execution_id = ?
-    """
-    values = (
-        "Queued",
-        getattr(handle, "provider_job_id", None),
-        getattr(handle, "device_id", None),
-        ts,
-        execution_id,
-    )
-    with registry.database_manager.lock:
-        registry.database_manager.query_and_commit_with_values(query, values)
+    with _advance(registry, execution_id, ExecutionStatus.QUEUED) as (write, transition):
+        if not write:
+            # Already Queued or further along: keep the status, but record the provider job
+            _store(registry).update(
+                execution_id,
+                provider_job_id=getattr(handle, "provider_job_id", None),
+                device_id=getattr(handle, "device_id", None),
+            )
+            return
+        ts = timestamp_str()
+        changes = dict(
+            status=ExecutionStatus.QUEUED,
+            provider_job_id=getattr(handle, "provider_job_id", None),
+            device_id=getattr(handle, "device_id", None),
+            timestamp=ts,
+        )
+        _store(registry).update(execution_id, **changes)
+        _index(registry, execution_id, ExecutionStatus.QUEUED, ts, upsert=False)
+        _log(registry, execution_id=execution_id, **changes)
+        _emit(registry, transition)
 
 
 def persist_failed(
@@ -59,66 +124,68 @@ def persist_failed(
     error_message: Optional[str],
     metadata: Optional[Dict[str, Any]] = None,
 ) -> None:
-    ts = timestamp_str()
-    query = """
-        INSERT OR REPLACE INTO executions (
-            execution_id, upload_data_id, validator_hotkey, provider, provider_job_id, device_id, status,
-            shots, timestamp, metadata_json, completed_at, errorMessage
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """
-    values = (
-        execution_id,
-        None,
-        validator_hotkey,
-        provider,
-        provider_job_id,
-        device_id,
-        ExecutionStatus.FAILED,
-        None,
-        ts,
-        json.dumps(metadata or {}),
-        ts,
-        error_message,
-    )
-    with registry.database_manager.lock:
-        registry.database_manager.query_and_commit_with_values(query, values)
+    with _advance(registry, execution_id, ExecutionStatus.FAILED) as (write, transition):
+        if not write:
+            if _is_status(registry, execution_id, ExecutionStatus.FAILED):
+                # Already Failed: keep the status, but record the latest error
+                changes: Dict[str, Any] = dict(error_message=error_message)
+                if metadata is not None:
+                    changes["metadata_json"] = json.dumps(metadata)
+                _store(registry).update(execution_id, **changes)
+                _log(registry, execution_id=execution_id, **changes)
+            return
+        ts = timestamp_str()
+        record = ExecutionRecord(
+            execution_id=execution_id,
+            validator_hotkey=validator_hotkey,
+            provider=provider,
+            provider_job_id=provider_job_id,
+            device_id=device_id,
+            status=ExecutionStatus.FAILED,
+            timestamp=ts,
+            metadata_json=json.dumps(metadata or {}),
+            completed_at=ts,
+            error_message=error_message,
+        )
+        _store(registry).upsert(record)
+        _index(registry, execution_id, ExecutionStatus.FAILED, ts, upsert=True)
+        _log(registry, record)
+        _emit(registry, transition)
 
 
 def persist_completed(registry, *, tracked, receipt, upload_data_id: str) -> None:
-    ts = timestamp_str()
-    query = """
-        INSERT OR REPLACE INTO executions (
-            execution_id, upload_data_id, validator_hotkey, provider, provider_job_id, device_id, status, cost, shots,
-            timestamp, timestamps_json, metadata_json, completed_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """
-    values = (
-        tracked.execution_id,
-        upload_data_id,
-        tracked.validator_hotkey,
-        getattr(receipt, "provider", None),
-        getattr(receipt, "provider_job_id", None),
-        getattr(receipt, "device_id", None),
-        ExecutionStatus.COMPLETED,
-        getattr(receipt, "cost", None),
-        getattr(receipt, "shots", None),
-        ts,
-        json.dumps(getattr(receipt, "timestamps", None) or {}),
-        json.dumps(getattr(receipt, "metadata", None) or {}),
-        ts,
-    )
-    with registry.database_manager.lock:
-        registry.database_manager.query_and_commit_with_values(query, values)
+    with _advance(registry, tracked.execution_id, ExecutionStatus.COMPLETED) as (write, transition):
+        if not write:
+            return
+        ts = timestamp_str()
+        record = ExecutionRecord(
+            execution_id=tracked.execution_id,
+            upload_data_id=upload_data_id,
+            validator_hotkey=tracked.validator_hotkey,
+            provider=getattr(receipt, "provider", None),
+            provider_job_id=getattr(receipt, "provider_job_id", None),
+            device_id=getattr(receipt, "device_id", None),
+            status=ExecutionStatus.COMPLETED,
+            cost=getattr(receipt, "cost", None),
+            shots=getattr(receipt, "shots", None),
+            timestamp=ts,
+            timestamps_json=json.dumps(getattr(receipt, "timestamps", None) or {}),
+            metadata_json=json.dumps(getattr(receipt, "metadata", None) or {}),
+            completed_at=ts,
+        )
+        _store(registry).upsert(record)
+        _index(registry, tracked.execution_id, ExecutionStatus.COMPLETED, ts, upsert=True)
+        _log(registry, record)
+        _emit(registry, transition)
 
 
 def update_status(registry, *, execution_id: str, status: str) -> None:
-    ts = timestamp_str()
-    query = """
-        UPDATE executions 
-        SET status = ?, timestamp = ?
-        WHERE execution_id = ?
-    """
-    with registry.database_manager.lock:
-        registry.database_manager.query_and_commit_with_values(query, (status, ts, execution_id))
-
-
+    """Change an execution's status. With a state machine, repeated or invalid statuses are not written"""
+    with _advance(registry, execution_id, status) as (write, transition):
+        if not write:
+            return
+        ts = timestamp_str()
+        _store(registry).update(execution_id, status=status, timestamp=ts)
+        _index(registry, execution_id, status, ts, upsert=False)
+        _log(registry, execution_id=execution_id, status=status, timestamp=ts)
+        _emit(registry, transition)
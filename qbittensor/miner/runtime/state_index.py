@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from qbittensor.validator.utils.execution_status import ExecutionStatus
+
+TERMINAL_STATUSES = (ExecutionStatus.COMPLETED.value, ExecutionStatus.FAILED.value)
+
+
+def _status_key(status) -> str:
+    """Store statuses as their DB string ('Pending', 'Queued', ...) regardless of enum or str input"""
+    return status.value if isinstance(status, Enum) else str(status)
+
+
+class ExecutionStateIndex:
+    """
+    In-memory mirror of executions.status keyed by execution_id, with per-status counters.
+
+    The repository functions update it write-through alongside every executions write, and JobRegistry
+    rebuilds it from SQLite on startup, so inflight/pending counts never have to touch the database.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[str, Optional[str]]] = {}  # execution_id -> (status, timestamp)
+        self._counts: Counter = Counter()
+
+    def load(self, rows: Iterable[Tuple[str, str, Optional[str]]]) -> None:
+        """Replace the index with (execution_id, status, timestamp) rows"""
+        entries = {execution_id: (_status_key(status), timestamp) for execution_id, status, timestamp in rows}
+        counts = Counter(status for status, _ in entries.values())
+        with self._lock:
+            self._entries = entries
+            self._counts = counts
+
+    def set(self, execution_id: str, status, timestamp: Optional[str] = None) -> None:
+        """Record an execution's status, inserting it if new (INSERT OR REPLACE semantics)"""
+        key = _status_key(status)
+        with self._lock:
+            previous = self._entries.get(execution_id)
+            if previous is not None:
+                self._counts[previous[0]] -= 1
+            self._entries[execution_id] = (key, timestamp)
+            self._counts[key] += 1
+
+    def update(self, execution_id: str, status, timestamp: Optional[str] = None) -> None:
+        """Change the status of a known execution; unknown ids are ignored (UPDATE semantics)"""
+        key = _status_key(status)
+        with self._lock:
+            previous = self._entries.get(execution_id)
+            if previous is None:
+                return
+            self._counts[previous[0]] -= 1
+            self._entries[execution_id] = (key, timestamp if timestamp is not None else previous[1])
+            self._counts[key] += 1
+
+    def remove(self, execution_ids: Iterable[str]) -> None:
+        with self._lock:
+            for execution_id in execution_ids:
+                previous = self._entries.pop(execution_id, None)
+                if previous is not None:
+                    self._counts[previous[0]] -= 1
+
+    def prune_before(self, cutoff: str) -> int:
+        """Drop entries whose timestamp sorts before `cutoff`, mirroring a `timestamp < cutoff` DELETE"""
+        with self._lock:
+            expired = [eid for eid, (_, ts) in self._entries.items() if ts is not None and ts < cutoff]
+            for execution_id in expired:
+                status, _ = self._entries.pop(execution_id)
+                self._counts[status] -= 1
+        return len(expired)
+
+    def get(self, execution_id: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(execution_id)
+        return entry[0] if entry is not None else None
+
+    def ids(self, status=None) -> List[str]:
+        """Every indexed execution id, or only those in `status`"""
+        with self._lock:
+            if status is None:
+                return list(self._entries)
+            key = _status_key(status)
+            return [execution_id for execution_id, (entry_status, _) in self._entries.items() if entry_status == key]
+
+    def count(self, status) -> int:
+        with self._lock:
+            return self._counts.get(_status_key(status), 0)
+
+    def inflight_count(self) -> int:
+        """Executions that are not yet Completed or Failed"""
+        with self._lock:
+            return len(self._entries) - sum(self._counts.get(s, 0) for s in TERMINAL_STATUSES)
+
+    def __contains__(self, execution_id: str) -> bool:
+        with self._lock:
+            return execution_id in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
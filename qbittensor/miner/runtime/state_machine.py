@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import bittensor as bt
+
+from qbittensor.miner.runtime.state_index import ExecutionStateIndex, TERMINAL_STATUSES, _status_key
+from qbittensor.validator.utils.execution_status import ExecutionStatus
+
+_PENDING, _QUEUED, _RUNNING = ExecutionStatus.PENDING.value, ExecutionStatus.QUEUED.value, ExecutionStatus.RUNNING.value
+_COMPLETED, _FAILED = ExecutionStatus.COMPLETED.value, ExecutionStatus.FAILED.value
+
+# Status changes the miner may persist. Failed -> Completed is a completion retried after a failed upload;
+# None is an execution the index does not know yet
+ALLOWED_TRANSITIONS: Dict[Optional[str], FrozenSet[str]] = {
+    None: frozenset({_PENDING, _QUEUED, _RUNNING, _COMPLETED, _FAILED}),
+    _PENDING: frozenset({_QUEUED, _RUNNING, _COMPLETED, _FAILED}),
+    _QUEUED: frozenset({_RUNNING, _COMPLETED, _FAILED}),
+    _RUNNING: frozenset({_COMPLETED, _FAILED}),
+    _FAILED: frozenset({_COMPLETED}),
+    _COMPLETED: frozenset(),
+}
+
+# An execution that stays this long in a non-terminal status is reported as stuck (once per status)
+STUCK_AFTER_S: Dict[str, float] = {_PENDING: 600.0, _QUEUED: 6 * 3600.0, _RUNNING: 2 * 3600.0}
+# Per-execution write locks are striped over this many locks so memory does not grow with executions
+LOCK_STRIPES = 64
+
+
+@dataclass
+class Transition:
+    """One persisted status change. dwell_s is the time spent in old_status, when it is known"""
+    execution_id: str
+    old_status: Optional[str]
+    new_status: str
+    dwell_s: Optional[float]
+    at: float
+
+
+class DwellStats:
+    """Running totals of time spent in one status"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def record(self, dwell_s: float) -> None:
+        self.count += 1
+        self.total_s += dwell_s
+        if dwell_s > self.max_s:
+            self.max_s = dwell_s
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"count": self.count, "avg_s": self.total_s / self.count if self.count else 0.0, "max_s": self.max_s}
+
+
+class ExecutionStateMachine:
+    """
+    Validates execution status changes before the repository persists them.
+
+    The current status comes from the registry's ExecutionStateIndex. advance() returns None for a write that
+    would not change the status (the repository then skips it, so repeated QUEUED/RUNNING polls do not rewrite
+    the row or bump its timestamp) or that is not in ALLOWED_TRANSITIONS (counted and logged), and a
+    Transition otherwise. Once the write is done the repository calls emit(), which records how long the
+    execution spent in its previous status and notifies the listeners (telemetry, the job-server thread).
+
+    The check and the write are two steps, so writers hold lock(execution_id) from advance() until the index
+    is updated; otherwise two threads could both pass the check and the later write would overwrite the earlier.
+
+    stuck() lists executions that have stayed in a non-terminal status longer than STUCK_AFTER_S.
+    """
+
+    def __init__(self, index: ExecutionStateIndex, stuck_after_s: Optional[Dict[str, float]] = None) -> None:
+        self.index = index
+        self.stuck_after_s = dict(STUCK_AFTER_S if stuck_after_s is None else stuck_after_s)
+        self._lock = threading.Lock()
+        self._write_locks = [threading.RLock() for _ in range(LOCK_STRIPES)]
+        self._entered: Dict[str, float] = {}  # execution_id -> time.time() it entered its current status
+        self._dwell: Dict[str, DwellStats] = {}
+        self._reported_stuck: Set[Tuple[str, str]] = set()
+        self._listeners: List[Callable[[Transition], None]] = []
+        self.transitions = 0
+        self.unchanged = 0
+        self.rejected = 0
+
+    def add_listener(self, listener: Callable[[Transition], None]) -> None:
+        self._listeners.append(listener)
+
+    def lock(self, execution_id: str) -> threading.RLock:
+        """The lock writers of this execution hold from advance() through the index update"""
+        return self._write_locks[hash(execution_id) % LOCK_STRIPES]
+
+    def seed(self, execution_ids: Iterable[str], now: Optional[float] = None) -> None:
+        """Start dwell clocks for executions loaded from storage, whose entry time is not known"""
+        now = time.time() if now is None else now
+        with self._lock:
+            for execution_id in execution_ids:
+                self._entered.setdefault(execution_id, now)
+
+    def advance(self, execution_id: str, status) -> Optional[Transition]:
+        """Check a status write. Returns the Transition to persist, or None if the write should be skipped"""
+        new_status = _status_key(status)
+        old_status = self.index.get(execution_id)
+        if old_status == new_status:
+            with self._lock:
+                self.unchanged += 1
+            return None
+        if new_status not in ALLOWED_TRANSITIONS.get(old_status, frozenset()):
+            with self._lock:
+                self.rejected += 1
+            bt.logging.debug(f" Ignoring invalid status transition for {execution_id}: {old_status} -> {new_status}")
+            return None
+        now = time.time()
+        with self._lock:
+            entered = self._entered.get(execution_id)
+        return Transition(execution_id, old_status, new_status, now - entered if entered is not None else None, now)
+
+    def emit(self, transition: Transition) -> None:
+        """Record a persisted transition and notify listeners"""
+        with self._lock:
+            self.transitions += 1
+            if transition.old_status is not None and transition.dwell_s is not None:
+                self._dwell.setdefault(transition.old_status, DwellStats()).record(transition.dwell_s)
+            self._reported_stuck.discard((transition.execution_id, transition.old_status))
+            if transition.new_status in TERMINAL_STATUSES:
+                self._entered.pop(transition.execution_id, None)
+            else:
+                self._entered[transition.execution_id] = transition.at
+        for listener in self._listeners:
+            try:
+                listener(transition)
+            except Exception as e:
+                bt.logging.trace(f" State transition listener failed: {e}")
+
+    def forget_unindexed(self) -> None:
+        """Drop dwell clocks and stuck reports for executions the index no longer holds (after retention pruning)"""
+        with self._lock:
+            for execution_id in [eid for eid in self._entered if eid not in self.index]:
+                del self._entered[execution_id]
+            self._reported_stuck = {(eid, status) for eid, status in self._reported_stuck if eid in self.index}
+
+    def stuck(self, now: Optional[float] = None) -> List[Tuple[str, str, float]]:
+        """(execution_id, status, seconds in status) for executions past their status' stuck threshold"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entered = list(self._entered.items())
+        stuck = []
+        for execution_id, since in entered:
+            status = self.index.get(execution_id)
+            limit = self.stuck_after_s.get(status) if status is not None else None
+            if limit is not None and now - since >= limit:
+                stuck.append((execution_id, status, now - since))
+        return stuck
+
+    def report_stuck(self, now: Optional[float] = None) -> List[Tuple[str, str, float]]:
+        """Log executions that became stuck since the last call. Returns them"""
+        fresh = []
+        for execution_id, status, age in self.stuck(now):
+            with self._lock:
+                if (execution_id, status) in self._reported_stuck:
+                    continue
+                self._reported_stuck.add((execution_id, status))
+            fresh.append((execution_id, status, age))
+            bt.logging.warning(f" Execution {execution_id} has been {status} for {age / 60:.0f} minutes")
+        return fresh
+
+    def stats(self, now: Optional[float] = None) -> Dict[str, object]:
+        """Transition counters, dwell times per status and the age of the oldest execution in each status"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entered = list(self._entered.items())
+            dwell = {status: stats.as_dict() for status, stats in self._dwell.items()}
+            counters = {"transitions": self.transitions, "unchanged": self.unchanged, "rejected": self.rejected}
+        oldest: Dict[str, float] = {}
+        for execution_id, since in entered:
+            status = self.index.get(execution_id)
+            if status is not None:
+                oldest[status] = max(oldest.get(status, 0.0), now - since)
+        return {**counters, "dwell": dwell, "oldest_s": oldest, "stuck": len(self.stuck(now))}
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+from typing import Callable, Dict, Optional
+
+from pkg.database.database_manager import DatabaseManager
+from qbittensor.miner.runtime.storage.base import ExecutionRecord, ExecutionStore
+from qbittensor.miner.runtime.storage.memory import InMemoryExecutionStore
+from qbittensor.miner.runtime.storage.mmap_log import MmapExecutionStore
+from qbittensor.miner.runtime.storage.sqlite import SQLiteExecutionStore
+from qbittensor.miner.runtime.write_behind import WriteBehindWriter
+
+
+def _mmap_path(database_manager: DatabaseManager) -> str:
+    """Keep the log next to the miner's SQLite file: data/miner_<hotkey>.executions.log"""
+    return f"{os.path.splitext(database_manager.db_path)[0]}.executions.log"
+
+
+_FACTORY: Dict[str, Callable[[DatabaseManager, Optional[WriteBehindWriter]], ExecutionStore]] = {
+    "sqlite": lambda db, write_behind: SQLiteExecutionStore(db, write_behind),
+    "memory": lambda db, write_behind: InMemoryExecutionStore(),
+    "mmap": lambda db, write_behind: MmapExecutionStore(_mmap_path(db)),
+}
+
+
+def get_execution_store(database_manager: DatabaseManager, name: str | None = None, write_behind: Optional[WriteBehindWriter] = None) -> ExecutionStore:
+    """Resolve an execution store by name (defaults to env MINER_STORAGE_BACKEND=sqlite)."""
+    backend = name or os.getenv("MINER_STORAGE_BACKEND", "sqlite").lower()
+    if backend not in _FACTORY:
+        raise ValueError(f"Unknown execution storage backend: {backend}")
+    return _FACTORY[backend](database_manager, write_behind)
+
+
+__all__ = [
+    "ExecutionRecord",
+    "ExecutionStore",
+    "InMemoryExecutionStore",
+    "MmapExecutionStore",
+    "SQLiteExecutionStore",
+    "get_execution_store",
+]
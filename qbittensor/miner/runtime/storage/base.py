@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, fields
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_DELETE_BATCH = 500
+DEFAULT_DELETE_MAX_BATCHES = 100
+
+
+@dataclass
+class ExecutionRecord:
+    """One row of the miner's executions table, independent of how it is stored"""
+    execution_id: str
+    upload_data_id: Optional[str] = None
+    validator_hotkey: Optional[str] = None
+    provider: Optional[str] = None
+    provider_job_id: Optional[str] = None
+    device_id: Optional[str] = None
+    status: Optional[str] = None
+    error_message: Optional[str] = None
+    cost: Optional[float] = None
+    shots: Optional[int] = None
+    timestamp: Optional[str] = None
+    timestamps_json: Optional[str] = None
+    metadata_json: Optional[str] = None
+    completed_at: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        # Statuses are stored as their DB string ('Pending', 'Queued', ...) whether given as enum or str
+        if isinstance(self.status, Enum):
+            self.status = self.status.value
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Flat record: a dict comprehension is much cheaper than dataclasses.asdict's deep copy
+        return {name: getattr(self, name) for name in RECORD_FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExecutionRecord":
+        return cls(**{name: data.get(name) for name in RECORD_FIELDS})
+
+
+RECORD_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(ExecutionRecord))
+
+
+class ExecutionStore(ABC):
+    """
+    Storage backend for the miner's execution records.
+
+    The repository functions, JobRegistry and Miner only talk to this interface, so the backend can be
+    picked for the load profile (see get_execution_store). Implementations must be thread-safe.
+    Writes may be buffered; flush() makes every earlier write visible to reads and durable as far as the
+    backend allows. Timestamps are lexicographically sortable strings (TIMESTAMP_FORMAT).
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    def upsert(self, record: ExecutionRecord) -> None:
+        """Insert a record, replacing any existing record with the same execution_id"""
+
+    @abstractmethod
+    def update(self, execution_id: str, **changes: Any) -> None:
+        """Change fields of an existing record. Unknown execution ids are ignored"""
+
+    @abstractmethod
+    def get(self, execution_id: str) -> Optional[ExecutionRecord]:
+        """Return the record for an execution, or None"""
+
+    @abstractmethod
+    def exists(self, execution_id: str) -> bool:
+        """Whether a record exists for an execution"""
+
+    @abstractmethod
+    def finished_since(self, after: str) -> List[ExecutionRecord]:
+        """Records with timestamp > `after` whose status is not Running, oldest first"""
+
+    @abstractmethod
+    def states(self) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """(execution_id, status, timestamp) for every record"""
+
+    @abstractmethod
+    def delete_before(self, cutoff: str, batch_size: int = DEFAULT_DELETE_BATCH, max_batches: int = DEFAULT_DELETE_MAX_BATCHES) -> int:
+        """Delete records whose timestamp sorts before `cutoff`, at most batch_size * max_batches per call. Returns rows deleted"""
+
+    def count(self) -> int:
+        return len(self.states())
+
+    def flush(self) -> None:
+        """Make every earlier write visible to reads"""
+
+    def start(self) -> None:
+        """Start any background work (e.g. a write-behind thread)"""
+
+    def stop(self) -> None:
+        """Stop background work and flush. The store stays usable"""
+        self.flush()
+
+    def close(self) -> None:
+        """Release the backend's resources"""
+        self.stop()
+
+
+def normalize_changes(changes: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate update() field names and store statuses as their DB string"""
+    unknown = [name for name in changes if name not in RECORD_FIELDS or name == "execution_id"]
+    if unknown:
+        raise ValueError(f"Unknown execution record fields: {unknown}")
+    normalized = dict(changes)
+    if isinstance(normalized.get("status"), Enum):
+        normalized["status"] = normalized["status"].value
+    return normalized
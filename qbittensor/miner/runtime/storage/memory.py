@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import threading
+from copy import copy
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from qbittensor.miner.runtime.storage.base import (
+    DEFAULT_DELETE_BATCH,
+    DEFAULT_DELETE_MAX_BATCHES,
+    ExecutionRecord,
+    ExecutionStore,
+    normalize_changes,
+)
+
+
+class InMemoryExecutionStore(ExecutionStore):
+    """Dict-backed store with no persistence. For tests and benchmarks"""
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._records: Dict[str, ExecutionRecord] = {}
+
+    def upsert(self, record: ExecutionRecord) -> None:
+        with self._lock:
+            self._records[record.execution_id] = copy(record)
+
+    def update(self, execution_id: str, **changes: Any) -> None:
+        changes = normalize_changes(changes)
+        with self._lock:
+            record = self._records.get(execution_id)
+            if record is not None:
+                self._records[execution_id] = replace(record, **changes)
+
+    def get(self, execution_id: str) -> Optional[ExecutionRecord]:
+        with self._lock:
+            record = self._records.get(execution_id)
+        return copy(record) if record is not None else None
+
+    def exists(self, execution_id: str) -> bool:
+        with self._lock:
+            return execution_id in self._records
+
+    def finished_since(self, after: str) -> List[ExecutionRecord]:
+        with self._lock:
+            found = [
+                copy(r) for r in self._records.values()
+                if r.timestamp is not None and r.timestamp > after and r.status != "Running"
+            ]
+        return sorted(found, key=lambda r: r.timestamp)
+
+    def states(self) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        with self._lock:
+            return [(r.execution_id, r.status, r.timestamp) for r in self._records.values()]
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def delete_before(self, cutoff: str, batch_size: int = DEFAULT_DELETE_BATCH, max_batches: int = DEFAULT_DELETE_MAX_BATCHES) -> int:
+        limit = batch_size * max_batches
+        with self._lock:
+            expired = [eid for eid, r in self._records.items() if r.timestamp is not None and r.timestamp < cutoff][:limit]
+            for execution_id in expired:
+                del self._records[execution_id]
+        return len(expired)
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from dataclasses import replace
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import bittensor as bt
+
+from qbittensor.miner.runtime.storage.base import (
+    DEFAULT_DELETE_BATCH,
+    DEFAULT_DELETE_MAX_BATCHES,
+    ExecutionRecord,
+    ExecutionStore,
+    normalize_changes,
+)
+
+# Entry header: payload length, crc32 of payload, op
+_HEADER = struct.Struct("<IIB")
+_OP_PUT = 1
+_OP_DELETE = 2
+
+# Compact once dead bytes exceed both this floor and the live bytes
+DEFAULT_COMPACT_MIN_BYTES = 4 * 1024 * 1024
+
+
+class _Slot(NamedTuple):
+    offset: int  # Start of the payload in the log
+    length: int
+    status: Optional[str]
+    timestamp: Optional[str]
+
+
+class MmapExecutionStore(ExecutionStore):
+    """
+    Append-only log of execution records, read back through mmap.
+
+    Every upsert/update appends the full record (JSON) and every delete appends a tombstone, so a write is one
+    append with no B-tree or transaction overhead. An in-memory index maps execution_id to the record's offset
+    plus its status and timestamp, so counts and range scans only touch the log for the records they return.
+    The log is replayed on open (a torn trailing entry is dropped) and rewritten with only live records once
+    superseded entries outweigh live ones. Appends land in the OS page cache immediately; flush() fsyncs.
+    """
+
+    name = "mmap"
+
+    def __init__(self, path: str, compact_min_bytes: int = DEFAULT_COMPACT_MIN_BYTES, fsync_on_flush: bool = True) -> None:
+        self.path = path
+        self.compact_min_bytes = compact_min_bytes
+        self.fsync_on_flush = fsync_on_flush
+        self._lock = threading.RLock()
+        self._index: Dict[str, _Slot] = {}
+        self._live_bytes = 0
+        self._dead_bytes = 0
+        self._map: Optional[mmap.mmap] = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._size = self._replay()
+
+    def upsert(self, record: ExecutionRecord) -> None:
+        with self._lock:
+            self._put(record)
+            self._maybe_compact()
+
+    def update(self, execution_id: str, **changes: Any) -> None:
+        changes = normalize_changes(changes)
+        with self._lock:
+            record = self._read(execution_id)
+            if record is None:
+                return
+            self._put(replace(record, **changes))
+            self._maybe_compact()
+
+    def get(self, execution_id: str) -> Optional[ExecutionRecord]:
+        with self._lock:
+            return self._read(execution_id)
+
+    def exists(self, execution_id: str) -> bool:
+        with self._lock:
+            return execution_id in self._index
+
+    def finished_since(self, after: str) -> List[ExecutionRecord]:
+        with self._lock:
+            ids = [
+                eid for eid, slot in self._index.items()
+                if slot.timestamp is not None and slot.timestamp > after and slot.status != "Running"
+            ]
+            records = [self._read(eid) for eid in ids]
+        return sorted(records, key=lambda r: r.timestamp)
+
+    def states(self) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        with self._lock:
+            return [(eid, slot.status, slot.timestamp) for eid, slot in self._index.items()]
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def delete_before(self, cutoff: str, batch_size: int = DEFAULT_DELETE_BATCH, max_batches: int = DEFAULT_DELETE_MAX_BATCHES) -> int:
+        limit = batch_size * max_batches
+        with self._lock:
+            expired = [eid for eid, slot in self._index.items() if slot.timestamp is not None and slot.timestamp < cutoff][:limit]
+            for execution_id in expired:
+                self._retire(self._index.pop(execution_id))
+                tombstone = execution_id.encode("utf-8")
+                self._append(_OP_DELETE, tombstone)
+                self._dead_bytes += _HEADER.size + len(tombstone)
+            self._maybe_compact()
+        return len(expired)
+
+    def flush(self) -> None:
+        if self.fsync_on_flush:
+            with self._lock:
+                if self._fd is not None:
+                    os.fsync(self._fd)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is None:
+                return
+            self.flush()
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            os.close(self._fd)
+            self._fd = None
+
+    def log_size(self) -> int:
+        with self._lock:
+            return self._size
+
+    def _put(self, record: ExecutionRecord) -> None:
+        payload = json.dumps(record.to_dict(), separators=(",", ":")).encode("utf-8")
+        offset = self._append(_OP_PUT, payload)
+        self._retire(self._index.get(record.execution_id))
+        self._index[record.execution_id] = _Slot(offset, len(payload), record.status, record.timestamp)
+        self._live_bytes += _HEADER.size + len(payload)
+
+    def _retire(self, slot: Optional[_Slot]) -> None:
+        """Account a superseded or deleted entry as dead space"""
+        if slot is not None:
+            self._live_bytes -= _HEADER.size + slot.length
+            self._dead_bytes += _HEADER.size + slot.length
+
+    def _append(self, op: int, payload: bytes) -> int:
+        """Append one entry and return the offset of its payload"""
+        entry = _HEADER.pack(len(payload), zlib.crc32(payload), op) + payload
+        os.write(self._fd, entry)
+        offset = self._size + _HEADER.size
+        self._size += len(entry)
+        return offset
+
+    def _read(self, execution_id: str) -> Optional[ExecutionRecord]:
+        slot = self._index.get(execution_id)
+        if slot is None:
+            return None
+        end = slot.offset + slot.length
+        if self._map is None or len(self._map) < end:
+            self._remap()
+        return ExecutionRecord.from_dict(json.loads(self._map[slot.offset:end]))
+
+    def _remap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._size > 0:
+            self._map = mmap.mmap(self._fd, self._size, access=mmap.ACCESS_READ)
+
+    def _replay(self) -> int:
+        """Rebuild the index from the log. Returns the length of the valid prefix of the log"""
+        size = os.fstat(self._fd).st_size
+        if size == 0:
+            return 0
+        self._map = mmap.mmap(self._fd, size, access=mmap.ACCESS_READ)
+        position = 0
+        while position + _HEADER.size <= size:
+            length, crc, op = _HEADER.unpack_from(self._map, position)
+            start = position + _HEADER.size
+            payload = self._map[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc or op not in (_OP_PUT, _OP_DELETE):
+                break
+            if op == _OP_PUT:
+                data = json.loads(payload)
+                self._retire(self._index.get(data["execution_id"]))
+                self._index[data["execution_id"]] = _Slot(start, length, data.get("status"), data.get("timestamp"))
+                self._live_bytes += _HEADER.size + length
+            else:
+                self._retire(self._index.pop(payload.decode("utf-8"), None))
+                self._dead_bytes += _HEADER.size + length
+            position = start + length
+        if position < size:
+            bt.logging.warning(f" Dropping {size - position} bytes of torn or corrupt entries from {self.path}")
+            self._map.close()
+            self._map = None
+            os.truncate(self.path, position)
+        return position
+
+    def _maybe_compact(self) -> None:
+        if self._dead_bytes > self.compact_min_bytes and self._dead_bytes > self._live_bytes:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the log with only the live records"""
+        with self._lock:
+            records = [self._read(eid) for eid in list(self._index)]
+            tmp_path = f"{self.path}.compact"
+            with open(tmp_path, "wb") as f:
+                index: Dict[str, _Slot] = {}
+                position = 0
+                for record in records:
+                    payload = json.dumps(record.to_dict(), separators=(",", ":")).encode("utf-8")
+                    f.write(_HEADER.pack(len(payload), zlib.crc32(payload), _OP_PUT) + payload)
+                    index[record.execution_id] = _Slot(position + _HEADER.size, len(payload), record.status, record.timestamp)
+                    position += _HEADER.size + len(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            os.close(self._fd)
+            os.replace(tmp_path, self.path)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+            self._index = index
+            self._size = position
+            self._live_bytes = position
+            self._dead_bytes = 0
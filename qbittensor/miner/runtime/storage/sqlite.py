@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any, List, Optional, Tuple
+
+from pkg.database.database_manager import DatabaseManager
+from pkg.database.retention import RetentionPolicy, RetentionPruner
+from qbittensor.miner.runtime.storage.base import (
+    DEFAULT_DELETE_BATCH,
+    DEFAULT_DELETE_MAX_BATCHES,
+    RECORD_FIELDS,
+    ExecutionRecord,
+    ExecutionStore,
+    normalize_changes,
+)
+from qbittensor.miner.runtime.write_behind import WriteBehindWriter
+
+# ExecutionRecord field -> executions column, where they differ
+_COLUMNS = {name: ("errorMessage" if name == "error_message" else name) for name in RECORD_FIELDS}
+_SELECT_COLUMNS = ", ".join(_COLUMNS[name] for name in RECORD_FIELDS)
+
+
+class SQLiteExecutionStore(ExecutionStore):
+    """
+    Executions table in the miner's SQLite database (the default backend).
+
+    Writes commit immediately under the database write lock, or are queued on a WriteBehindWriter when one is
+    given; reads flush that writer first so they always observe earlier writes.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, database_manager: DatabaseManager, write_behind: Optional[WriteBehindWriter] = None) -> None:
+        self.database_manager = database_manager
+        self.write_behind = write_behind
+
+    def upsert(self, record: ExecutionRecord) -> None:
+        query = f"""
+            INSERT OR REPLACE INTO executions ({_SELECT_COLUMNS})
+            VALUES ({", ".join("?" for _ in RECORD_FIELDS)})
+        """
+        self._write(query, tuple(getattr(record, name) for name in RECORD_FIELDS))
+
+    def update(self, execution_id: str, **changes: Any) -> None:
+        changes = normalize_changes(changes)
+        if not changes:
+            return
+        assignments = ", ".join(f"{_COLUMNS[name]} = ?" for name in changes)
+        query = f"""
+            UPDATE executions
+            SET {assignments}
+            WHERE execution_id = ?
+        """
+        self._write(query, (*changes.values(), execution_id))
+
+    def get(self, execution_id: str) -> Optional[ExecutionRecord]:
+        self.flush()
+        with self.database_manager.read_lock:
+            row = self.database_manager.query_one_with_values(
+                f"SELECT {_SELECT_COLUMNS} FROM executions WHERE execution_id = ?", (execution_id,)
+            )
+        return ExecutionRecord(*row) if row else None
+
+    def exists(self, execution_id: str) -> bool:
+        self.flush()
+        with self.database_manager.read_lock:
+            return self.database_manager.row_exists("executions", "execution_id=?", (execution_id,))
+
+    def finished_since(self, after: str) -> List[ExecutionRecord]:
+        query = f"""
+            SELECT {_SELECT_COLUMNS}
+            FROM executions
+            WHERE timestamp > ? AND status != 'Running'
+            ORDER BY timestamp
+        """
+        self.flush()
+        with self.database_manager.read_lock:
+            rows = self.database_manager.query_with_values(query, (after,))
+        return [ExecutionRecord(*row) for row in rows]
+
+    def states(self) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        self.flush()
+        with self.database_manager.read_lock:
+            return self.database_manager.query("SELECT execution_id, status, timestamp FROM executions")
+
+    def count(self) -> int:
+        self.flush()
+        with self.database_manager.read_lock:
+            return self.database_manager.get_size_of_table("executions")
+
+    def delete_before(self, cutoff: str, batch_size: int = DEFAULT_DELETE_BATCH, max_batches: int = DEFAULT_DELETE_MAX_BATCHES) -> int:
+        # max_age is unused: the cutoff is passed in directly
+        policy = RetentionPolicy(table="executions", column="timestamp", max_age=timedelta(0), batch_size=batch_size, max_batches=max_batches)
+        pruner = RetentionPruner(self.database_manager, [policy])
+        self.flush()
+        deleted = pruner.delete_before(policy, cutoff)
+        if deleted:
+            pruner.incremental_vacuum()
+        return deleted
+
+    def flush(self) -> None:
+        if self.write_behind is not None:
+            self.write_behind.flush()
+
+    def start(self) -> None:
+        if self.write_behind is not None:
+            self.write_behind.start()
+
+    def stop(self) -> None:
+        if self.write_behind is not None:
+            self.write_behind.stop()
+
+    def close(self) -> None:
+        # The DatabaseManager is shared with the rest of the miner; it is closed by its owner
+        self.stop()
+
+    def _write(self, query: str, values: tuple) -> None:
+        if self.write_behind is not None:
+            self.write_behind.submit(query, values)
+            return
+        with self.database_manager.lock:
+            self.database_manager.query_and_commit_with_values(query, values)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import collections
+import threading
+import time
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, OrderedDict, Set
+
+import bittensor as bt
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_QUEUE = 256
+DEFAULT_MAX_PER_VALIDATOR = 64
+# Minimum seconds between "submit queue full" warnings
+SATURATION_LOG_INTERVAL_S = 30.0
+
+
+@dataclass
+class SubmitRequest:
+    execution_id: str
+    input_data_url: str
+    validator_hotkey: str
+    shots: Optional[int]
+    queued_at: float
+
+
+class SubmitPool:
+    """
+    Bounded, per-validator fair queue plus worker threads that submit accepted executions to the provider.
+
+    Forward persists an execution as Pending and offers it here; a worker downloads the circuit, submits it and
+    marks it Queued. Requests are queued per validator and workers take them round robin across validators, so
+    one validator sending a burst cannot starve the others. offer() refuses a request when the pool holds
+    max_queue requests or max_per_validator from that validator; forward answers those with rate_limited.
+    """
+
+    def __init__(
+        self,
+        registry,
+        workers: int = DEFAULT_WORKERS,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        max_per_validator: int = DEFAULT_MAX_PER_VALIDATOR,
+    ) -> None:
+        self.registry = registry
+        self.workers = max(1, int(workers))
+        self.max_queue = max(1, int(max_queue))
+        self.max_per_validator = max(1, min(int(max_per_validator), self.max_queue))
+        self._queues: OrderedDict[str, Deque[SubmitRequest]] = collections.OrderedDict()  # validator -> requests, next turn first
+        self._queued = 0
+        self._ids: Set[str] = set()  # queued or being submitted
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+        self._active = 0
+        self._last_saturation_log = 0.0
+        self.accepted = 0
+        self.rejected = 0
+        self.submitted = 0
+        self.failed = 0
+        self.high_water = 0
+        self.wait_s_total = 0.0
+        self.wait_s_max = 0.0
+
+    def offer(self, execution_id: str, input_data_url: str, validator_hotkey: str, shots: Optional[int]) -> bool:
+        """Queue an execution for submission. Returns False when the pool (or the validator's share) is full"""
+        with self._cond:
+            if execution_id in self._ids:
+                return True
+            pending = self._queues.get(validator_hotkey)
+            if self._stopped or self._queued >= self.max_queue or (pending is not None and len(pending) >= self.max_per_validator):
+                self.rejected += 1
+                self._log_saturation()
+                return False
+            if not self._threads:
+                self._start_workers()
+            if pending is None:
+                pending = self._queues[validator_hotkey] = collections.deque()
+            pending.append(SubmitRequest(execution_id, input_data_url, validator_hotkey, shots, time.monotonic()))
+            self._ids.add(execution_id)
+            self._queued += 1
+            self.accepted += 1
+            self.high_water = max(self.high_water, self._queued)
+            self._cond.notify()
+        return True
+
+    def has_room(self, validator_hotkey: str) -> bool:
+        """Whether offer() would currently accept a request from this validator"""
+        with self._cond:
+            pending = self._queues.get(validator_hotkey)
+            return not self._stopped and self._queued < self.max_queue and (pending is None or len(pending) < self.max_per_validator)
+
+    def depth(self) -> int:
+        with self._cond:
+            return self._queued
+
+    def stats(self) -> Dict[str, object]:
+        with self._cond:
+            started = self.submitted + self.failed
+            return {
+                "workers": self.workers,
+                "active": self._active,
+                "queued": self._queued,
+                "validators": len(self._queues),
+                "max_queue": self.max_queue,
+                "high_water": self.high_water,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "submitted": self.submitted,
+                "failed": self.failed,
+                "avg_wait_s": self.wait_s_total / started if started else 0.0,
+                "max_wait_s": self.wait_s_max,
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and let the workers exit. Queued executions stay Pending until the next start fails them"""
+        with self._cond:
+            self._stopped = True
+            dropped = self._queued
+            self._queues.clear()
+            self._queued = 0
+            self._cond.notify_all()
+        if dropped:
+            bt.logging.warning(f"| Submit Pool | Shut down with {dropped} executions not yet submitted")
+
+    def _next(self) -> Optional[SubmitRequest]:
+        """Block until a request is available; take it from the validator whose turn it is"""
+        with self._cond:
+            while not self._queued and not self._stopped:
+                self._cond.wait()
+            if self._stopped:
+                return None
+            validator, pending = next(iter(self._queues.items()))
+            request = pending.popleft()
+            # Move the validator to the back of the line, or drop it once it has nothing queued
+            del self._queues[validator]
+            if pending:
+                self._queues[validator] = pending
+            self._queued -= 1
+            self._active += 1
+            wait_s = time.monotonic() - request.queued_at
+            self.wait_s_total += wait_s
+            self.wait_s_max = max(self.wait_s_max, wait_s)
+            return request
+
+    def _start_workers(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"Submit Worker {i + 1}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self) -> None:
+        while True:
+            request = self._next()
+            if request is None:
+                return
+            submitted = False
+            try:
+                submitted = self.registry._submit_request(request)
+            except Exception as e:
+                bt.logging.error(f" Submit worker failed for execution {request.execution_id}: {e}")
+            with self._cond:
+                self._active -= 1
+                self._ids.discard(request.execution_id)
+                if submitted:
+                    self.submitted += 1
+                else:
+                    self.failed += 1
+
+    def _log_saturation(self) -> None:
+        now = time.monotonic()
+        if now - self._last_saturation_log >= SATURATION_LOG_INTERVAL_S:
+            self._last_saturation_log = now
+            bt.logging.warning(
+                f"| Submit Pool | Queue full ({self._queued}/{self.max_queue} executions, {self.max_per_validator} per validator); "
+                f"new executions are rate limited ({self.rejected} refused so far)"
+            )
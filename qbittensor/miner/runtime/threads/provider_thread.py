@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import time
+from concurrent.futures import Future
+from typing import Any, Iterator, List, Optional, Tuple
 import bittensor as bt
 
+from qbittensor.miner.providers.base import BaseExecutionStatus, SupportsPollMany
+from qbittensor.miner.runtime.provider_pool import ProviderCallPool, ProviderCallTimeout, call_provider
 from qbittensor.miner.runtime.observability.error_reporter import build_error_event
 from qbittensor.miner.runtime.repository import persist_failed, update_status
 from qbittensor.validator.utils.execution_status import ExecutionStatus
@@ -16,7 +20,7 @@ def run_provider(registry) -> None:
             now = time.time()
             if now - registry._last_avail_check >= registry._availability_check_interval_s:
                 try:
-                    registry._availability_cache = registry.adapter.get_availability(registry.default_device_id)
+                    registry._availability_cache = call_provider(registry, registry.adapter.get_availability, registry.default_device_id)
                 except Exception as e:
                     registry._availability_cache = None
                     try:
@@ -37,7 +41,7 @@ def run_provider(registry) -> None:
 
             if now - registry._last_price_check >= registry._pricing_check_interval_s:
                 try:
-                    registry._pricing_cache = registry.adapter.get_pricing(registry.default_device_id)
+                    registry._pricing_cache = call_provider(registry, registry.adapter.get_pricing, registry.default_device_id)
                 except Exception as e:
                     registry._pricing_cache = None
                     try:
@@ -61,6 +65,7 @@ def run_provider(registry) -> None:
             if time.time() - registry._last_status_update >= registry.STATUS_UPDATE_INTERVAL_S:
                 from qbittensor.miner.runtime.threads.status_thread import collect_status_data
                 collect_status_data(registry)
+                registry._state_machine.report_stuck()
                 registry._last_status_update = time.time()
 
         except Exception as e:
@@ -74,86 +79,202 @@ def run_provider(registry) -> None:
 def poll_once(registry) -> None:
     with registry._lock:
         items = list(registry._jobs.items())
-    for execution_id, tracked in items:
+    # Jobs handed to the completion pipeline are not polled until their worker is done with them
+    pipeline = getattr(registry, "_completion_pipeline", None)
+    if pipeline is not None:
+        items = [(execution_id, tracked) for execution_id, tracked in items if not pipeline.is_busy(execution_id)]
+    scheduler = getattr(registry, "_poll_scheduler", None)
+    if scheduler is None:
+        for execution_id, tracked, status in _poll_statuses(registry, items):
+            _apply_status(registry, execution_id, tracked, status)
+        return
+
+    # Only poll the jobs whose scheduled time has come; every popped job is rescheduled, failed polls included
+    now = time.monotonic()
+    tracked_by_id = dict(items)
+    scheduler.sync(tracked_by_id.keys(), now)
+    due = [(execution_id, tracked_by_id[execution_id]) for execution_id in scheduler.pop_due(now)]
+    # Jobs whose previous call is still outstanding are not polled; push them back without counting a failed poll
+    pool: Optional[ProviderCallPool] = getattr(registry, "_provider_pool", None)
+    if pool is not None:
+        busy = [execution_id for execution_id, _ in due if pool.is_busy(execution_id)]
+        for execution_id in busy:
+            scheduler.defer(execution_id, now)
+        due = [(execution_id, tracked) for execution_id, tracked in due if execution_id not in busy]
+    polled = set()
+    for execution_id, tracked, status in _poll_statuses(registry, due):
+        polled.add(execution_id)
+        _apply_status(registry, execution_id, tracked, status)
+        scheduler.reschedule(execution_id, status.status, status.eta_seconds, time.monotonic())
+    for execution_id, _ in due:
+        if execution_id not in polled:
+            scheduler.reschedule(execution_id, None, None, time.monotonic())
+
+
+def _poll_statuses(registry, items: List[Tuple[str, Any]]) -> Iterator[Tuple[str, Any, BaseExecutionStatus]]:
+    """
+    Yield (execution_id, tracked, status) for every tracked job that could be polled.
+
+    Adapters implementing poll_many are asked in chunks of registry._poll_batch_size handles; a chunk that fails
+    as a whole is retried one handle at a time so a single bad job can't hide the rest. With a provider pool the
+    calls run concurrently and are collected here, on the provider thread, in submission order; a job whose
+    previous call is still outstanding after a timeout is skipped until that call returns.
+    """
+    pool: Optional[ProviderCallPool] = getattr(registry, "_provider_pool", None)
+    if pool is not None:
+        items = [(execution_id, tracked) for execution_id, tracked in items if not pool.is_busy(execution_id)]
+
+    if isinstance(registry.adapter, SupportsPollMany):
+        batch_size = max(1, int(getattr(registry, "_poll_batch_size", 100)))
+        units = [(items[start:start + batch_size], True) for start in range(0, len(items), batch_size)]
+    else:
+        units = [([item], False) for item in items]
+
+    calls = []
+    for chunk, batched in units:
+        keys = [execution_id for execution_id, _ in chunk]
+        if batched:
+            future = _start_call(pool, keys, registry.adapter.poll_many, [tracked.handle for _, tracked in chunk])
+        else:
+            future = _start_call(pool, keys, registry.adapter.poll, chunk[0][1].handle)
+        calls.append((chunk, batched, future))
+
+    retry: List[Tuple[str, Any]] = []
+    deadline = time.monotonic() + (pool.timeout_s if pool is not None else 0.0)
+    for chunk, batched, future in calls:
         try:
-            status = registry.adapter.poll(tracked.handle)
+            result = _finish_call(pool, future, deadline)
+            statuses = result if batched else [result]
+            if len(statuses) != len(chunk):
+                raise ValueError(f"poll_many returned {len(statuses)} statuses for {len(chunk)} handles")
         except Exception as e:
-            bt.logging.error(f" Provider poll failed for execution {execution_id}: {e}")
-            try:
-                event = build_error_event(
-                    stage="provider.poll",
-                    code="EXCEPTION",
-                    message=str(e),
-                    retryable=True,
-                    execution_id=execution_id,
-                    provider_job_id=getattr(tracked.handle, "provider_job_id", None),
-                    device_id=getattr(tracked.handle, "device_id", None),
-                    context=None,
-                )
-                registry._enqueue_error_event(event)
-            except Exception:
-                pass
+            if batched and not isinstance(e, ProviderCallTimeout):
+                bt.logging.debug(f" Provider poll_many failed for {len(chunk)} executions ({e}); polling individually")
+                retry.extend(chunk)
+            else:
+                for execution_id, tracked in chunk:
+                    _report_poll_failure(registry, execution_id, tracked, e)
             continue
-        old_status = tracked.last_status
-        tracked.last_status = status.status
+        for (execution_id, tracked), status in zip(chunk, statuses):
+            yield execution_id, tracked, status
 
-        try:
-            tsvc = getattr(registry, "_telemetry_service", None)
-            if tsvc is not None:
-                miner_uid = getattr(registry, "_miner_uid", None)
+    if retry:
+        calls = [(execution_id, tracked, _start_call(pool, [execution_id], registry.adapter.poll, tracked.handle)) for execution_id, tracked in retry]
+        deadline = time.monotonic() + (pool.timeout_s if pool is not None else 0.0)
+        for execution_id, tracked, future in calls:
+            try:
+                status = _finish_call(pool, future, deadline)
+            except Exception as e:
+                _report_poll_failure(registry, execution_id, tracked, e)
+                continue
+            yield execution_id, tracked, status
+
+
+def _start_call(pool: Optional[ProviderCallPool], keys: List[str], fn, *args) -> Future:
+    """Submit a provider call to the pool, or run it inline and wrap the outcome when there is no pool"""
+    if pool is not None:
+        return pool.submit(keys, fn, *args)
+    future: Future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _finish_call(pool: Optional[ProviderCallPool], future: Future, deadline: float) -> Any:
+    if pool is None:
+        return future.result()
+    return pool.result(future, deadline - time.monotonic())
+
+
+def _report_poll_failure(registry, execution_id: str, tracked, error: Exception) -> None:
+    bt.logging.error(f" Provider poll failed for execution {execution_id}: {error}")
+    try:
+        event = build_error_event(
+            stage="provider.poll",
+            code="TIMEOUT" if isinstance(error, ProviderCallTimeout) else "EXCEPTION",
+            message=str(error),
+            retryable=True,
+            execution_id=execution_id,
+            provider_job_id=getattr(tracked.handle, "provider_job_id", None),
+            device_id=getattr(tracked.handle, "device_id", None),
+            context=None,
+        )
+        registry._enqueue_error_event(event)
+    except Exception:
+        pass
+
+
+def _apply_status(registry, execution_id: str, tracked, status: BaseExecutionStatus) -> None:
+    """Record a polled status: telemetry, then persist or finalize the execution"""
+    old_status = tracked.last_status
+    tracked.last_status = status.status
+
+    try:
+        tsvc = getattr(registry, "_telemetry_service", None)
+        # Only real provider status changes are exported; a job polled RUNNING 100 times is one change
+        if tsvc is not None and status.status != old_status:
+            miner_uid = getattr(registry, "_miner_uid", None)
+            miner_hotkey = None
+            try:
+                miner_hotkey = getattr(getattr(registry, "keypair", None), "ss58_address", None)
+            except Exception:
                 miner_hotkey = None
+            if miner_hotkey is None:
                 try:
-                    miner_hotkey = getattr(getattr(registry, "keypair", None), "ss58_address", None)
+                    kp = getattr(getattr(registry, "_request_manager", None), "_keypair", None)
+                    miner_hotkey = getattr(kp, "ss58_address", None)
                 except Exception:
                     miner_hotkey = None
-                if miner_hotkey is None:
-                    try:
-                        kp = getattr(getattr(registry, "_request_manager", None), "_keypair", None)
-                        miner_hotkey = getattr(kp, "ss58_address", None)
-                    except Exception:
-                        miner_hotkey = None
-                try:
-                    tsvc.miner_record_execution_status_change(
-                        execution_id=execution_id,
-                        new_status=status.status,
-                        old_status=old_status,
-                        miner_uid=miner_uid,
-                        miner_hotkey=miner_hotkey,
-                    )
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-        if status.status == "COMPLETED":
-            from qbittensor.miner.runtime.flows.completion_flow import persist_completion
-            finalized = persist_completion(registry, tracked)
-            if finalized:
-                with registry._lock:
-                    registry._jobs.pop(execution_id, None)
-        elif status.status in ("FAILED", "CANCELLED"):
             try:
-                provider_name = getattr(getattr(registry, "_default_device", None), "provider", None) if hasattr(registry, "_default_device") else None
-                persist_failed(
-                    registry,
-                    execution_id=tracked.execution_id,
-                    validator_hotkey=tracked.validator_hotkey,
-                    provider=provider_name,
-                    provider_job_id=getattr(tracked.handle, "provider_job_id", None),
-                    device_id=getattr(tracked.handle, "device_id", None),
-                    error_message=("Cancelled by request" if status.status == "CANCELLED" else None),
-                    metadata={"provider_status": status.status},
+                tsvc.miner_record_execution_status_change(
+                    execution_id=execution_id,
+                    new_status=status.status,
+                    old_status=old_status,
+                    miner_uid=miner_uid,
+                    miner_hotkey=miner_hotkey,
                 )
-            except Exception as e:
-                bt.logging.debug(f" Failed to persist Failed/Cancelled state for {execution_id}: {e}")
-            finally:
-                with registry._lock:
-                    registry._jobs.pop(execution_id, None)
-        elif status.status in ("QUEUED", "RUNNING"):
-            try:
-                db_state = "Queued" if status.status == "QUEUED" else ExecutionStatus.RUNNING
-                update_status(registry, execution_id=execution_id, status=db_state)
-            except Exception as e:
-                bt.logging.trace(f" Failed to update status for {execution_id}: {e}")
+            except Exception:
+                pass
+    except Exception:
+        pass
+
+    if status.status == "COMPLETED":
+        pipeline = getattr(registry, "_completion_pipeline", None)
+        if pipeline is not None:
+            # Receipt, upload and persistence run on the completion workers; a refused offer is retried next poll
+            if not pipeline.offer(execution_id, tracked):
+                bt.logging.trace(f" Completion pipeline did not take execution {execution_id}; will retry")
+            return
+        from qbittensor.miner.runtime.flows.completion_flow import persist_completion
+        finalized = persist_completion(registry, tracked)
+        if finalized:
+            with registry._lock:
+                registry._jobs.pop(execution_id, None)
+    elif status.status in ("FAILED", "CANCELLED"):
+        try:
+            provider_name = getattr(getattr(registry, "_default_device", None), "provider", None) if hasattr(registry, "_default_device") else None
+            persist_failed(
+                registry,
+                execution_id=tracked.execution_id,
+                validator_hotkey=tracked.validator_hotkey,
+                provider=provider_name,
+                provider_job_id=getattr(tracked.handle, "provider_job_id", None),
+                device_id=getattr(tracked.handle, "device_id", None),
+                error_message=("Cancelled by request" if status.status == "CANCELLED" else None),
+                metadata={"provider_status": status.status},
+            )
+        except Exception as e:
+            bt.logging.debug(f" Failed to persist Failed/Cancelled state for {execution_id}: {e}")
+        finally:
+            with registry._lock:
+                registry._jobs.pop(execution_id, None)
+    elif status.status in ("QUEUED", "RUNNING"):
+        try:
+            db_state = "Queued" if status.status == "QUEUED" else ExecutionStatus.RUNNING
+            update_status(registry, execution_id=execution_id, status=db_state)
+        except Exception as e:
+            bt.logging.trace(f" Failed to update status for {execution_id}: {e}")
 
 
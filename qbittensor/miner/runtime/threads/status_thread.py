@@ -5,6 +5,7 @@ import bittensor as bt
 import queue
 
 from qbittensor.miner.providers.base import Capabilities, MinerIdentity
+from qbittensor.miner.runtime.provider_pool import call_provider
 
 
 def collect_status_data(registry) -> None:
@@ -13,11 +14,11 @@ def collect_status_data(registry) -> None:
         availability = None
         pricing = None
         try:
-            availability = registry.adapter.get_availability(registry.default_device_id)
+            availability = call_provider(registry, registry.adapter.get_availability, registry.default_device_id)
         except Exception:
             pass
         try:
-            pricing = registry.adapter.get_pricing(registry.default_device_id)
+            pricing = call_provider(registry, registry.adapter.get_pricing, registry.default_device_id)
         except Exception:
             pass
 
@@ -28,7 +29,7 @@ def collect_status_data(registry) -> None:
             device_type=(getattr(registry._default_device, "device_type", None) if registry._default_device else ("QPU" if (registry.default_device_id and "qpu" in registry.default_device_id) else "SIMULATOR")),
         )
 
-        caps_list = registry.adapter.list_capabilities()
+        caps_list = call_provider(registry, registry.adapter.list_capabilities)
         caps = None
         if len(caps_list) > 0:
             cap0 = caps_list[0]
@@ -113,6 +114,15 @@ def run_job_server(registry) -> None:
                 except Exception as e:
                     bt.logging.trace(f" Error sending error report: {e}")
 
+            while True:
+                try:
+                    transition = registry._transition_queue.get_nowait()
+                    registry._send_transition_to_job_server(transition)
+                except queue.Empty:
+                    break
+                except Exception as e:
+                    bt.logging.trace(f" Error sending status transition: {e}")
+
         except Exception as e:
             bt.logging.debug(f"Job server thread error: {e}")
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from enum import Enum
 from pydantic import BaseModel
 
@@ -10,6 +10,9 @@ from qbittensor.miner.providers.base import JobHandle
 class UploadDataResponse(BaseModel):
     upload_url: str
     id: str
+    # Body format and content encoding the job server expects at upload_url; absent means plain JSON
+    result_format: str = "json"
+    content_encoding: Optional[str] = None
 
 
 class MinerStatus(Enum):
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import collections
+import math
+import threading
+import time
+from typing import Callable, Deque, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import bittensor as bt
+
+from qbittensor.miner.runtime.types import UploadDataResponse
+
+DEFAULT_MAX_SLOTS = 32
+DEFAULT_MAX_AGE_S = 300.0
+# Completions are counted over this window to estimate the completion rate
+RATE_WINDOW_S = 60.0
+# Keep enough slots for this many seconds of completions at the recent rate
+HORIZON_S = 10.0
+REFILL_INTERVAL_S = 1.0
+# A URL whose signature says it expires sooner than max_age_s is retired at this fraction of its lifetime
+EXPIRY_SAFETY_FRACTION = 0.8
+
+
+def _url_lifetime_s(upload_url: str) -> Optional[float]:
+    """Lifetime advertised by an S3 presigned URL (X-Amz-Expires), or None"""
+    try:
+        values = parse_qs(urlparse(upload_url).query).get("X-Amz-Expires")
+        return float(values[0]) if values else None
+    except Exception:
+        return None
+
+
+class UploadSlotPool:
+    """
+    Presigned result-upload slots (POST executions/upload), fetched ahead of need by a background thread.
+
+    Every completing job needs one slot; fetching it inline put a job-server round trip on each completion, so a
+    burst of completions (e.g. after a QPU calibration window) serialized on them. The pool keeps a target
+    number of slots ready, sized from the completion rate over the last RATE_WINDOW_S seconds (HORIZON_S
+    seconds' worth, clamped to [min_slots, max_slots]). An idle miner therefore prefetches nothing.
+
+    Slots are handed out oldest first and evicted unused once older than max_age_s, or earlier when the URL
+    advertises a shorter X-Amz-Expires. take() falls back to a direct fetch when the pool is empty.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Optional[UploadDataResponse]],
+        max_slots: int = DEFAULT_MAX_SLOTS,
+        min_slots: int = 0,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+    ) -> None:
+        self.fetch = fetch
+        self.max_slots = max(0, int(max_slots))
+        self.min_slots = min(max(0, int(min_slots)), self.max_slots)
+        self.max_age_s = float(max_age_s)
+        self._slots: Deque[Tuple[float, UploadDataResponse]] = collections.deque()  # (expires_at, slot), oldest first
+        self._takes: Deque[float] = collections.deque()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.fetched = 0
+        self.evicted = 0
+        self.fetch_errors = 0
+
+    def take(self) -> Optional[UploadDataResponse]:
+        """Return a ready slot, or fetch one directly if none is ready"""
+        now = time.monotonic()
+        with self._cond:
+            self._evict_expired(now)
+            self._takes.append(now)
+            if self._slots:
+                self.hits += 1
+                _, slot = self._slots.popleft()
+                self._cond.notify()
+                return slot
+            self.misses += 1
+            self._cond.notify()
+        return self.fetch()
+
+    def target_size(self, now: Optional[float] = None) -> int:
+        """Slots to keep ready: HORIZON_S seconds of completions at the recent rate"""
+        now = time.monotonic() if now is None else now
+        with self._cond:
+            while self._takes and self._takes[0] < now - RATE_WINDOW_S:
+                self._takes.popleft()
+            rate = len(self._takes) / RATE_WINDOW_S
+        return min(self.max_slots, max(self.min_slots, math.ceil(rate * HORIZON_S)))
+
+    def size(self) -> int:
+        with self._cond:
+            return len(self._slots)
+
+    def refill(self) -> int:
+        """Evict expired slots and fetch up to the target size. Returns the number of slots fetched"""
+        fetched = 0
+        while not self._stop.is_set():
+            now = time.monotonic()
+            target = self.target_size(now)
+            with self._cond:
+                self._evict_expired(now)
+                if len(self._slots) >= target:
+                    break
+            try:
+                slot = self.fetch()
+            except Exception as e:
+                slot = None
+                bt.logging.debug(f"| Upload Slots | Prefetch failed: {e}")
+            if not slot:
+                with self._cond:
+                    self.fetch_errors += 1
+                break
+            with self._cond:
+                self._slots.append((self._expires_at(slot, time.monotonic()), slot))
+                self.fetched += 1
+            fetched += 1
+        return fetched
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "ready": len(self._slots),
+                "hits": self.hits,
+                "misses": self.misses,
+                "fetched": self.fetched,
+                "evicted": self.evicted,
+                "fetch_errors": self.fetch_errors,
+            }
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="Upload Slot Thread", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def _run(self) -> None:
+        bt.logging.info(f"| Upload Slot Thread | Upload slot prefetch started")
+        while not self._stop.is_set():
+            try:
+                self.refill()
+            except Exception as e:
+                bt.logging.debug(f"| Upload Slot Thread | Refill error: {e}")
+            with self._cond:
+                self._cond.wait(REFILL_INTERVAL_S)
+        bt.logging.info(f"| Upload Slot Thread | Upload slot prefetch stopped")
+
+    def _expires_at(self, slot: UploadDataResponse, now: float) -> float:
+        max_age_s = self.max_age_s
+        lifetime = _url_lifetime_s(slot.upload_url)
+        if lifetime is not None:
+            max_age_s = min(max_age_s, lifetime * EXPIRY_SAFETY_FRACTION)
+        return now + max_age_s
+
+    def _evict_expired(self, now: float) -> None:
+        if any(expires_at <= now for expires_at, _ in self._slots):
+            live = collections.deque(item for item in self._slots if item[0] > now)
+            self.evicted += len(self._slots) - len(live)
+            self._slots = live
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import bittensor as bt
+
+from pkg.database.database_manager import DatabaseManager
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_FLUSH_INTERVAL_S = 0.05
+
+
+class WriteBehindWriter:
+    """
+    Coalesces execution-state writes into batched transactions.
+
+    Writes are queued by the repository functions and committed by a background thread whenever
+    `max_batch` statements are waiting or `flush_interval_s` has elapsed. Readers that need to see
+    their own writes call flush(), which commits everything queued so far before returning.
+    """
+
+    def __init__(self, database_manager: DatabaseManager, max_batch: int = DEFAULT_MAX_BATCH, flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S) -> None:
+        self.database_manager = database_manager
+        self.max_batch = max(1, int(max_batch))
+        self.flush_interval_s = flush_interval_s
+        self._pending: List[Tuple[str, tuple]] = []
+        self._cond = threading.Condition()
+        self._write_mutex = threading.Lock()  # Serializes drains so batches commit in enqueue order
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.batches_committed = 0
+        self.statements_committed = 0
+
+    def submit(self, query: str, values: tuple) -> None:
+        """Queue a write. Wakes the writer thread early once a full batch is waiting"""
+        with self._cond:
+            self._pending.append((query, values))
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify()
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def flush(self) -> None:
+        """Commit every write queued before this call"""
+        with self._cond:
+            if not self._pending:
+                # Another drain may still be committing a batch it already took
+                if not self._write_mutex.locked():
+                    return
+        self._drain()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="Write Behind Thread", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer thread and commit anything still queued"""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self._drain()
+
+    def _run(self) -> None:
+        bt.logging.info(f"| Write Behind Thread | Write-behind writer started")
+        while not self._stop.is_set():
+            deadline = time.monotonic() + self.flush_interval_s
+            with self._cond:
+                while len(self._pending) < self.max_batch and not self._stop.is_set():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            try:
+                self._drain()
+            except Exception as e:
+                bt.logging.debug(f"Write-behind writer error: {e}")
+        bt.logging.info(f"| Write Behind Thread | Write-behind writer stopped")
+
+    def _drain(self) -> None:
+        with self._write_mutex:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                with self.database_manager.lock:
+                    self.database_manager.execute_batch_and_commit(batch)
+            except Exception as e:
+                # Don't let one bad row sink the whole batch; retry statement by statement
+                bt.logging.debug(f" Write-behind batch of {len(batch)} failed ({e}); retrying individually")
+                for query, values in batch:
+                    try:
+                        with self.database_manager.lock:
+                            self.database_manager.query_and_commit_with_values(query, values)
+                    except Exception as e2:
+                        bt.logging.error(f" Write-behind statement failed: {e2}")
+            self.batches_committed += 1
+            self.statements_committed += len(batch)
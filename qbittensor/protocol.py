@@ -62,7 +62,7 @@ class CircuitSynapse(bt.Synapse):
     )
 
     last_circuit: str = Field(
-        description="The timestamp of the last circuit received from the miner this synapse is sent to"
+        description="Cursor returned by the miner this synapse is sent to with its last finished executions (a timestamp, optionally followed by the miner's change-log position)"
     )
 
     # flag for rate limiting
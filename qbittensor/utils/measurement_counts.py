@@ -0,0 +1,282 @@
+"""
+Array-backed measurement counts.
+
+Provider results arrive as {"bitstring": count} dicts: one str and one int object per outcome, roughly 100 bytes
+each, validated by looping over every character. MeasurementCounts holds the same data as a uint8 matrix of
+bit-packed bitstrings (one row per outcome, ceil(width / 8) big-endian bytes) and an int64 counts array, so a
+wide register with 10^5 distinct outcomes takes a few bytes per outcome and validation, totals and top-k are
+single NumPy passes.
+
+The packed wire format (shared with the upload encoder) is b"QBC1", varint width, varint entry count, then per
+entry the key bytes followed by a varint count.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+PACKED_MAGIC = b"QBC1"
+# Registers up to this many bits are tallied with np.bincount (a 2^width table); wider ones with np.unique
+BINCOUNT_MAX_WIDTH = 20
+INT64_MAX = int(np.iinfo(np.int64).max)
+_ZERO = ord("0")
+
+
+def varint(value: int) -> bytes:
+    """Unsigned LEB128 encoding of value"""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """Decode a varint at offset; returns (value, next offset)"""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def _pack_bits(bits: np.ndarray) -> np.ndarray:
+    """(n, width) 0/1 matrix -> (n, ceil(width / 8)) big-endian bytes, zero bits padded on the left"""
+    pad = (-bits.shape[1]) % 8
+    if pad:
+        bits = np.concatenate([np.zeros((bits.shape[0], pad), dtype=np.uint8), bits], axis=1)
+    return np.packbits(bits, axis=1)
+
+
+class MeasurementCounts:
+    """
+    Outcome counts for one circuit execution, stored as packed key bytes plus a counts array.
+
+    Every bitstring has the same width. Build one with from_dict (provider payloads), from_measurements or
+    from_bits (per-shot bitstrings or bit rows) or from_packed_bytes (wire format). from_dict raises ValueError on
+    non-binary keys, counts that are negative, non-integer or above the int64 maximum, and, unless pad is set,
+    on mixed widths.
+    """
+
+    __slots__ = ("width", "keys", "counts")
+
+    def __init__(self, width: int, keys: np.ndarray, counts: np.ndarray) -> None:
+        self.width = int(width)
+        self.keys = keys
+        self.counts = counts
+
+    @property
+    def key_bytes(self) -> int:
+        return (self.width + 7) // 8
+
+    @classmethod
+    def from_dict(cls, mapping: Mapping[str, Any], pad: bool = False) -> "MeasurementCounts":
+        """
+        Parse a {"bitstring": count} mapping, validating every key and count in bulk. With pad, shorter bitstrings
+        are left-padded with zeros to the widest one, and keys that become equal have their counts summed
+        """
+        keys = list(mapping.keys())
+        n = len(keys)
+        if n == 0:
+            return cls(0, np.zeros((0, 0), dtype=np.uint8), np.zeros(0, dtype=np.int64))
+        bits = cls._parse_bitstrings(keys, pad=pad)
+        counts = np.asarray(list(mapping.values()))
+        if counts.dtype.kind not in "biu":
+            raise ValueError("counts must be integers no larger than the int64 maximum")
+        if counts.dtype.kind == "i" and (counts < 0).any():
+            raise ValueError("counts must be non-negative")
+        if counts.dtype.kind == "u" and counts.max() > INT64_MAX:
+            raise ValueError("counts must be no larger than the int64 maximum")
+        packed, counts = _pack_bits(bits), counts.astype(np.int64)
+        if pad and len(set(map(len, keys))) > 1:
+            packed, inverse = np.unique(packed, axis=0, return_inverse=True)
+            merged = np.zeros(packed.shape[0], dtype=np.int64)
+            np.add.at(merged, inverse.ravel(), counts)
+            counts = merged
+        return cls(bits.shape[1], packed, counts)
+
+    @classmethod
+    def from_measurements(cls, measurements: Iterable[str]) -> "MeasurementCounts":
+        """Collapse per-shot bitstrings into counts, ordered by bitstring value"""
+        if isinstance(measurements, np.ndarray) and measurements.dtype.kind == "U":
+            # A fixed-width unicode array is an (n, width) matrix of code points; shorter strings are NUL-padded
+            width = measurements.dtype.itemsize // 4
+            bits = np.ascontiguousarray(measurements).view(np.uint32).reshape(measurements.size, width) - _ZERO
+            if (bits > 1).any():
+                raise ValueError(f"measurements must all be {width}-bit strings of 0 and 1")
+            return cls._tally(bits.astype(np.uint8))
+        shots = measurements if isinstance(measurements, list) else list(measurements)
+        if not shots:
+            return cls(0, np.zeros((0, 0), dtype=np.uint8), np.zeros(0, dtype=np.int64))
+        # One newline-terminated row per shot: a shot of the wrong width shifts a newline out of the last column
+        width = len(shots[0]) if isinstance(shots[0], str) else -1
+        try:
+            raw = ("\n".join(shots) + "\n").encode("ascii")
+        except (TypeError, UnicodeEncodeError):
+            raise ValueError("measurements must be bitstrings") from None
+        if width < 0 or len(raw) != len(shots) * (width + 1):
+            raise ValueError(f"measurements must all be {width}-bit strings")
+        # XOR with "00..0\n" leaves 0/1 in the bit columns and 0 in the newline column of every valid row
+        template = np.full(width + 1, _ZERO, dtype=np.uint8)
+        template[-1] = ord("\n")
+        limit = np.ones(width + 1, dtype=np.uint8)
+        limit[-1] = 0
+        rows = np.frombuffer(raw, dtype=np.uint8).reshape(len(shots), width + 1) ^ template
+        if (rows > limit).any():
+            raise ValueError(f"measurements must all be {width}-bit strings of 0 and 1")
+        return cls._tally(rows[:, :width])
+
+    @classmethod
+    def from_bits(cls, bits: np.ndarray) -> "MeasurementCounts":
+        """Collapse a (shots, width) matrix of 0/1 into counts, ordered by bitstring value"""
+        bits = np.asarray(bits)
+        if bits.ndim != 2:
+            raise ValueError("bits must be a (shots, width) matrix")
+        if bits.size and (bits.min() < 0 or bits.max() > 1):
+            raise ValueError("bits may only contain 0 and 1")
+        return cls._tally(bits.astype(np.uint8, copy=False))
+
+    @classmethod
+    def _tally(cls, bits: np.ndarray) -> "MeasurementCounts":
+        """
+        Count the distinct rows of a validated 0/1 matrix. Rows are packed to bytes; registers up to 64 bits are
+        then read as one integer per shot and reduced with bincount (narrow) or np.unique, wider ones with
+        np.unique over the packed rows.
+        """
+        shots, width = bits.shape
+        key_bytes = (width + 7) // 8
+        if shots == 0:
+            return cls(width, np.zeros((0, key_bytes), dtype=np.uint8), np.zeros(0, dtype=np.int64))
+        if width > 64:
+            keys, counts = np.unique(_pack_bits(bits), axis=0, return_counts=True)
+            return cls(width, keys, counts.astype(np.int64))
+        # packbits pads on the right; read the bytes as a big-endian uint64 and shift the padding out
+        wide = np.zeros((shots, 8), dtype=np.uint8)
+        wide[:, 8 - key_bytes:] = np.packbits(bits, axis=1)
+        values = wide.view(">u8").ravel() >> np.uint64(key_bytes * 8 - width)
+        if width <= BINCOUNT_MAX_WIDTH:
+            tally = np.bincount(values.astype(np.int64), minlength=1 << width)
+            present = np.flatnonzero(tally)
+            values, counts = present.astype(np.uint64), tally[present]
+        else:
+            values, counts = np.unique(values, return_counts=True)
+        keys = values.astype(">u8").view(np.uint8).reshape(-1, 8)[:, 8 - key_bytes:]
+        return cls(width, np.ascontiguousarray(keys), counts.astype(np.int64))
+
+    @classmethod
+    def coerce(cls, counts: "MeasurementCounts | Mapping[str, Any]", pad: bool = False) -> "MeasurementCounts":
+        return counts if isinstance(counts, MeasurementCounts) else cls.from_dict(counts, pad=pad)
+
+    @classmethod
+    def is_valid(cls, mapping: Any) -> bool:
+        """Whether mapping is a non-empty {"bitstring": count} dict that from_dict accepts"""
+        if not isinstance(mapping, dict) or not mapping:
+            return False
+        try:
+            cls.from_dict(mapping)
+        except (ValueError, TypeError, UnicodeEncodeError):
+            return False
+        return True
+
+    @staticmethod
+    def _parse_bitstrings(bitstrings: List[str], pad: bool = False) -> np.ndarray:
+        """Validate bitstrings and return them as an (n, width) uint8 matrix of 0/1"""
+        if not all(type(b) is str for b in bitstrings):
+            raise ValueError("bitstrings must be str")
+        width = len(bitstrings[0])
+        lengths = np.fromiter(map(len, bitstrings), dtype=np.int64, count=len(bitstrings))
+        if (lengths != width).any():
+            if not pad:
+                raise ValueError(f"bitstrings must all be {width} bits wide")
+            width = int(lengths.max())
+            bitstrings = [b.rjust(width, "0") for b in bitstrings]
+        raw = np.frombuffer("".join(bitstrings).encode("ascii"), dtype=np.uint8)
+        bits = (raw - _ZERO).reshape(len(bitstrings), width)
+        if (bits > 1).any():
+            raise ValueError("bitstrings may only contain 0 and 1")
+        return bits
+
+    def __len__(self) -> int:
+        return int(self.counts.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.keys.nbytes + self.counts.nbytes)
+
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def bitstrings(self, rows: Optional[np.ndarray] = None) -> List[str]:
+        """Bitstrings for `rows` (all outcomes by default), in row order"""
+        keys = self.keys if rows is None else self.keys[rows]
+        if keys.shape[0] == 0:
+            return []
+        if self.width == 0:
+            return [""] * keys.shape[0]
+        bits = np.unpackbits(keys, axis=1)[:, keys.shape[1] * 8 - self.width:]
+        chars = np.ascontiguousarray(bits + _ZERO).view(f"S{self.width}").ravel()
+        return chars.astype(f"U{self.width}").tolist()
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(zip(self.bitstrings(), self.counts.tolist()))
+
+    def top_k(self, k: int) -> List[Tuple[str, int]]:
+        """The k most frequent outcomes, highest count first (ties in row order)"""
+        k = max(0, min(int(k), len(self)))
+        if k == 0:
+            return []
+        rows = np.argsort(-self.counts, kind="stable")[:k]
+        return list(zip(self.bitstrings(rows), self.counts[rows].tolist()))
+
+    def most_frequent(self) -> Optional[str]:
+        """The outcome with the highest count (the first one on ties), or None when empty"""
+        if len(self) == 0:
+            return None
+        return self.bitstrings(np.array([int(np.argmax(self.counts))]))[0]
+
+    def iter_packed(self, chunk_entries: int = 4096) -> Iterator[bytes]:
+        """Yield the packed wire format in pieces of up to chunk_entries entries"""
+        yield PACKED_MAGIC + varint(self.width) + varint(len(self))
+        for start in range(0, len(self), chunk_entries):
+            keys = self.keys[start:start + chunk_entries]
+            counts = self.counts[start:start + chunk_entries]
+            if counts.size and counts.max() < 0x80:
+                # Every count fits a one-byte varint: interleave key bytes and counts in one array
+                yield np.hstack([keys, counts.astype(np.uint8)[:, None]]).tobytes()
+                continue
+            raw, key_bytes, chunk = keys.tobytes(), self.key_bytes, bytearray()
+            for i, count in enumerate(counts.tolist()):
+                chunk += raw[i * key_bytes:(i + 1) * key_bytes]
+                chunk += varint(count)
+            yield bytes(chunk)
+
+    def to_packed_bytes(self) -> bytes:
+        return b"".join(self.iter_packed())
+
+    @classmethod
+    def from_packed_bytes(cls, data: bytes) -> "MeasurementCounts":
+        """Inverse of to_packed_bytes"""
+        if data[:4] != PACKED_MAGIC:
+            raise ValueError("not a packed counts body")
+        width, offset = read_varint(data, 4)
+        entries, offset = read_varint(data, offset)
+        key_bytes = (width + 7) // 8
+        body = np.frombuffer(data, dtype=np.uint8, offset=offset)
+        if body.size == entries * (key_bytes + 1):
+            rows = body.reshape(entries, key_bytes + 1)
+            if not (rows[:, -1] & 0x80).any():
+                return cls(width, rows[:, :-1].copy(), rows[:, -1].astype(np.int64))
+        keys = np.empty((entries, key_bytes), dtype=np.uint8)
+        counts = np.empty(entries, dtype=np.int64)
+        for i in range(entries):
+            keys[i] = np.frombuffer(data, dtype=np.uint8, count=key_bytes, offset=offset)
+            counts[i], offset = read_varint(data, offset + key_bytes)
+        return cls(width, keys, counts)
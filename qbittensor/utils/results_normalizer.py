@@ -2,6 +2,43 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
+
+from qbittensor.utils.measurement_counts import MeasurementCounts
+
+
+def largest_remainder_counts(probabilities: np.ndarray, shots: int) -> np.ndarray:
+    """Turn probabilities into integer counts that sum to exactly `shots` (largest-remainder rounding).
+
+    Probabilities are clipped at zero and rescaled to sum to one. Each entry gets the floor of its share; the
+    shots left over go to the largest fractional parts, earlier entries first on ties.
+    """
+    p = np.clip(np.asarray(probabilities, dtype=np.float64), 0.0, None)
+    total = p.sum()
+    if p.size == 0 or not np.isfinite(total) or total <= 0:
+        return np.zeros(p.shape, dtype=np.int64)
+    share = p * (shots / total)
+    counts = np.floor(share).astype(np.int64)
+    leftover = int(shots - counts.sum())
+    if leftover > 0:
+        order = np.argsort(-(share - counts), kind="stable")
+        counts[order[:leftover]] += 1
+    return counts
+
+
+def _collapse_measurements(measurements: Any) -> Dict[str, int]:
+    """Per-shot results (bitstrings or rows of bits) -> counts, without a Python loop over shots"""
+    if len(measurements) and isinstance(measurements[0], (list, tuple, np.ndarray)):
+        return MeasurementCounts.from_bits(np.asarray(measurements)).to_dict()
+    if isinstance(measurements, np.ndarray) and measurements.ndim == 2:
+        return MeasurementCounts.from_bits(measurements).to_dict()
+    try:
+        return MeasurementCounts.from_measurements(measurements).to_dict()
+    except ValueError:
+        # Not uniform-width bitstrings: count the raw values as strings
+        values, counts = np.unique(np.asarray(measurements).astype(str), return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
+
 
 def normalize_measurement_counts(results: Optional[Dict[str, Any]], shots: Optional[int]) -> Tuple[Optional[Dict[str, int]], Optional[str]]:
     """Normalize provider result payloads into a measurementCounts dict and best bitstring.
@@ -9,8 +46,8 @@ def normalize_measurement_counts(results: Optional[Dict[str, Any]], shots: Optio
     Accepts various shapes:
     - {"measurementCounts": {"00": 10, "11": 5}}
     - {"counts": {"00": 10, "11": 5}} (alternate key)
-    - {"probabilities": {"00": 0.5, "11": 0.5}} (convert to counts if shots provided)
-    - {"measurements": ["00", "11", ...]} (collapse to counts)
+    - {"probabilities": {"00": 0.5, "11": 0.5}} (convert to counts if shots provided; the counts sum to shots)
+    - {"measurements": ["00", "11", ...]} or [[0, 0], [1, 1], ...] (collapse to counts, ordered by bitstring)
 
     Returns a tuple: (counts_dict_or_none, best_bitstring_or_none)
     """
@@ -29,28 +66,24 @@ def normalize_measurement_counts(results: Optional[Dict[str, Any]], shots: Optio
 
     if counts is None and isinstance(results.get("probabilities"), dict) and shots is not None and shots > 0:
         try:
-            probs = {str(k): float(v) for k, v in results["probabilities"].items()}
-            counts = {k: max(0, int(round(p * shots))) for k, p in probs.items()}
+            keys = [str(k) for k in results["probabilities"]]
+            probs = np.fromiter((float(v) for v in results["probabilities"].values()), dtype=np.float64, count=len(keys))
+            counts = dict(zip(keys, largest_remainder_counts(probs, int(shots)).tolist()))
         except Exception:
             counts = None
 
-    if counts is None and isinstance(results.get("measurements"), (list, tuple)):
+    if counts is None and isinstance(results.get("measurements"), (list, tuple, np.ndarray)):
         try:
-            measurements = [str(x) for x in results["measurements"]]
-            tmp: Dict[str, int] = {}
-            for m in measurements:
-                tmp[m] = tmp.get(m, 0) + 1
-            counts = tmp
+            counts = _collapse_measurements(results["measurements"])
         except Exception:
             counts = None
 
     best = None
     if isinstance(counts, dict) and counts:
         try:
-            best = max(counts.items(), key=lambda kv: kv[1])[0]
+            values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+            best = list(counts)[int(np.argmax(values))]
         except Exception:
             best = None
 
     return counts, best
-
-
@@ -196,6 +196,108 @@ class TelemetryService:
         except Exception as e:
             bt.logging.debug(f"Failed to enqueue execution_status_change for miner {miner_uid}: {e}")  # Non-critical
 
+    def record_database_stats(self, database: str, stats: Dict[str, Dict[str, Any]], top_n: int = 10):
+        """Export the top_n statements by total time from DatabaseManager.query_stats(), one datapoint each."""
+        try:
+            timestamp: str = timestamp_iso()
+            ranked = sorted(stats.items(), key=lambda item: item[1].get("total_s", 0.0), reverse=True)[:top_n]
+            for statement, s in ranked:
+                self._enqueue_datapoint("db_statement_stats", timestamp, s.get("total_s", 0.0) * 1000.0, attributes={
+                    "database": database,
+                    "statement": statement,
+                    "calls": s.get("calls"),
+                    "errors": s.get("errors"),
+                    "rows": s.get("rows"),
+                    "p50_ms": s.get("p50_s", 0.0) * 1000.0,
+                    "p95_ms": s.get("p95_s", 0.0) * 1000.0,
+                    "max_ms": s.get("max_s", 0.0) * 1000.0,
+                    "lock_wait_ms": s.get("lock_wait_s", 0.0) * 1000.0,
+                })
+        except Exception as e:
+            bt.logging.debug(f"Failed to enqueue db_statement_stats for {database}: {e}")  # Non-critical
+
+    def record_completion_pipeline_stats(self, stats: Dict[str, Any]):
+        """Export JobRegistry.completion_stats(): one datapoint for the queue, one per completion stage."""
+        try:
+            if not stats:
+                return
+            timestamp: str = timestamp_iso()
+            self._enqueue_datapoint("miner_completion_queue", timestamp, stats.get("queued", 0), attributes={
+                "workers": stats.get("workers"),
+                "active": stats.get("active"),
+                "high_water": stats.get("high_water"),
+                "accepted": stats.get("accepted"),
+                "rejected": stats.get("rejected"),
+                "finalized": stats.get("finalized"),
+                "failed": stats.get("failed"),
+                "utilization": stats.get("utilization"),
+                "upload_slots": stats.get("upload_slots"),
+            })
+            for stage, s in (stats.get("stages") or {}).items():
+                self._enqueue_datapoint("miner_completion_stage", timestamp, s.get("avg_s", 0.0) * 1000.0, attributes={
+                    "stage": stage,
+                    "count": s.get("count"),
+                    "max_ms": s.get("max_s", 0.0) * 1000.0,
+                })
+        except Exception as e:
+            bt.logging.debug(f"Failed to enqueue completion pipeline stats: {e}")  # Non-critical
+
+    def record_submit_pool_stats(self, stats: Dict[str, Any]):
+        """Export JobRegistry.submit_stats() as one datapoint for the submit queue."""
+        try:
+            if not stats:
+                return
+            self._enqueue_datapoint("miner_submit_queue", timestamp_iso(), stats.get("queued", 0), attributes={
+                "workers": stats.get("workers"),
+                "active": stats.get("active"),
+                "validators": stats.get("validators"),
+                "high_water": stats.get("high_water"),
+                "accepted": stats.get("accepted"),
+                "rejected": stats.get("rejected"),
+                "submitted": stats.get("submitted"),
+                "failed": stats.get("failed"),
+                "avg_wait_ms": stats.get("avg_wait_s", 0.0) * 1000.0,
+                "max_wait_ms": stats.get("max_wait_s", 0.0) * 1000.0,
+            })
+        except Exception as e:
+            bt.logging.debug(f"Failed to enqueue submit pool stats: {e}")  # Non-critical
+
+    def record_rate_limit_stats(self, stats: Dict[str, Any]):
+        """Export the miner rate limiter's counters: one datapoint for accepted requests, one per rejection reason."""
+        try:
+            if not stats:
+                return
+            timestamp: str = timestamp_iso()
+            self._enqueue_datapoint("miner_rate_limit_allowed", timestamp, stats.get("allowed", 0), attributes={
+                "validators": stats.get("validators"),
+            })
+            for reason, count in (stats.get("rejected") or {}).items():
+                self._enqueue_datapoint("miner_rate_limit_rejected", timestamp, count, attributes={"reason": reason})
+        except Exception as e:
+            bt.logging.debug(f"Failed to enqueue rate limit stats: {e}")  # Non-critical
+
+    def record_execution_state_stats(self, stats: Dict[str, Any]):
+        """Export JobRegistry.state_stats(): one datapoint for the transition counters, one per status dwell time."""
+        try:
+            if not stats:
+                return
+            timestamp: str = timestamp_iso()
+            self._enqueue_datapoint("miner_execution_transitions", timestamp, stats.get("transitions", 0), attributes={
+                "unchanged": stats.get("unchanged"),
+                "rejected": stats.get("rejected"),
+                "stuck": stats.get("stuck"),
+            })
+            oldest = stats.get("oldest_s") or {}
+            for status, s in (stats.get("dwell") or {}).items():
+                self._enqueue_datapoint("miner_execution_dwell", timestamp, s.get("avg_s", 0.0), attributes={
+                    "status": status,
+                    "count": s.get("count"),
+                    "max_s": s.get("max_s"),
+                    "oldest_s": oldest.get(status),
+                })
+        except Exception as e:
+            bt.logging.debug(f"Failed to enqueue execution state stats: {e}")  # Non-critical
+
     def shutdown(self):
         """
         Shuts down the requests session and flushes the queue.
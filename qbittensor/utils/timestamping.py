@@ -13,3 +13,11 @@ def timestamp_str() -> str:
 def timestamp_iso() -> str:
     """Get the current timestamp in ISO 8601 format"""
     return timestamp().isoformat()
+
+def to_epoch(value: datetime) -> int:
+    """Convert a datetime to integer seconds since the Unix epoch"""
+    return int(value.timestamp())
+
+def timestamp_epoch() -> int:
+    """Get the current timestamp as integer seconds since the Unix epoch"""
+    return to_epoch(timestamp())
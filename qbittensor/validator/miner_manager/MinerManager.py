@@ -43,7 +43,7 @@ class MinerManager:
 
     def _get_active_miners_from_db(self) -> set[Miner]:
         """Return all miners from the active_miners table"""
-        with self.database_manager.lock:
+        with self.database_manager.read_lock:
             results = self.database_manager.query("SELECT hotkey, uid FROM active_miners")
         if results == None:
             return set()
@@ -84,7 +84,7 @@ class MinerManager:
             with self.database_manager.lock:
                 self.database_manager.query_and_commit_many("DELETE FROM last_circuit WHERE miner_hotkey = ?", tuples)
                 self.database_manager.query_and_commit_many("DELETE FROM active_miners WHERE hotkey = ?", tuples)
-                self.database_manager.query_and_commit_many("DELETE FROM execution_metrics WHERE miner_hotkey = ?", tuples)
+                self.database_manager.query_and_commit_many("DELETE FROM execution_metrics WHERE hotkey_id = (SELECT id FROM hotkey WHERE hotkey = ?)", tuples)
 
         # Track newly reg'd miners
         self._track_new_miners(metagraph_miners, tracked_miners)
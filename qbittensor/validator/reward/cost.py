@@ -1,10 +1,12 @@
-from datetime import timedelta, datetime, timezone
+from datetime import timedelta
 import bittensor as bt
 from typing import List, Tuple
 import requests
 
 from pkg.database.database_manager import DatabaseManager 
+from pkg.database.retention import RetentionPolicy, RetentionPruner
 from qbittensor.utils.Timer import Timer
+from qbittensor.utils.timestamping import to_epoch
 from qbittensor.utils.request.RequestManager import RequestManager
 
 MAX_DATA_AGE: timedelta = timedelta(days=30)
@@ -14,6 +16,10 @@ class CostConfirmation:
         self.database_manager: DatabaseManager = database_manager
         self.request_manager: RequestManager = request_manager
         self.timer: Timer = Timer(timedelta(minutes=30), self._run, run_on_start=True)
+        self.retention: RetentionPruner = RetentionPruner(
+            database_manager,
+            [RetentionPolicy(table="successful_job", column="created_at", max_age=MAX_DATA_AGE, format_cutoff=to_epoch)],
+        )
         
     def _run(self):
         bt.logging.info("💰 Running cost confirmation process.")
@@ -41,7 +47,7 @@ class CostConfirmation:
         """Drop a row from the database."""
         query: str = """
             DELETE FROM successful_job
-            WHERE miner_hotkey = ? AND execution_id = ?
+            WHERE hotkey_id = (SELECT id FROM hotkey WHERE hotkey = ?) AND execution_id = ?
         """
         values: tuple = (miner_hotkey, execution_id)
         self.database_manager.query_and_commit_with_values(query, values)
@@ -51,7 +57,7 @@ class CostConfirmation:
         query: str = """
             UPDATE successful_job
             SET cost = ?
-            WHERE miner_hotkey = ? AND execution_id = ?
+            WHERE hotkey_id = (SELECT id FROM hotkey WHERE hotkey = ?) AND execution_id = ?
         """
         values: tuple = (cost, miner_hotkey, execution_id)
         self.database_manager.query_and_commit_with_values(query, values)
@@ -70,17 +76,12 @@ class CostConfirmation:
     def _get_data_query(self) -> str:
         """Get the SQL query to retrieve rows that don't have cost data yet"""
         return """
-            SELECT miner_hotkey, execution_id FROM successful_job
-            WHERE cost IS NULL
+            SELECT h.hotkey, j.execution_id
+            FROM successful_job j JOIN hotkey h ON h.id = j.hotkey_id
+            WHERE j.cost IS NULL
         """
         
     def _clean_out_table(self) -> None:
-        """Delete all rows from the successful_job table where created_at is older than x"""
-        min_time: datetime = datetime.now(timezone.utc) - MAX_DATA_AGE
-        count_query: str = """SELECT COUNT(*) FROM successful_job WHERE created_at < ?"""
-        count_result: List[Tuple[int]] = self.database_manager.query_with_values(count_query, (min_time,))
-        count: int = count_result[0][0] if count_result else 0
-        bt.logging.info(f"🗑️ Cleaning out successful_job table. Found {count} rows older than {min_time}.")
-        query: str = """DELETE FROM successful_job WHERE created_at < ?"""
-        values: tuple = (min_time,)
-        self.database_manager.query_and_commit_with_values(query, values)
\ No newline at end of file
+        """Delete rows from the successful_job table where created_at is older than MAX_DATA_AGE, in small batches"""
+        deleted: int = self.retention.prune().get("successful_job", 0)
+        bt.logging.info(f"🗑️ Cleaned out successful_job table. Removed {deleted} rows older than {MAX_DATA_AGE.days} days.")
@@ -1,26 +1,29 @@
 import threading
 from typing import Any, Dict, List
 import bittensor as bt
-from datetime import datetime, timezone
 
+from pkg.database.async_database_manager import AsyncDatabaseManager
 from pkg.database.database_manager import DatabaseManager
 from qbittensor.protocol import COLLECT_SYNAPSE_ID, CircuitSynapse, ExecutionData
 from qbittensor.utils.telemetry.TelemetryService import TelemetryService
-from qbittensor.utils.timestamping import timestamp_str
+from qbittensor.utils.timestamping import timestamp_epoch
 from qbittensor.validator.compute_request.ComputeRequest import ComputeRequest
 from qbittensor.utils.request.RequestManager import RequestManager
 from qbittensor.validator.miner_manager.NextMiner import BasicMiner
 from qbittensor.validator.utils.execution_status import ExecutionStatus
 from qbittensor.validator.utils.execution_metrics import ExecutionMetrics
+from qbittensor.validator.utils.hotkey_dictionary import HotkeyDictionary
 
 
 class Scorer:
 
-    def __init__(self, database_manager: DatabaseManager, metagraph: bt.Metagraph, request_manager: RequestManager):
+    def __init__(self, database_manager: DatabaseManager, metagraph: bt.Metagraph, request_manager: RequestManager, async_db: AsyncDatabaseManager | None = None):
         self.database_manager: DatabaseManager = database_manager
+        self.async_db: AsyncDatabaseManager | None = async_db
         self.metagraph: bt.Metagraph = metagraph
         self.request_manager: RequestManager = request_manager
-        self._metrics: ExecutionMetrics = ExecutionMetrics(database_manager)
+        self.hotkeys: HotkeyDictionary = HotkeyDictionary(database_manager)
+        self._metrics: ExecutionMetrics = ExecutionMetrics(database_manager, async_db, self.hotkeys)
         self.telemetry_service = TelemetryService(request_manager)
 
     def process_miner_responses(self, responses: List[CircuitSynapse], next_miner: BasicMiner, original_compute_request_data: ComputeRequest):
@@ -106,9 +109,13 @@ class Scorer:
 
     def _store_successful_executions(self, execution_ids: List[str], miner_hotkey: str) -> None:
         """Store the execution id in the local db"""
-        now: datetime = datetime.now(timezone.utc)
-        query: str = """INSERT OR IGNORE INTO successful_job (miner_hotkey, execution_id, created_at) VALUES (?, ?, ?)"""
-        values: List[tuple] = [(miner_hotkey, execution_id, now) for execution_id in execution_ids]
+        now: int = timestamp_epoch()
+        hotkey_id: int = self.hotkeys.id_for(miner_hotkey)
+        query: str = """INSERT OR IGNORE INTO successful_job (hotkey_id, execution_id, created_at) VALUES (?, ?, ?)"""
+        values: List[tuple] = [(hotkey_id, execution_id, now) for execution_id in execution_ids]
+        if self.async_db is not None:
+            self.async_db.submit_write_many(query, values)
+            return
         self.database_manager.query_and_commit_many(query, values)
 
     def _patch_job_rejected(self, execution_id: str, message: str, execution_data: object | None = None) -> None:
@@ -170,7 +177,7 @@ class Scorer:
             bt.logging.debug(f"| {current_thread} | ❌ Error processing last_circuit timestamp from miner '{miner_hotkey}': {e}")
 
     def _record_execution(self, miner_hotkey: str, execution_id: str, shots: int | None = None) -> None:
-        self._metrics.insert_job_sent(miner_hotkey, execution_id, shots, timestamp_str())
+        self._metrics.insert_job_sent(miner_hotkey, execution_id, shots, timestamp_epoch())
 
     def _record_time_received(self, miner_hotkey: str, execution_id: str) -> None:
-        self._metrics.update_time_received(miner_hotkey, execution_id, timestamp_str())
+        self._metrics.update_time_received(miner_hotkey, execution_id, timestamp_epoch())
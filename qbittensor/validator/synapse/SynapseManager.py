@@ -3,6 +3,7 @@ import requests
 import bittensor as bt
 
 from qbittensor.protocol import COLLECT_SYNAPSE_ID, CircuitSynapse
+from pkg.database.async_database_manager import AsyncDatabaseManager
 from pkg.database.database_manager import DatabaseManager
 from qbittensor.utils.telemetry.TelemetryService import TelemetryService
 from qbittensor.validator.compute_request.ComputeRequest import ComputeRequest
@@ -14,8 +15,9 @@ START_OF_TIME = "0000-00-00 00:00:00"
 
 class SynapseManager:
 
-    def __init__(self, database_manager: DatabaseManager, request_manager: RequestManager):
+    def __init__(self, database_manager: DatabaseManager, request_manager: RequestManager, async_db: AsyncDatabaseManager | None = None):
         self.database_manager = database_manager
+        self.async_db = async_db
         self.request_manager = request_manager
         self.telemetry_service = TelemetryService(request_manager)
         
@@ -77,8 +79,12 @@ class SynapseManager:
             WHERE miner_hotkey=?
         """
         values = (miner_hotkey,)
-        with self.database_manager.lock:
-            result = self.database_manager.query_one_with_values(query, values)
+        if self.async_db is not None:
+            # Runs behind any last_circuit write still queued on the database thread
+            result = self.async_db.submit_read(self.database_manager.query_one_with_values, query, values).result()
+        else:
+            with self.database_manager.read_lock:
+                result = self.database_manager.query_one_with_values(query, values)
         if result is None:
             return START_OF_TIME
         return result[0]
@@ -1,47 +1,54 @@
 from typing import Optional
 import bittensor as bt
 
+from pkg.database.async_database_manager import AsyncDatabaseManager
+from qbittensor.validator.utils.hotkey_dictionary import HotkeyDictionary
+
 
 class ExecutionMetrics:
 
-    def __init__(self, db):
+    def __init__(self, db, async_db: Optional[AsyncDatabaseManager] = None, hotkeys: Optional[HotkeyDictionary] = None):
         self.db = db
+        # When set, writes are queued on the database thread instead of blocking the caller
+        self.async_db = async_db
+        self.hotkeys = hotkeys if hotkeys is not None else HotkeyDictionary(db)
+
+    def _commit(self, sql: str, values: tuple) -> None:
+        if self.async_db is not None:
+            self.async_db.submit_write(sql, values)
+            return
+        with self.db.lock:
+            self.db.query_and_commit_with_values(sql, values)
 
     def insert_job_sent(
-        self, miner_hotkey: str, execution_id: str, shots: Optional[int], time_sent: str
+        self, miner_hotkey: str, execution_id: str, shots: Optional[int], time_sent: int
     ) -> None:
         """
         Insert a 'execution was sent' record. If it already exists, ignore.
-        time_sent is NOT NULL in schema.
+        time_sent (epoch seconds) is NOT NULL in schema.
         """
         sql = """
           INSERT OR IGNORE INTO execution_metrics
-              (miner_hotkey, execution_id, shots, time_sent)
+              (hotkey_id, execution_id, shots, time_sent)
           VALUES (?, ?, ?, ?)
         """
-        with self.db.lock:
-            self.db.query_and_commit_with_values(
-                sql, (miner_hotkey, execution_id, shots, time_sent)
-            )
+        self._commit(sql, (self.hotkeys.id_for(miner_hotkey), execution_id, shots, time_sent))
         bt.logging.debug(
             f"[execution_metrics] insert_job_sent miner={miner_hotkey} execution_id={execution_id} shots={shots}"
         )
 
     def update_time_received(
-        self, miner_hotkey: str, execution_id: str, time_received: str
+        self, miner_hotkey: str, execution_id: str, time_received: int
     ) -> None:
         """
-        Update when we first saw a completed execution from a miner
+        Update when we first saw a completed execution from a miner (epoch seconds)
         """
         sql = """
           UPDATE execution_metrics
              SET time_received = COALESCE(time_received, ?)
-           WHERE miner_hotkey = ? AND execution_id = ?
+           WHERE hotkey_id = ? AND execution_id = ?
         """
-        with self.db.lock:
-            self.db.query_and_commit_with_values(
-                sql, (time_received, miner_hotkey, execution_id)
-            )
+        self._commit(sql, (time_received, self.hotkeys.id_for(miner_hotkey), execution_id))
         bt.logging.debug(
             f"[execution_metrics] update_time_received miner={miner_hotkey} execution_id={execution_id} ts={time_received}"
         )
@@ -54,8 +61,7 @@ class ExecutionMetrics:
           INSERT OR REPLACE INTO last_circuit (miner_hotkey, timestamp)
           VALUES (?, ?)
         """
-        with self.db.lock:
-            self.db.query_and_commit_with_values(sql, (miner_hotkey, ts))
+        self._commit(sql, (miner_hotkey, ts))
         bt.logging.trace(
             f"[execution_metrics] upsert_last_circuit miner={miner_hotkey} ts={ts}"
         )
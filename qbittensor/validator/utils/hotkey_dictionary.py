@@ -0,0 +1,60 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+from pkg.database.database_manager import DatabaseManager
+
+
+class HotkeyDictionary:
+    """
+    Interns SS58 hotkeys as small integer ids in the `hotkey` table.
+
+    High-volume validator tables store the integer id instead of the 48-character hotkey, which keeps their
+    rows and indexes small. Ids are never reassigned or deleted, so they are cached for the life of the process.
+    """
+
+    def __init__(self, database_manager: DatabaseManager):
+        self.database_manager = database_manager
+        self._ids: Dict[str, int] = {}
+        self._hotkeys: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def id_for(self, hotkey: str) -> int:
+        """Return the id of a hotkey, interning it on first use"""
+        hotkey_id = self._ids.get(hotkey)
+        if hotkey_id is not None:
+            return hotkey_id
+        return self.ids_for([hotkey])[hotkey]
+
+    def ids_for(self, hotkeys: Iterable[str]) -> Dict[str, int]:
+        """Return the ids of several hotkeys, interning any that are new in one transaction"""
+        hotkeys = list(dict.fromkeys(hotkeys))
+        missing = [hotkey for hotkey in hotkeys if hotkey not in self._ids]
+        if missing:
+            with self._lock, self.database_manager.lock:
+                self.database_manager.query_and_commit_many(
+                    "INSERT OR IGNORE INTO hotkey (hotkey) VALUES (?)", [(hotkey,) for hotkey in missing]
+                )
+                placeholders = ", ".join("?" for _ in missing)
+                rows = self.database_manager.query_with_values(
+                    f"SELECT id, hotkey FROM hotkey WHERE hotkey IN ({placeholders})", tuple(missing)
+                )
+                for hotkey_id, hotkey in rows:
+                    self._remember(hotkey_id, hotkey)
+        return {hotkey: self._ids[hotkey] for hotkey in hotkeys}
+
+    def hotkey_for(self, hotkey_id: int) -> Optional[str]:
+        """Return the hotkey behind an id, or None if the id is unknown"""
+        hotkey = self._hotkeys.get(hotkey_id)
+        if hotkey is not None:
+            return hotkey
+        with self.database_manager.read_lock:
+            row = self.database_manager.query_one_with_values("SELECT hotkey FROM hotkey WHERE id = ?", (hotkey_id,))
+        if row is None:
+            return None
+        with self._lock:
+            self._remember(hotkey_id, row[0])
+        return row[0]
+
+    def _remember(self, hotkey_id: int, hotkey: str) -> None:
+        self._ids[hotkey] = hotkey_id
+        self._hotkeys[hotkey_id] = hotkey
@@ -1,20 +1,107 @@
 from pkg.database.database_manager import DatabaseManager
-from pkg.database.table_initializer import TableInitializer
+from pkg.database.table_initializer import Migration, TableInitializer
 
 
 class ValidatorTableInitializer(TableInitializer):
+    schema_component = "validator"
+
     def __init__(self, database_manager: DatabaseManager):
         super().__init__(database_manager)
 
     def create_tables(self) -> None:
-        """Create all validator tables"""
+        """Create all validator tables and bring them up to the latest schema version"""
         self._create_last_circuit_table()
         self._create_active_miners_table()
         self._create_executions_table()
         self._create_successful_jobs_table()
-        
+        self.migrate()
+
+    def migrations(self) -> list[Migration]:
+        """Validator schema migrations, oldest first"""
+        return [
+            Migration(
+                version=1,
+                description="Index successful_job for the weight lookback and cost confirmation",
+                statements=[
+                    # CostConfirmation._clean_out_table: WHERE created_at < ?
+                    "CREATE INDEX IF NOT EXISTS idx_successful_job_created_at ON successful_job(created_at)",
+                    # WeightSetter._get_execution_costs_per_hotkey: created_at range + GROUP BY miner_hotkey, answered from the index alone
+                    "CREATE INDEX IF NOT EXISTS idx_successful_job_hotkey_created_cost ON successful_job(miner_hotkey, created_at, cost)",
+                    # CostConfirmation._get_rows: WHERE cost IS NULL
+                    "CREATE INDEX IF NOT EXISTS idx_successful_job_cost_null ON successful_job(miner_hotkey, execution_id) WHERE cost IS NULL",
+                ],
+            ),
+            Migration(
+                version=2,
+                description="Switch to incremental auto-vacuum so retention pruning can release freed pages",
+                statements=[
+                    # Changing auto_vacuum on an existing database only takes effect after a full VACUUM (one-off)
+                    "PRAGMA auto_vacuum = INCREMENTAL",
+                    "VACUUM",
+                ],
+            ),
+            Migration(
+                version=3,
+                description="Key successful_job and execution_metrics by interned hotkey ids with epoch timestamps",
+                statements=[
+                    # Hotkey dictionary: the high-volume tables store the small integer id instead of the SS58 string
+                    """
+                        CREATE TABLE IF NOT EXISTS hotkey (
+                            id INTEGER PRIMARY KEY,
+                            hotkey TEXT NOT NULL UNIQUE
+                        )
+                    """,
+                    "INSERT OR IGNORE INTO hotkey (hotkey) SELECT DISTINCT miner_hotkey FROM successful_job",
+                    "INSERT OR IGNORE INTO hotkey (hotkey) SELECT DISTINCT miner_hotkey FROM execution_metrics WHERE miner_hotkey IS NOT NULL",
+                    # successful_job: created_at becomes integer seconds since the epoch
+                    """
+                        CREATE TABLE IF NOT EXISTS successful_job_v3 (
+                            hotkey_id INTEGER NOT NULL REFERENCES hotkey(id),
+                            execution_id TEXT NOT NULL,
+                            created_at INTEGER NOT NULL,
+                            cost INTEGER,
+                            PRIMARY KEY (hotkey_id, execution_id)
+                        )
+                    """,
+                    """
+                        INSERT OR IGNORE INTO successful_job_v3 (hotkey_id, execution_id, created_at, cost)
+                        SELECT h.id, j.execution_id, CAST(strftime('%s', j.created_at) AS INTEGER), j.cost
+                        FROM successful_job j JOIN hotkey h ON h.hotkey = j.miner_hotkey
+                    """,
+                    "DROP TABLE successful_job",
+                    "ALTER TABLE successful_job_v3 RENAME TO successful_job",
+                    # CostConfirmation retention: WHERE created_at < ?
+                    "CREATE INDEX IF NOT EXISTS idx_successful_job_created_at ON successful_job(created_at)",
+                    # WeightSetter._get_execution_costs_per_hotkey: created_at range + GROUP BY hotkey_id, answered from the index alone
+                    "CREATE INDEX IF NOT EXISTS idx_successful_job_hotkey_created_cost ON successful_job(hotkey_id, created_at, cost)",
+                    # CostConfirmation._get_rows: WHERE cost IS NULL
+                    "CREATE INDEX IF NOT EXISTS idx_successful_job_cost_null ON successful_job(hotkey_id, execution_id) WHERE cost IS NULL",
+                    # execution_metrics: time_sent / time_received become integer seconds since the epoch
+                    """
+                        CREATE TABLE IF NOT EXISTS execution_metrics_v3 (
+                            hotkey_id INTEGER NOT NULL REFERENCES hotkey(id),
+                            execution_id TEXT NOT NULL,
+                            shots INTEGER,
+                            time_sent INTEGER NOT NULL,
+                            time_received INTEGER,
+                            PRIMARY KEY (hotkey_id, execution_id)
+                        )
+                    """,
+                    """
+                        INSERT OR IGNORE INTO execution_metrics_v3 (hotkey_id, execution_id, shots, time_sent, time_received)
+                        SELECT h.id, m.execution_id, m.shots, CAST(strftime('%s', m.time_sent) AS INTEGER),
+                               CAST(strftime('%s', m.time_received) AS INTEGER)
+                        FROM execution_metrics m JOIN hotkey h ON h.hotkey = m.miner_hotkey
+                        WHERE m.execution_id IS NOT NULL
+                    """,
+                    "DROP TABLE execution_metrics",
+                    "ALTER TABLE execution_metrics_v3 RENAME TO execution_metrics",
+                ],
+            ),
+        ]
+
     def _create_successful_jobs_table(self) -> None:
-        """Create table for counting successful jobs"""
+        """Create table for counting successful jobs (original layout; migration 3 re-keys it by hotkey id)"""
         self.database_manager.query_and_commit('''
             CREATE TABLE IF NOT EXISTS successful_job (
                 miner_hotkey TEXT NOT NULL,
@@ -45,7 +132,7 @@ class ValidatorTableInitializer(TableInitializer):
         ''')
 
     def _create_executions_table(self) -> None:
-        """Per-miner per-execution data"""
+        """Per-miner per-execution data (original layout; migration 3 re-keys it by hotkey id)"""
         self.database_manager.query_and_commit('''
             CREATE TABLE IF NOT EXISTS execution_metrics (
                 miner_hotkey TEXT,
@@ -6,6 +6,7 @@ from qbittensor.validator.reward.burn_uid import get_burn_uid
 from qbittensor.utils.telemetry.TelemetryService import TelemetryService
 from pkg.database.database_manager import DatabaseManager
 from qbittensor.utils.Timer import Timer
+from qbittensor.utils.timestamping import to_epoch
 from qbittensor.utils.request.RequestManager import RequestManager
 from qbittensor.validator.weights.WeightPublisher import WeightPublisher
 
@@ -59,14 +60,20 @@ class WeightSetter:
         
     def _get_execution_costs_per_hotkey(self) -> List[tuple]:
         min_time: datetime = datetime.now(timezone.utc) - LOOKBACK_PERIOD
+        # Aggregate on the integer hotkey id (covered by idx_successful_job_hotkey_created_cost) and only
+        # resolve the hotkey strings for the grouped rows
         query: str = """
-            SELECT miner_hotkey, SUM(cost) as total_cost
-            FROM successful_job 
-            WHERE created_at > ? 
-            AND cost IS NOT NULL 
-            GROUP BY miner_hotkey
+            SELECT h.hotkey, totals.total_cost
+            FROM (
+                SELECT hotkey_id, SUM(cost) as total_cost
+                FROM successful_job
+                WHERE created_at > ?
+                AND cost IS NOT NULL
+                GROUP BY hotkey_id
+            ) totals
+            JOIN hotkey h ON h.id = totals.hotkey_id
         """
-        values: tuple = (min_time,)
+        values: tuple = (to_epoch(min_time),)
         results: list = self.database_manager.query_with_values(query, values)
         if not results:
             bt.logging.info("Failed to find miner hotkey / completed job counts")
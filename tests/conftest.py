@@ -67,6 +67,17 @@ def http_mock(monkeypatch):
             self.status_code = status_code
             self.text = text
             self._json = json_body
+            self.headers = {}
+            self.encoding = "utf-8"
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def iter_content(self, chunk_size=1):
+            yield self.text.encode()
 
         def json(self):
             if self._json is None:
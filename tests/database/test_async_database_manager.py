@@ -0,0 +1,112 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from pkg.database.async_database_manager import AsyncDatabaseManager
+from pkg.database.database_manager import DatabaseManager
+
+
+@pytest.fixture
+def adb(temp_db):
+    dbm = DatabaseManager("async_test", pooled=True)
+    dbm.query_and_commit("CREATE TABLE t (k TEXT PRIMARY KEY, v INTEGER)")
+    manager = AsyncDatabaseManager(dbm)
+    manager.start()
+    try:
+        yield manager
+    finally:
+        manager.close()
+        dbm.close()
+
+
+def _block(adb):
+    """Occupy the database thread until the returned event is set"""
+    release = threading.Event()
+    started = threading.Event()
+
+    def wait():
+        started.set()
+        release.wait(5)
+
+    adb.submit_read(wait)
+    started.wait(5)
+    return release
+
+
+def test_coroutines_read_their_own_writes(adb):
+    async def scenario():
+        await adb.query_and_commit_with_values("INSERT INTO t VALUES (?, ?)", ("a", 1))
+        await adb.query_and_commit_many("INSERT INTO t VALUES (?, ?)", [("b", 2), ("c", 3)])
+        assert await adb.row_exists("t", "k=?", ("b",))
+        assert await adb.query_one_with_values("SELECT v FROM t WHERE k=?", ("c",)) == (3,)
+        return await adb.query("SELECT k FROM t ORDER BY k")
+
+    assert asyncio.run(scenario()) == [("a",), ("b",), ("c",)]
+
+
+def test_concurrent_coroutines_share_the_loop(adb):
+    async def scenario():
+        await asyncio.gather(*(adb.query_and_commit_with_values("INSERT INTO t VALUES (?, ?)", (f"k{i}", i)) for i in range(50)))
+        return await adb.query("SELECT COUNT(*) FROM t")
+
+    assert asyncio.run(scenario()) == [(50,)]
+
+
+def test_queued_writes_commit_in_one_transaction(adb):
+    release = _block(adb)
+    futures = [adb.submit_write("INSERT INTO t VALUES (?, ?)", (f"k{i}", i)) for i in range(20)]
+    read = adb.submit_read(adb.database_manager.query, "SELECT COUNT(*) FROM t")
+    release.set()
+
+    assert read.result(5) == [(20,)]
+    assert all(f.done() and f.exception() is None for f in futures)
+    assert adb.batches_committed == 1
+    assert adb.writes_committed == 20
+
+
+def test_failed_write_does_not_sink_its_batch(adb):
+    release = _block(adb)
+    good = adb.submit_write("INSERT INTO t VALUES (?, ?)", ("a", 1))
+    bad = adb.submit_write("INSERT INTO t VALUES (?, ?)", ("a", 2))  # Primary key conflict
+    also_good = adb.submit_write("INSERT INTO t VALUES (?, ?)", ("b", 3))
+    release.set()
+    adb.flush(5)
+
+    assert good.exception() is None and also_good.exception() is None
+    assert isinstance(bad.exception(), sqlite3.IntegrityError)
+    assert adb.database_manager.query("SELECT k, v FROM t ORDER BY k") == [("a", 1), ("b", 3)]
+
+
+def test_cancelled_operations_are_skipped(adb):
+    async def scenario():
+        release = _block(adb)
+        task = asyncio.ensure_future(adb.query_and_commit_with_values("INSERT INTO t VALUES (?, ?)", ("x", 1)))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+        return await adb.query("SELECT COUNT(*) FROM t")
+
+    assert asyncio.run(scenario()) == [(0,)]
+    assert adb.cancelled == 1
+
+
+def test_read_errors_reach_the_caller(adb):
+    async def scenario():
+        await adb.query("SELECT * FROM missing_table")
+
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(scenario())
+
+
+def test_close_drains_queued_writes(temp_db):
+    dbm = DatabaseManager("async_close")
+    dbm.query_and_commit("CREATE TABLE t (k TEXT PRIMARY KEY, v INTEGER)")
+    adb = AsyncDatabaseManager(dbm)
+    for i in range(10):
+        adb.submit_write("INSERT INTO t VALUES (?, ?)", (f"k{i}", i))
+    adb.close()
+    assert dbm.get_size_of_table("t") == 10
@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+
+from pkg.database.database_manager import DatabaseManager
+
+
+@pytest.fixture(params=[False, True], ids=["per_call", "pooled"])
+def dbm(temp_db, request):
+    db_manager = DatabaseManager("db_manager_test", pooled=request.param)
+    db_manager.query_and_commit("CREATE TABLE IF NOT EXISTS kv (k TEXT PRIMARY KEY, v INTEGER)")
+    try:
+        yield db_manager
+    finally:
+        db_manager.close()
+
+
+def test_query_api_round_trip(dbm):
+    dbm.query_and_commit_with_values("INSERT INTO kv (k, v) VALUES (?, ?)", ("a", 1))
+    dbm.query_and_commit_many("INSERT INTO kv (k, v) VALUES (?, ?)", [("b", 2), ("c", 3)])
+    assert dbm.get_size_of_table("kv") == 3
+    assert dbm.row_exists("kv", "k=?", ("b",))
+    assert not dbm.row_exists("kv", "k=?", ("z",))
+    assert dbm.query_one_with_values("SELECT v FROM kv WHERE k=?", ("c",)) == (3,)
+    assert dbm.query_with_values("SELECT k FROM kv WHERE v > ? ORDER BY k", (1,)) == [("b",), ("c",)]
+    assert dbm.table_exists("kv")
+
+
+def test_failed_write_does_not_leave_open_transaction(dbm):
+    dbm.query_and_commit_with_values("INSERT INTO kv (k, v) VALUES (?, ?)", ("a", 1))
+    with pytest.raises(Exception):
+        dbm.query_and_commit_many("INSERT INTO kv (k, v) VALUES (?, ?)", [("b", 2), ("a", 3)])
+    # The partial batch must not leak into later commits
+    dbm.query_and_commit_with_values("INSERT INTO kv (k, v) VALUES (?, ?)", ("d", 4))
+    assert dbm.query("SELECT k FROM kv ORDER BY k") == [("a",), ("d",)]
+
+
+def test_pooled_connections_are_per_thread_and_wal(temp_db):
+    dbm = DatabaseManager("db_manager_pool_test", pooled=True)
+    try:
+        assert dbm.query("PRAGMA journal_mode")[0][0] == "wal"
+        assert dbm.query("PRAGMA synchronous")[0][0] == 1  # NORMAL
+        first = dbm._get_db_connection()
+        assert dbm._get_db_connection() is first
+
+        others = []
+        thread = threading.Thread(target=lambda: others.append(dbm._get_db_connection()))
+        thread.start()
+        thread.join()
+        assert others[0] is not first
+        assert dbm._pool.size() == 2
+    finally:
+        dbm.close()
+    assert dbm._pool.size() == 0
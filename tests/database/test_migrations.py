@@ -0,0 +1,96 @@
+import sqlite3
+
+from pkg.database.database_manager import DatabaseManager
+from pkg.database.table_initializer import Migration, TableInitializer
+from qbittensor.miner.miner_table_initializer import MinerTableInitializer
+from qbittensor.validator.vali_table_initializer import ValidatorTableInitializer
+
+
+class _Initializer(TableInitializer):
+    schema_component = "test"
+
+    def __init__(self, database_manager, migrations):
+        super().__init__(database_manager)
+        self._migrations = migrations
+
+    def create_tables(self) -> None:
+        self.database_manager.query_and_commit("CREATE TABLE IF NOT EXISTS t (a INTEGER)")
+        self.migrate()
+
+    def migrations(self):
+        return self._migrations
+
+
+def _plan(dbm, query, values=()):
+    return " ".join(str(row[-1]) for row in dbm.query_with_values(f"EXPLAIN QUERY PLAN {query}", values))
+
+
+def test_migrations_apply_in_order_once(temp_db):
+    dbm = DatabaseManager("migrations_test")
+    migrations = [
+        Migration(version=2, description="add c", statements=["ALTER TABLE t ADD COLUMN c INTEGER"]),
+        Migration(version=1, description="add b", statements=["ALTER TABLE t ADD COLUMN b INTEGER"]),
+    ]
+    _Initializer(dbm, migrations).create_tables()
+    columns = [row[1] for row in dbm.query("PRAGMA table_info(t)")]
+    assert columns == ["a", "b", "c"]
+
+    # Re-running is a no-op: ALTER TABLE would fail if re-applied
+    initializer = _Initializer(dbm, migrations)
+    initializer.create_tables()
+    assert initializer.get_schema_version() == 2
+
+
+def test_existing_miner_database_upgrades_in_place(temp_db):
+    dbm = DatabaseManager("miner_legacy")
+    # Simulate a database created before migrations existed
+    connection = sqlite3.connect(dbm.db_path)
+    connection.execute("CREATE TABLE executions (execution_id TEXT PRIMARY KEY, status TEXT, timestamp DATETIME, completed_at DATETIME)")
+    connection.execute("INSERT INTO executions VALUES ('e1', 'Completed', '2025-01-01 00:00:00', NULL)")
+    connection.commit()
+    connection.close()
+
+    initializer = MinerTableInitializer(dbm)
+    initializer.create_tables()
+    assert initializer.get_schema_version() == 2
+    assert dbm.get_size_of_table("executions") == 1
+    assert dbm.query("PRAGMA auto_vacuum")[0][0] == 2  # INCREMENTAL
+
+    plan = _plan(dbm, "SELECT execution_id FROM executions WHERE timestamp > ? AND status != 'Running'", ("2024-01-01",))
+    assert "idx_executions_timestamp_status" in plan
+    plan = _plan(dbm, "SELECT COUNT(1) FROM executions WHERE status = 'Pending'")
+    assert "idx_executions_status" in plan
+
+
+def test_validator_indexes_cover_hot_queries(temp_db):
+    dbm = DatabaseManager("validator_migrations")
+    ValidatorTableInitializer(dbm).create_tables()
+    plan = _plan(dbm, "SELECT hotkey_id, SUM(cost) FROM successful_job WHERE created_at > ? AND cost IS NOT NULL GROUP BY hotkey_id", (1704067200,))
+    assert "COVERING INDEX idx_successful_job_hotkey_created_cost" in plan
+    plan = _plan(dbm, "DELETE FROM successful_job WHERE created_at < ?", (1704067200,))
+    assert "idx_successful_job_created_at" in plan
+    plan = _plan(dbm, "SELECT hotkey_id, execution_id FROM successful_job WHERE cost IS NULL")
+    assert "idx_successful_job_cost_null" in plan
+
+
+def test_validator_tables_rekeyed_by_hotkey_id(temp_db):
+    dbm = DatabaseManager("validator_legacy")
+    # A database written before the hotkey dictionary existed
+    connection = sqlite3.connect(dbm.db_path)
+    connection.execute("CREATE TABLE successful_job (miner_hotkey TEXT NOT NULL, execution_id TEXT NOT NULL, created_at DATETIME NOT NULL, cost INTEGER, PRIMARY KEY (miner_hotkey, execution_id))")
+    connection.execute("CREATE TABLE execution_metrics (miner_hotkey TEXT, execution_id TEXT, shots INTEGER, time_sent DATETIME NOT NULL, time_received DATETIME, PRIMARY KEY (miner_hotkey, execution_id))")
+    connection.execute("INSERT INTO successful_job VALUES ('hk_a', 'e1', '2025-01-01 00:00:00.123456+00:00', 7)")
+    connection.execute("INSERT INTO successful_job VALUES ('hk_b', 'e2', '2025-01-02 00:00:00+00:00', NULL)")
+    connection.execute("INSERT INTO execution_metrics VALUES ('hk_b', 'e2', 100, '2025-01-02 00:00:00', NULL)")
+    connection.commit()
+    connection.close()
+
+    initializer = ValidatorTableInitializer(dbm)
+    initializer.create_tables()
+    assert initializer.get_schema_version() == 3
+    assert dbm.query(
+        "SELECT h.hotkey, j.execution_id, j.created_at, j.cost FROM successful_job j JOIN hotkey h ON h.id = j.hotkey_id ORDER BY j.execution_id"
+    ) == [("hk_a", "e1", 1735689600, 7), ("hk_b", "e2", 1735776000, None)]
+    assert dbm.query(
+        "SELECT h.hotkey, m.shots, m.time_sent, m.time_received FROM execution_metrics m JOIN hotkey h ON h.id = m.hotkey_id"
+    ) == [("hk_b", 100, 1735776000, None)]
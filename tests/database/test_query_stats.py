@@ -0,0 +1,88 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from pkg.database.database_manager import DatabaseManager
+from pkg.database.query_stats import QueryStats, normalize_statement
+
+
+def test_normalize_statement_groups_by_shape():
+    assert normalize_statement("SELECT *  FROM t\n WHERE a = 42 AND b = 'x''y'") == "SELECT * FROM t WHERE a = ? AND b = ?"
+    assert normalize_statement("DELETE FROM t WHERE id IN (?, ?, ?)") == "DELETE FROM t WHERE id IN (...)"
+    assert normalize_statement("SELECT col1 FROM t2 WHERE x = ?") == "SELECT col1 FROM t2 WHERE x = ?"
+
+
+def test_histogram_quantiles():
+    stats = QueryStats()
+    for _ in range(90):
+        stats.record("SELECT 1", 0.0002)
+    for _ in range(10):
+        stats.record("SELECT 1", 0.2)
+    snapshot = stats.snapshot()["SELECT ?"]
+    assert snapshot["calls"] == 100
+    assert snapshot["p50_s"] == 0.0005
+    assert snapshot["p95_s"] == 0.5
+    assert sum(snapshot["histogram"]) == 100
+
+
+def test_slow_queries_are_logged():
+    stats = QueryStats(slow_query_s=0.1)
+    with patch("pkg.database.query_stats.bt.logging") as mock_logging:
+        stats.record("SELECT fast", 0.01)
+        stats.record("SELECT slow", 0.05, lock_wait_s=0.06)
+    assert stats.slow_queries == 1
+    assert mock_logging.warning.call_count == 1
+
+
+def test_disabled_by_default(temp_db, monkeypatch):
+    monkeypatch.delenv("DB_QUERY_STATS", raising=False)
+    dbm = DatabaseManager("stats_off")
+    dbm.query("SELECT 1")
+    assert dbm.query_stats() == {}
+
+
+@pytest.mark.parametrize("pooled", [False, True])
+def test_manager_records_calls_rows_and_errors(temp_db, pooled):
+    dbm = DatabaseManager(f"stats_{pooled}", pooled=pooled, query_stats=QueryStats())
+    dbm.query_and_commit("CREATE TABLE t (k TEXT PRIMARY KEY, v INTEGER)")
+    dbm.query_and_commit_many("INSERT INTO t VALUES (?, ?)", [("a", 1), ("b", 2), ("c", 3)])
+    for k in ("a", "b"):
+        dbm.query_one_with_values("SELECT v FROM t WHERE k = ?", (k,))
+    dbm.query_with_values("SELECT k FROM t WHERE v > ?", (0,))
+    dbm.execute_batch_and_commit([("UPDATE t SET v = v + 1 WHERE k = ?", ("a",)), ("DELETE FROM t WHERE k = ?", ("c",))])
+    with pytest.raises(Exception):
+        dbm.query("SELECT * FROM missing")
+
+    stats = dbm.query_stats()
+    assert stats["INSERT INTO t VALUES (...)"]["rows"] == 3
+    assert stats["SELECT v FROM t WHERE k = ?"]["calls"] == 2
+    assert stats["SELECT v FROM t WHERE k = ?"]["rows"] == 2
+    assert stats["SELECT k FROM t WHERE v > ?"]["rows"] == 3
+    assert stats["DELETE FROM t WHERE k = ?"]["rows"] == 1
+    assert stats["SELECT * FROM missing"]["errors"] == 1
+    dbm.close()
+
+
+def test_lock_wait_is_charged_to_the_next_statement(temp_db):
+    dbm = DatabaseManager("stats_lock", query_stats=QueryStats())
+    dbm.query_and_commit("CREATE TABLE t (v INTEGER)")
+    holding = threading.Event()
+
+    def hold_lock():
+        with dbm.lock:
+            holding.set()
+            time.sleep(0.05)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    holding.wait(1)
+    with dbm.lock:
+        dbm.query_and_commit_with_values("INSERT INTO t VALUES (?)", (1,))
+        dbm.query_and_commit_with_values("INSERT INTO t VALUES (?)", (2,))
+    holder.join()
+
+    insert = dbm.query_stats()["INSERT INTO t VALUES (?)"]
+    assert insert["calls"] == 2
+    assert insert["lock_wait_s"] >= 0.03
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+
+from pkg.database.database_manager import DatabaseManager
+from pkg.database.retention import RetentionPolicy, RetentionPruner
+from qbittensor.miner.miner_table_initializer import MinerTableInitializer
+from qbittensor.utils.timestamping import TIMESTAMP_FORMAT
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def _policy(**overrides):
+    settings = dict(
+        table="executions",
+        column="timestamp",
+        max_age=timedelta(days=14),
+        batch_size=10,
+        format_cutoff=lambda cutoff: cutoff.strftime(TIMESTAMP_FORMAT),
+    )
+    settings.update(overrides)
+    return RetentionPolicy(**settings)
+
+
+def _seed(dbm, old, recent):
+    rows = []
+    for i in range(old):
+        rows.append((f"old-{i}", "Completed", (NOW - timedelta(days=20, seconds=i)).strftime(TIMESTAMP_FORMAT)))
+    for i in range(recent):
+        rows.append((f"new-{i}", "Completed", (NOW - timedelta(days=1, seconds=i)).strftime(TIMESTAMP_FORMAT)))
+    dbm.query_and_commit_many("INSERT INTO executions (execution_id, status, timestamp) VALUES (?, ?, ?)", rows)
+
+
+def test_prune_deletes_only_expired_rows_in_batches(db_manager):
+    _seed(db_manager, old=35, recent=5)
+    pruner = RetentionPruner(db_manager, [_policy()])
+
+    assert pruner.prune(NOW) == {"executions": 35}
+    remaining = [row[0] for row in db_manager.query("SELECT execution_id FROM executions")]
+    assert sorted(remaining) == [f"new-{i}" for i in range(5)]
+    assert db_manager.lock_stats()["write"]["acquisitions"] >= 4  # one short transaction per batch
+
+
+def test_prune_pass_is_bounded_by_max_batches(db_manager):
+    _seed(db_manager, old=35, recent=0)
+    pruner = RetentionPruner(db_manager, [_policy(max_batches=2)])
+
+    assert pruner.prune(NOW) == {"executions": 20}
+    assert pruner.prune(NOW) == {"executions": 15}
+    assert db_manager.get_size_of_table("executions") == 0
+
+
+def test_prune_skips_failing_policy(db_manager):
+    _seed(db_manager, old=3, recent=0)
+    pruner = RetentionPruner(db_manager, [_policy(table="missing_table"), _policy()])
+
+    assert pruner.prune(NOW) == {"missing_table": 0, "executions": 3}
+
+
+def test_prune_releases_free_pages_with_incremental_vacuum(db_manager):
+    rows = [(f"old-{i}", "Completed", "2000-01-01 00:00:00", "x" * 500) for i in range(500)]
+    db_manager.query_and_commit_many(
+        "INSERT INTO executions (execution_id, status, timestamp, metadata_json) VALUES (?, ?, ?, ?)", rows
+    )
+    pages_before = db_manager.query("PRAGMA page_count")[0][0]
+    RetentionPruner(db_manager, [_policy(batch_size=100)], vacuum_pages=100000).prune(NOW)
+
+    assert db_manager.query("PRAGMA freelist_count")[0][0] == 0
+    assert db_manager.query("PRAGMA page_count")[0][0] < pages_before
+
+
+def test_datetime_cutoff_matches_validator_created_at(temp_db):
+    dbm = DatabaseManager("retention_validator")
+    dbm.query_and_commit("CREATE TABLE successful_job (miner_hotkey TEXT, execution_id TEXT, created_at DATETIME)")
+    dbm.query_and_commit_many(
+        "INSERT INTO successful_job VALUES (?, ?, ?)",
+        [("hk", "old", NOW - timedelta(days=31)), ("hk", "new", NOW - timedelta(days=29))],
+    )
+    policy = RetentionPolicy(table="successful_job", column="created_at", max_age=timedelta(days=30))
+
+    assert RetentionPruner(dbm, [policy]).prune(NOW) == {"successful_job": 1}
+    assert dbm.query("SELECT execution_id FROM successful_job") == [("new",)]
+
+
+def test_prune_works_with_pooled_connections(temp_db):
+    dbm = DatabaseManager("retention_pooled", pooled=True)
+    MinerTableInitializer(dbm).create_tables()
+    _seed(dbm, old=25, recent=2)
+
+    assert RetentionPruner(dbm, [_policy()]).prune(NOW) == {"executions": 25}
+    assert dbm.get_size_of_table("executions") == 2
+    dbm.close()
@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+from pkg.database.database_manager import DatabaseManager
+from pkg.database.rw_lock import ReadWriteLock
+
+
+def _hold(lock_side, entered: threading.Event, release: threading.Event):
+    with lock_side:
+        entered.set()
+        release.wait(2.0)
+
+
+def test_readers_share_the_lock():
+    rw = ReadWriteLock()
+    entered, release = threading.Event(), threading.Event()
+    holder = threading.Thread(target=_hold, args=(rw.read_lock, entered, release))
+    holder.start()
+    entered.wait(1.0)
+
+    got_it = threading.Event()
+    other = threading.Thread(target=lambda: (rw.acquire_read(), got_it.set(), rw.release_read()))
+    other.start()
+    assert got_it.wait(1.0)
+    release.set()
+    holder.join()
+    other.join()
+    assert rw.stats()["read"]["contended"] == 0
+
+
+def test_writer_excludes_readers_without_snapshots():
+    rw = ReadWriteLock(snapshot_reads=False)
+    entered, release = threading.Event(), threading.Event()
+    holder = threading.Thread(target=_hold, args=(rw.write_lock, entered, release))
+    holder.start()
+    entered.wait(1.0)
+
+    got_it = threading.Event()
+    reader = threading.Thread(target=lambda: (rw.acquire_read(), got_it.set(), rw.release_read()))
+    reader.start()
+    assert not got_it.wait(0.1)
+    release.set()
+    assert got_it.wait(1.0)
+    holder.join()
+    reader.join()
+    stats = rw.stats()["read"]
+    assert stats["contended"] == 1
+    assert stats["max_wait_s"] >= 0.05
+
+
+def test_snapshot_readers_run_alongside_writer():
+    rw = ReadWriteLock(snapshot_reads=True)
+    entered, release = threading.Event(), threading.Event()
+    holder = threading.Thread(target=_hold, args=(rw.write_lock, entered, release))
+    holder.start()
+    entered.wait(1.0)
+
+    got_it = threading.Event()
+    reader = threading.Thread(target=lambda: (rw.acquire_read(), got_it.set(), rw.release_read()))
+    reader.start()
+    assert got_it.wait(1.0)
+
+    # Writers are still exclusive
+    assert rw.write_lock.acquire(timeout=0.05) is False
+    release.set()
+    holder.join()
+    reader.join()
+
+
+def test_write_lock_is_reentrant_and_allows_nested_reads():
+    rw = ReadWriteLock()
+    with rw.write_lock:
+        with rw.write_lock:
+            with rw.read_lock:
+                pass
+    assert rw.write_lock.acquire(blocking=False)
+    rw.write_lock.release()
+
+
+def test_upgrade_from_read_is_rejected():
+    rw = ReadWriteLock()
+    with rw.read_lock:
+        with pytest.raises(RuntimeError):
+            rw.acquire_write()
+
+
+def test_pooled_manager_reads_while_writer_holds_lock(temp_db):
+    dbm = DatabaseManager("rw_lock_test", pooled=True)
+    dbm.query_and_commit("CREATE TABLE IF NOT EXISTS t (a INTEGER)")
+    dbm.query_and_commit("INSERT INTO t VALUES (1)")
+    results = []
+
+    def reader():
+        with dbm.read_lock:
+            results.append(dbm.query_one_with_values("SELECT COUNT(*) FROM t", ()))
+
+    try:
+        with dbm.lock:
+            dbm.query_and_commit("INSERT INTO t VALUES (2)")
+            thread = threading.Thread(target=reader)
+            start = time.perf_counter()
+            thread.start()
+            thread.join(1.0)
+            assert time.perf_counter() - start < 1.0
+        assert results == [(2,)]
+        assert dbm.lock_stats()["read"]["contended"] == 0
+    finally:
+        dbm.close()
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from qbittensor.miner.providers.async_shim import SyncToAsyncAdapter, is_async_adapter
+from qbittensor.miner.providers.base import AsyncProviderAdapter, BaseExecutionStatus, JobHandle
+from qbittensor.miner.providers.mock import MockProviderAdapter
+from qbittensor.miner.runtime.async_provider import AsyncProviderRuntime
+from qbittensor.miner.runtime.provider_pool import ProviderCallTimeout
+from qbittensor.miner.runtime.registry import JobRegistry
+from qbittensor.miner.runtime.threads.provider_thread import poll_once
+from tests.conftest import DummyKeypair
+
+
+class SlowAsyncAdapter(MockProviderAdapter):
+    """Mock adapter whose poll is a coroutine that sleeps, tracking how many polls are in flight"""
+
+    def __init__(self, delay_s=0.05):
+        super().__init__()
+        self.delay_s = delay_s
+        self.running = 0
+        self.peak = 0
+
+    async def poll(self, handle):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay_s)
+        finally:
+            self.running -= 1
+        return BaseExecutionStatus(status="RUNNING", eta_seconds=10)
+
+
+def test_shim_presents_sync_adapter_as_async():
+    adapter = SyncToAsyncAdapter(MockProviderAdapter())
+    assert is_async_adapter(adapter) and not is_async_adapter(adapter.adapter)
+    assert isinstance(adapter, AsyncProviderAdapter)
+
+    async def flow():
+        handle = await adapter.submit(circuit_data="OPENQASM 3;", shots=10)
+        statuses = await adapter.poll_many([handle, handle])
+        return handle, statuses
+
+    handle, statuses = asyncio.run(flow())
+    assert isinstance(handle, JobHandle)
+    assert len(statuses) == 2 and all(isinstance(s, BaseExecutionStatus) for s in statuses)
+
+
+def test_runtime_limits_outstanding_calls_per_operation():
+    adapter = SlowAsyncAdapter()
+    runtime = AsyncProviderRuntime(adapter, limits={"poll": 4})
+    handle = JobHandle(provider_job_id="p", device_id="d")
+    futures = [runtime.submit([f"k{i}"], adapter.poll, handle) for i in range(16)]
+    assert all(runtime.result(f, 5.0).status == "RUNNING" for f in futures)
+    assert adapter.peak == 4
+    assert runtime.busy_count() == 0
+    runtime.shutdown()
+
+
+def test_runtime_cancels_timed_out_call_and_releases_its_key():
+    adapter = SlowAsyncAdapter(delay_s=5.0)
+    runtime = AsyncProviderRuntime(adapter, timeout_s=0.05)
+    future = runtime.submit(["job"], adapter.poll, JobHandle(provider_job_id="p", device_id="d"))
+    with pytest.raises(ProviderCallTimeout):
+        runtime.result(future)
+    deadline = time.monotonic() + 1.0
+    while runtime.is_busy("job") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not runtime.is_busy("job") and runtime.timed_out == 1
+    runtime.shutdown()
+
+
+def test_runtime_restarts_after_shutdown():
+    runtime = AsyncProviderRuntime(MockProviderAdapter())
+    assert runtime.call(runtime.adapter.list_devices)
+    runtime.shutdown()
+    assert runtime.call(runtime.adapter.list_devices)
+    runtime.shutdown()
+    assert not any(t.name == "Provider Loop" and t.is_alive() for t in threading.enumerate())
+
+
+def test_registry_runs_jobs_on_async_runtime(db_manager, http_mock, monkeypatch):
+    monkeypatch.setenv("MINER_PROVIDER_RUNTIME", "async")
+    registry = JobRegistry(db=db_manager, keypair=DummyKeypair(), poll_interval_s=0.01, adapter=MockProviderAdapter())
+    try:
+        assert isinstance(registry._provider_pool, AsyncProviderRuntime)
+        assert is_async_adapter(registry.adapter)
+        registry.submit("ASYNC-1", input_data_url="http://qasm", validator_hotkey="vhk")
+        for _ in range(300):
+            poll_once(registry)
+            if not registry.is_tracking("ASYNC-1"):
+                break
+            time.sleep(0.01)
+        rows = db_manager.query_with_values("SELECT status FROM executions WHERE execution_id = ?", ("ASYNC-1",))
+        assert rows and rows[0][0] == "Completed"
+    finally:
+        registry.stop()
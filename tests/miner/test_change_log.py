@@ -0,0 +1,62 @@
+from qbittensor.miner.runtime import repository as repo
+from qbittensor.miner.runtime.change_log import ExecutionChangeLog, parse_cursor
+from qbittensor.miner.runtime.storage import ExecutionRecord
+from qbittensor.validator.utils.execution_status import ExecutionStatus
+
+
+class DummyHandle:
+    provider_job_id = "prov-1"
+    device_id = "dev"
+
+
+def _record(execution_id, status, ts="2025-01-01 00:00:00"):
+    return ExecutionRecord(execution_id=execution_id, status=status, timestamp=ts)
+
+
+def test_parse_cursor_accepts_plain_timestamps():
+    assert parse_cursor("2025-01-01 00:00:00") == ("2025-01-01 00:00:00", None, None)
+    assert parse_cursor("2025-01-01 00:00:00#abc:12") == ("2025-01-01 00:00:00", "abc", 12)
+    assert parse_cursor(None) == ("", None, None)
+
+
+def test_changes_since_returns_latest_snapshot_once():
+    log = ExecutionChangeLog(max_entries=100)
+    log.append(_record("a", "Pending", "2025-01-01 00:00:01"))
+    cursor = log.cursor("2025-01-01 00:00:01", log.head)
+    log.append(_record("b", "Pending", "2025-01-01 00:00:01"))
+    log.append_update("a", {"status": ExecutionStatus.RUNNING, "timestamp": "2025-01-01 00:00:02"})
+    log.append_update("b", {"status": ExecutionStatus.QUEUED, "timestamp": "2025-01-01 00:00:02"})
+
+    records, next_cursor = log.changes_since(cursor)
+
+    # a is Running (not delivered); b only in its newest state; same-second rows are not repeated
+    assert [(r.execution_id, r.status) for r in records] == [("b", "Queued")]
+    assert parse_cursor(next_cursor) == ("2025-01-01 00:00:02", log.log_id, 4)
+    assert log.changes_since(next_cursor) == ([], next_cursor)
+
+
+def test_unservable_cursors_fall_back():
+    log = ExecutionChangeLog(max_entries=2)
+    first = log.cursor("2025-01-01 00:00:00", log.head)
+    for i in range(3):
+        log.append(_record(f"e{i}", "Pending"))
+
+    assert log.changes_since(first) is None  # evicted from the buffer
+    assert log.changes_since("2025-01-01 00:00:00") is None  # plain timestamp
+    assert log.changes_since(f"2025-01-01 00:00:00#other:{log.head}") is None  # another process's log
+    assert log.stats()["fallbacks"] == 3
+
+
+def test_registry_serves_cursor_from_memory(registry, monkeypatch):
+    repo.insert_pending(registry, execution_id="c1", validator_hotkey="vhk", handle=DummyHandle(), shots=5)
+    records, cursor = registry.finished_since("1970-01-01 00:00:00")
+    assert [r.execution_id for r in records] == ["c1"]
+
+    monkeypatch.setattr(registry.store, "finished_since", lambda after: (_ for _ in ()).throw(AssertionError("table scan")))
+    repo.update_to_queued(registry, execution_id="c1", handle=DummyHandle())
+    repo.persist_failed(registry, execution_id="c2", validator_hotkey="vhk", provider=None, provider_job_id=None, device_id=None, error_message="boom")
+
+    records, cursor = registry.finished_since(cursor)
+    assert [(r.execution_id, r.status, r.provider_job_id) for r in records] == [("c1", "Queued", "prov-1"), ("c2", "Failed", None)]
+    assert records[0].shots == 5
+    assert registry.finished_since(cursor)[0] == []
@@ -0,0 +1,105 @@
+import pytest
+import requests
+
+from qbittensor.miner.runtime.io.circuit_fetcher import CircuitFetcher, CircuitFetchError
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, status_code=200, headers=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(response=self)
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+
+class FakeSession:
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.calls = []
+
+    def get(self, url, stream=False, timeout=None):
+        self.calls.append(url)
+        body = self.bodies[url]
+        return body if isinstance(body, FakeResponse) else FakeResponse(body)
+
+    def close(self):
+        pass
+
+
+def test_fetch_is_cached_by_url():
+    session = FakeSession({"http://a": b"OPENQASM 2.0;"})
+    fetcher = CircuitFetcher(session=session)
+
+    first = fetcher.fetch("http://a")
+    second = fetcher.fetch("http://a")
+
+    assert first.text == second.text == "OPENQASM 2.0;"
+    assert session.calls == ["http://a"]
+    assert fetcher.stats()["hits"] == 1
+
+
+def test_same_content_is_stored_once():
+    session = FakeSession({"http://a": b"qasm", "http://b": b"qasm"})
+    fetcher = CircuitFetcher(session=session)
+
+    fetcher.fetch("http://a")
+    b = fetcher.fetch("http://b")
+
+    stats = fetcher.stats()
+    assert stats["entries"] == 2 and stats["bodies"] == 1 and stats["cached_bytes"] == 4
+    assert b.url == "http://b"
+    assert fetcher.get("http://b").url == "http://b"
+
+
+def test_oversized_bodies_are_rejected():
+    session = FakeSession({
+        "http://declared": FakeResponse(b"", headers={"Content-Length": "100"}),
+        "http://streamed": b"x" * 100,
+    })
+    fetcher = CircuitFetcher(max_bytes=10, session=session)
+
+    with pytest.raises(CircuitFetchError):
+        fetcher.fetch("http://declared")
+    with pytest.raises(CircuitFetchError):
+        fetcher.fetch("http://streamed")
+    assert fetcher.stats()["too_large"] == 2 and fetcher.stats()["entries"] == 0
+
+
+def test_http_errors_raise_and_are_not_cached():
+    session = FakeSession({"http://missing": FakeResponse(b"", status_code=404)})
+    fetcher = CircuitFetcher(session=session)
+
+    with pytest.raises(CircuitFetchError):
+        fetcher.fetch("http://missing")
+    assert fetcher.get("http://missing") is None
+
+
+def test_lru_and_ttl_eviction(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("qbittensor.miner.runtime.io.circuit_fetcher.time.monotonic", lambda: clock[0])
+    session = FakeSession({"http://a": b"a", "http://b": b"b", "http://c": b"c"})
+    fetcher = CircuitFetcher(max_entries=2, ttl_s=60, session=session)
+
+    fetcher.fetch("http://a")
+    fetcher.fetch("http://b")
+    fetcher.fetch("http://a")  # a is now most recently used
+    fetcher.fetch("http://c")  # evicts b
+    assert fetcher.get("http://b") is None and fetcher.get("http://a") is not None
+
+    clock[0] += 61
+    assert fetcher.get("http://a") is None
+    assert fetcher.stats()["entries"] == 1
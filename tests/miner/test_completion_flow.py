@@ -9,6 +9,12 @@ def test_valid_counts_accepts_binary_keys_positive_ints():
     assert not cf._valid_counts({"01": -1})
 
 
+def test_valid_counts_accepts_mixed_widths_and_rejects_int64_overflow():
+    assert cf._valid_counts({"0": 1, "10": 2})
+    assert cf._valid_counts({"01": 2**63 - 1})
+    assert not cf._valid_counts({"01": 2**63})
+
+
 def test_persist_completion_happy_path(registry, http_mock, monkeypatch):
     # Arrange: submit a job -> progress to COMPLETED -> persist
     execution_id = "exec-1"
@@ -60,3 +66,34 @@ def test_persist_completion_invalid_counts_fails(registry, http_mock, monkeypatc
     monkeypatch.setattr(registry.adapter, "get_job_receipt", orig)
 
 
+def test_persist_completion_uploads_mixed_width_counts_as_sent(registry, http_mock, monkeypatch):
+    registry.submit("exec-3", input_data_url="http://qasm", validator_hotkey="vk", shots=10)
+    tracked = registry._jobs["exec-3"]
+
+    class MixedReceipt:
+        provider = "mock"
+        provider_job_id = "job_mixed"
+        status = "COMPLETED"
+        device_id = "mock_qpu_1"
+        results = {"measurementCounts": {"0": 1, "10": 2}}
+
+    uploaded = []
+    monkeypatch.setattr(registry.adapter, "get_job_receipt", lambda h: MixedReceipt)
+    monkeypatch.setattr(cf, "_attempt_put", lambda upload_data, counts: uploaded.append(counts))
+    assert cf.persist_completion(registry, tracked) is True
+    assert uploaded == [{"0": 1, "10": 2}]
+
+
+def test_persist_completion_rejects_counts_above_int64(registry, http_mock, monkeypatch):
+    registry.submit("exec-4", input_data_url="http://qasm", validator_hotkey="vk", shots=10)
+    tracked = registry._jobs["exec-4"]
+
+    class HugeReceipt:
+        provider = "mock"
+        provider_job_id = "job_huge"
+        status = "COMPLETED"
+        device_id = "mock_qpu_1"
+        results = {"measurementCounts": {"01": 2**63}}
+
+    monkeypatch.setattr(registry.adapter, "get_job_receipt", lambda h: HugeReceipt)
+    assert cf.persist_completion(registry, tracked) is False
@@ -0,0 +1,79 @@
+import threading
+import time
+
+from qbittensor.miner.providers.base import BaseExecutionStatus
+from qbittensor.miner.runtime.completion_pipeline import CompletionPipeline
+from qbittensor.miner.runtime.flows import completion_flow as cf
+from qbittensor.miner.runtime.threads import provider_thread as pt
+
+
+def _tracked_jobs(registry, count):
+    for i in range(count):
+        registry.submit(f"C{i}", input_data_url="http://qasm", validator_hotkey="vhk")
+    registry._stop.set()
+    registry._provider_thread.join(timeout=2.0)
+    registry._poll_scheduler = None
+
+
+def _wait_until(predicate, timeout_s=3.0):
+    deadline = time.monotonic() + timeout_s
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_slow_completion_does_not_block_polling(registry, http_mock, monkeypatch):
+    _tracked_jobs(registry, 3)
+    release = threading.Event()
+    monkeypatch.setattr(cf, "persist_completion", lambda reg, tracked, timings=None: release.wait(5))
+    monkeypatch.setattr(registry.adapter, "poll_many", lambda handles: [BaseExecutionStatus(status="COMPLETED") for _ in handles])
+
+    start = time.monotonic()
+    pt.poll_once(registry)
+    assert time.monotonic() - start < 1.0
+    assert all(registry._completion_pipeline.is_busy(f"C{i}") for i in range(3))
+
+    # Jobs owned by the pipeline are not polled again
+    polled = []
+    monkeypatch.setattr(registry.adapter, "poll_many", lambda handles: polled.extend(handles) or [])
+    pt.poll_once(registry)
+    assert polled == []
+
+    release.set()
+    assert _wait_until(lambda: not any(registry.is_tracking(f"C{i}") for i in range(3)))
+    stats = registry.completion_stats()
+    assert stats["finalized"] == 3 and stats["stages"]["queue_wait"]["count"] == 3
+
+
+def test_full_queue_refuses_and_job_stays_tracked(registry, http_mock, monkeypatch):
+    _tracked_jobs(registry, 3)
+    release = threading.Event()
+    monkeypatch.setattr(cf, "persist_completion", lambda reg, tracked, timings=None: release.wait(5))
+    pipeline = CompletionPipeline(registry, workers=1, max_queue=1)
+    jobs = list(registry._jobs.items())
+
+    assert pipeline.offer(*jobs[0])
+    assert _wait_until(lambda: pipeline.stats()["active"] == 1)
+    assert pipeline.offer(*jobs[1])
+    assert not pipeline.offer(*jobs[1])  # Already queued
+    assert not pipeline.offer(*jobs[2])  # Queue full
+    stats = pipeline.stats()
+    assert stats["rejected"] == 1 and stats["queued"] == 1 and stats["high_water"] == 1
+    assert registry.is_tracking("C2") and not pipeline.is_busy("C2")
+
+    release.set()
+    assert _wait_until(lambda: pipeline.stats()["finalized"] == 2)
+    pipeline.shutdown()
+
+
+def test_failed_completion_stays_tracked_and_records_stage_timings(registry, http_mock, monkeypatch):
+    _tracked_jobs(registry, 1)
+    pipeline = CompletionPipeline(registry, workers=1)
+    monkeypatch.setattr(registry.adapter, "get_job_receipt", lambda handle: type("R", (), {"results": {}})())
+
+    assert pipeline.offer("C0", registry._jobs["C0"])
+    assert _wait_until(lambda: pipeline.stats()["failed"] == 1)
+    assert registry.is_tracking("C0") and not pipeline.is_busy("C0")
+    stages = pipeline.stats()["stages"]
+    assert {"queue_wait", "receipt", "upload_url"} <= set(stages)
+    pipeline.shutdown()
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import Mock
 from neurons.miner import Miner
+from qbittensor.miner.runtime.io.circuit_fetcher import FetchedCircuit
 from qbittensor.protocol import CircuitSynapse, ExecutionData
 import bittensor as bt
 
@@ -82,6 +83,7 @@ def test_forward_submits_new_job(miner, monkeypatch):
         submitted_jobs.append(kwargs)
     
     monkeypatch.setattr(miner.jobs, "submit", mock_submit)
+    miner.jobs._submit_pool = None  # submit inside forward
     
     synapse = CircuitSynapse(
         execution_id="12345",
@@ -94,12 +96,11 @@ def test_forward_submits_new_job(miner, monkeypatch):
     
     monkeypatch.setattr(miner, "_get_validator_hotkey", lambda syn: "validator_hotkey_123")
     monkeypatch.setattr(miner, "_job_is_new", lambda eid: True)
-    class Resp:
-        def __init__(self):
-            self.status_code = 200
-        def raise_for_status(self):
-            return None
-    monkeypatch.setattr("requests.get", lambda url, timeout=5: Resp())
+    fetched = []
+    def mock_fetch(url):
+        fetched.append(url)
+        return FetchedCircuit(url=url, text="OPENQASM 2.0;", sha256="h", size=13)
+    monkeypatch.setattr(miner.jobs, "fetch_circuit", mock_fetch)
     
     result = miner.forward(synapse)
     
@@ -110,6 +111,9 @@ def test_forward_submits_new_job(miner, monkeypatch):
     assert submitted_jobs[0]["input_data_url"] == synapse.input_data_url
     assert submitted_jobs[0]["shots"] == 100
     assert submitted_jobs[0]["validator_hotkey"] == "validator_hotkey_123"
+    # The circuit is downloaded once, by forward, and handed to submit
+    assert fetched == ["http://qasm"]
+    assert submitted_jobs[0]["qasm"] == "OPENQASM 2.0;"
 
 
 def test_forward_rejects_duplicate_job(miner, monkeypatch):
@@ -166,7 +170,7 @@ def test_forward_applies_rate_limiting(miner, monkeypatch):
     
     monkeypatch.setattr(miner, "_get_validator_hotkey", lambda syn: "validator_789")
     
-    monkeypatch.setattr(miner, "_rate_limit", lambda : True)
+    monkeypatch.setattr(miner, "_rate_limit", lambda validator_hotkey=None: True)
     monkeypatch.setattr(miner, "_job_is_new", lambda eid: True)
     
     submitted = []
@@ -211,3 +215,118 @@ def test_forward_adds_completed_circuits(miner, monkeypatch):
     assert result.finished_executions[0].execution_id == "111"
     assert result.finished_executions[1].execution_id == "222"
     assert result.last_circuit == "2024-01-01 12:05:00"
+
+
+def test_forward_does_not_prune_database(miner, monkeypatch):
+    """Retention pruning runs from the miner's retention timer, not on the request path."""
+    monkeypatch.setattr(miner, "_get_validator_hotkey", lambda syn: "validator_xyz")
+    monkeypatch.setattr(miner.jobs.store, "delete_before", Mock(side_effect=AssertionError("pruned during forward")))
+
+    synapse = CircuitSynapse(execution_id="collect", shots=1, configuration_data={}, input_data_url="", last_circuit="", finished_executions=[])
+    miner.forward(synapse)
+
+
+def test_drop_old_circuit_data_prunes_rows_and_state_index(miner):
+    """Expired executions leave both the table and the registry's state index."""
+    miner.database_manager.query_and_commit_many(
+        "INSERT OR REPLACE INTO executions (execution_id, status, timestamp) VALUES (?, ?, ?)",
+        [("expired", "Completed", "2000-01-01 00:00:00"), ("fresh", "Completed", "2999-01-01 00:00:00")],
+    )
+    miner.jobs._rebuild_state_index()
+
+    miner._drop_old_circuit_data()
+
+    ids = {row[0] for row in miner.database_manager.query("SELECT execution_id FROM executions")}
+    assert "expired" not in ids and "fresh" in ids
+    assert "expired" not in miner.jobs._state_index
+    assert "fresh" in miner.jobs._state_index
+
+
+def test_drop_old_circuit_data_keeps_state_index_when_pass_is_capped(miner, monkeypatch):
+    """Rows a capped pass could not delete yet stay in the state index, so is_known still reports them."""
+    from dataclasses import replace
+    monkeypatch.setattr(miner, "executions_retention", replace(miner.executions_retention, batch_size=1, max_batches=1))
+    miner.database_manager.query_and_commit_many(
+        "INSERT OR REPLACE INTO executions (execution_id, status, timestamp) VALUES (?, ?, ?)",
+        [("expired-a", "Completed", "2000-01-01 00:00:00"), ("expired-b", "Completed", "2000-01-01 00:00:01")],
+    )
+    miner.jobs._rebuild_state_index()
+
+    miner._drop_old_circuit_data()
+
+    remaining = {row[0] for row in miner.database_manager.query("SELECT execution_id FROM executions WHERE execution_id LIKE 'expired-%'")}
+    assert len(remaining) == 1
+    assert all(miner.jobs.is_known(execution_id) for execution_id in remaining)
+
+    miner._drop_old_circuit_data()
+    miner._drop_old_circuit_data()
+
+    assert "expired-a" not in miner.jobs._state_index and "expired-b" not in miner.jobs._state_index
+
+
+def test_forward_queues_submission_and_returns(miner, monkeypatch):
+    """With the submit pool, forward records Pending and leaves download and provider submit to a worker."""
+    import threading
+    import uuid
+    # The miner fixture's database persists across runs, and a restart fails Pending rows left behind by earlier ones
+    execution_id = f"async-{uuid.uuid4().hex[:8]}"
+    release = threading.Event()
+    submitted = []
+
+    def slow_submit(request):
+        release.wait(timeout=5)
+        submitted.append(request.execution_id)
+        return True
+
+    monkeypatch.setattr(miner.jobs, "_submit_request", slow_submit)
+    monkeypatch.setattr(miner, "_get_validator_hotkey", lambda syn: "validator_hotkey_123")
+    monkeypatch.setattr(miner, "_job_is_new", lambda eid: True)
+    synapse = CircuitSynapse(execution_id=execution_id, shots=10, configuration_data={}, input_data_url="http://qasm", last_circuit="", finished_executions=[])
+
+    miner.forward(synapse)
+
+    assert synapse.rate_limited is False
+    assert miner.jobs._state_index.get(execution_id) == "Pending"
+    assert submitted == []
+    release.set()
+    for _ in range(100):
+        if submitted:
+            break
+        threading.Event().wait(0.01)
+    assert submitted == [execution_id]
+
+
+def test_forward_rate_limits_when_submit_pool_is_full(miner, monkeypatch):
+    monkeypatch.setattr(miner.jobs, "accept", lambda **kwargs: False)
+    monkeypatch.setattr(miner, "_get_validator_hotkey", lambda syn: "validator_hotkey_123")
+    monkeypatch.setattr(miner, "_job_is_new", lambda eid: True)
+    synapse = CircuitSynapse(execution_id="full-1", shots=10, configuration_data={}, input_data_url="http://qasm", last_circuit="", finished_executions=[])
+
+    miner.forward(synapse)
+
+    assert synapse.rate_limited is True
+
+
+def test_forward_refunds_rate_limit_when_not_accepted(miner, monkeypatch):
+    refunded = []
+    monkeypatch.setattr(miner.jobs, "accept", lambda **kwargs: False)
+    monkeypatch.setattr(miner, "_get_validator_hotkey", lambda syn: "validator_hotkey_123")
+    monkeypatch.setattr(miner, "_job_is_new", lambda eid: True)
+    monkeypatch.setattr(miner, "_rate_limit", lambda validator_hotkey=None: False)
+    monkeypatch.setattr(miner.rate_limiter, "refund", refunded.append, raising=False)
+    synapse = CircuitSynapse(execution_id="full-2", shots=10, configuration_data={}, input_data_url="http://qasm", last_circuit="", finished_executions=[])
+
+    miner.forward(synapse)
+
+    assert refunded == ["validator_hotkey_123"]
+
+
+def test_forward_does_not_spend_rate_limit_on_known_execution(miner, monkeypatch):
+    monkeypatch.setattr(miner, "_get_validator_hotkey", lambda syn: "validator_hotkey_123")
+    monkeypatch.setattr(miner, "_job_is_new", lambda eid: False)
+    monkeypatch.setattr(miner, "_rate_limit", lambda validator_hotkey=None: pytest.fail("rate limiter consulted"))
+    synapse = CircuitSynapse(execution_id="known-1", shots=10, configuration_data={}, input_data_url="http://qasm", last_circuit="", finished_executions=[])
+
+    miner.forward(synapse)
+
+    assert not synapse.rate_limited
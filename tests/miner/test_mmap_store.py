@@ -0,0 +1,68 @@
+import os
+
+from qbittensor.miner.runtime.registry import JobRegistry
+from qbittensor.miner.runtime import repository as repo
+from qbittensor.miner.runtime.storage import ExecutionRecord, InMemoryExecutionStore, MmapExecutionStore
+from tests.conftest import DummyKeypair
+
+
+def _record(execution_id, status="Completed", timestamp="2025-01-01 00:00:00"):
+    return ExecutionRecord(execution_id=execution_id, status=status, timestamp=timestamp)
+
+
+def test_log_is_replayed_on_reopen(temp_db):
+    path = str(temp_db / "executions.log")
+    store = MmapExecutionStore(path)
+    store.upsert(_record("e1", status="Pending"))
+    store.update("e1", status="Completed")
+    store.upsert(_record("e2"))
+    store.delete_before("2026-01-01 00:00:00", batch_size=1, max_batches=1)
+    store.close()
+
+    reopened = MmapExecutionStore(path)
+    assert reopened.count() == 1
+    survivor = reopened.states()[0][0]
+    assert reopened.get(survivor).status == "Completed"
+    reopened.close()
+
+
+def test_torn_tail_is_dropped_on_reopen(temp_db):
+    path = str(temp_db / "executions.log")
+    store = MmapExecutionStore(path)
+    store.upsert(_record("e1"))
+    store.upsert(_record("e2"))
+    store.close()
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.truncate(size - 3)
+
+    reopened = MmapExecutionStore(path)
+    assert [eid for eid, _, _ in reopened.states()] == ["e1"]
+    reopened.upsert(_record("e3"))
+    reopened.close()
+    assert sorted(eid for eid, _, _ in MmapExecutionStore(path).states()) == ["e1", "e3"]
+
+
+def test_compaction_rewrites_only_live_records(temp_db):
+    path = str(temp_db / "executions.log")
+    store = MmapExecutionStore(path, compact_min_bytes=1024)
+    for i in range(200):
+        store.upsert(_record("hot", status="Queued", timestamp=f"2025-01-01 00:{i // 60:02d}:{i % 60:02d}"))
+    store.upsert(_record("cold"))
+
+    assert store.log_size() < 200 * 100
+    assert store.get("hot").timestamp == "2025-01-01 00:03:19"
+    store.close()
+    assert MmapExecutionStore(path).count() == 2
+
+
+def test_registry_runs_on_alternative_store(db_manager, mock_adapter):
+    store = InMemoryExecutionStore()
+    reg = JobRegistry(db=db_manager, keypair=DummyKeypair(), adapter=mock_adapter, store=store)
+    handle = type("H", (), {"provider_job_id": "prov-1", "device_id": "dev"})()
+    repo.insert_pending(reg, execution_id="e1", validator_hotkey="vhk", handle=handle, shots=1)
+    repo.update_to_queued(reg, execution_id="e1", handle=handle)
+
+    assert store.get("e1").status == "Queued"
+    assert reg.get_inflight_count() == 1
+    assert db_manager.get_size_of_table("executions") == 0
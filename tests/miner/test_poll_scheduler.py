@@ -0,0 +1,119 @@
+import threading
+
+from qbittensor.miner.runtime.poll_scheduler import RUNNING_MAX_INTERVAL_S, PollScheduler
+from qbittensor.miner.runtime.threads import provider_thread as pt
+
+
+def test_new_jobs_are_due_immediately_then_wait_their_interval():
+    scheduler = PollScheduler(min_interval_s=1.0, max_interval_s=30.0)
+    scheduler.sync(["a", "b"], now=100.0)
+    assert sorted(scheduler.pop_due(100.0)) == ["a", "b"]
+    assert scheduler.pop_due(100.0) == []
+
+    scheduler.reschedule("a", "RUNNING", 10, now=100.0)  # Half the ETA
+    scheduler.reschedule("b", "RUNNING", 1, now=100.0)  # Near completion: tight, but not below the floor
+    assert scheduler.pop_due(100.9) == []
+    assert scheduler.pop_due(101.0) == ["b"]
+    assert scheduler.pop_due(105.0) == ["a"]
+
+
+def test_eta_interval_is_clamped():
+    scheduler = PollScheduler(min_interval_s=1.0, max_interval_s=30.0)
+    assert scheduler.interval_for("QUEUED", 3600, streak=0) == 30.0
+    assert scheduler.interval_for("RUNNING", 0, streak=0) == 1.0
+    assert scheduler.interval_for("COMPLETED", 3600, streak=5) == 1.0
+
+
+def test_queued_without_eta_backs_off_exponentially():
+    scheduler = PollScheduler(min_interval_s=1.0, max_interval_s=30.0)
+    scheduler.sync(["q", "r"], now=0.0)
+    scheduler.pop_due(0.0)
+    queued = [scheduler.reschedule("q", "QUEUED", None, now=0.0) for _ in range(7)]
+    running = [scheduler.reschedule("r", "RUNNING", None, now=0.0) for _ in range(7)]
+    assert queued == [1.0, 2.0, 4.0, 8.0, 16.0, 30.0, 30.0]
+    assert max(running) == RUNNING_MAX_INTERVAL_S
+    # A state change resets the back-off
+    assert scheduler.reschedule("q", "RUNNING", None, now=0.0) == 1.0
+
+
+def test_sync_forgets_jobs_no_longer_tracked():
+    scheduler = PollScheduler(min_interval_s=1.0)
+    scheduler.sync(["a", "b"], now=0.0)
+    scheduler.sync(["b"], now=0.0)
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(0.0) == ["b"]
+    assert scheduler.next_due() is None
+
+
+def test_queued_backlog_needs_an_order_of_magnitude_fewer_polls():
+    scheduler = PollScheduler(min_interval_s=1.0, max_interval_s=30.0)
+    jobs = [f"job-{i}" for i in range(100)]
+    for second in range(120):
+        scheduler.sync(jobs, now=float(second))
+        for execution_id in scheduler.pop_due(float(second)):
+            scheduler.reschedule(execution_id, "QUEUED", None, now=float(second))
+    fixed_cadence_polls = 100 * 120
+    assert scheduler.polls * 10 <= fixed_cadence_polls
+
+
+def test_poll_once_only_polls_due_jobs(registry, http_mock):
+    for i in range(3):
+        registry.submit(f"S{i}", input_data_url="http://qasm", validator_hotkey="vhk")
+    registry._stop.set()
+    registry._provider_thread.join(timeout=2.0)
+    registry._poll_scheduler = PollScheduler(min_interval_s=60.0)
+
+    registry.adapter.poll_requests = 0
+    pt.poll_once(registry)
+    assert registry.adapter.poll_requests == 1
+    pt.poll_once(registry)  # Nothing is due for another minute
+    assert registry.adapter.poll_requests == 1
+    assert len(registry._poll_scheduler) == 3
+
+
+def test_failed_polls_are_rescheduled(registry, http_mock, monkeypatch):
+    registry.submit("F1", input_data_url="http://qasm", validator_hotkey="vhk")
+    registry._stop.set()
+    registry._provider_thread.join(timeout=2.0)
+    registry._poll_scheduler = PollScheduler(min_interval_s=60.0)
+
+    def boom(*args):
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(registry.adapter, "poll", boom)
+    monkeypatch.setattr(registry.adapter, "poll_many", boom)
+    pt.poll_once(registry)
+    assert registry._poll_scheduler.next_due() is not None
+    assert registry.is_tracking("F1")
+
+
+def test_defer_keeps_interval_and_streak():
+    scheduler = PollScheduler(min_interval_s=1.0, max_interval_s=30.0)
+    scheduler.sync(["a"], now=0.0)
+    scheduler.pop_due(0.0)
+    scheduler.reschedule("a", "QUEUED", None, now=0.0)
+    scheduler.pop_due(1.0)
+    scheduler.reschedule("a", "QUEUED", None, now=1.0)  # second QUEUED poll in a row: 2s
+    assert scheduler.pop_due(3.0) == ["a"]
+    assert scheduler.defer("a", now=3.0) == 2.0
+    assert scheduler.pop_due(4.0) == []
+    assert scheduler.pop_due(5.0) == ["a"]
+    assert scheduler.reschedule("a", "QUEUED", None, now=5.0) == 4.0
+
+
+def test_poll_once_defers_jobs_with_an_outstanding_call(registry, http_mock):
+    registry.submit("B1", input_data_url="http://qasm", validator_hotkey="vhk")
+    registry._stop.set()
+    registry._provider_thread.join(timeout=2.0)
+    scheduler = registry._poll_scheduler = PollScheduler(min_interval_s=60.0)
+    release = threading.Event()
+    registry._provider_pool.submit(["B1"], release.wait, 5)
+
+    registry.adapter.poll_requests = 0
+    try:
+        pt.poll_once(registry)
+        assert registry.adapter.poll_requests == 0
+        assert "B1" not in scheduler._streak  # not counted as a failed poll
+        assert scheduler.next_due() is not None
+    finally:
+        release.set()
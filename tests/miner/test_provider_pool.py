@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+
+from qbittensor.miner.providers.base import BaseExecutionStatus
+from qbittensor.miner.runtime.provider_pool import ProviderCallPool, ProviderCallTimeout
+from qbittensor.miner.runtime.threads import provider_thread as pt
+
+
+def test_pool_bounds_concurrency():
+    pool = ProviderCallPool(max_workers=3, timeout_s=5.0)
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def call(i):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return i
+
+    futures = [pool.submit([f"k{i}"], call, i) for i in range(9)]
+    assert [pool.result(f) for f in futures] == list(range(9))
+    assert peak[0] == 3
+    assert pool.busy_count() == 0
+    pool.shutdown()
+
+
+def test_timed_out_call_keeps_its_key_busy_until_it_returns():
+    pool = ProviderCallPool(max_workers=2, timeout_s=0.05)
+    release = threading.Event()
+    future = pool.submit(["job"], release.wait, 5)
+    with pytest.raises(ProviderCallTimeout):
+        pool.result(future)
+    assert pool.is_busy("job") and pool.timed_out == 1
+    release.set()
+    future.result(1)
+    assert not pool.is_busy("job")
+    pool.shutdown()
+
+
+def _tracked_jobs(registry, count):
+    for i in range(count):
+        registry.submit(f"C{i}", input_data_url="http://qasm", validator_hotkey="vhk")
+    registry._stop.set()
+    registry._provider_thread.join(timeout=2.0)
+    registry._poll_scheduler = None
+    registry._poll_batch_size = 1
+
+
+def test_poll_once_polls_concurrently(registry, http_mock, monkeypatch):
+    _tracked_jobs(registry, 8)
+    registry._provider_pool = ProviderCallPool(max_workers=8, timeout_s=5.0)
+
+    def slow_poll_many(handles):
+        time.sleep(0.2)
+        return [BaseExecutionStatus(status="RUNNING", eta_seconds=10) for _ in handles]
+
+    monkeypatch.setattr(registry.adapter, "poll_many", slow_poll_many)
+    start = time.monotonic()
+    pt.poll_once(registry)
+    assert time.monotonic() - start < 0.2 * 8 / 2
+    with registry._lock:
+        assert all(tracked.last_status == "RUNNING" for tracked in registry._jobs.values())
+
+
+def test_hung_poll_times_out_without_blocking_other_jobs(registry, http_mock, monkeypatch):
+    _tracked_jobs(registry, 3)
+    registry._provider_pool = ProviderCallPool(max_workers=4, timeout_s=0.1)
+    release = threading.Event()
+    hung_job = registry._jobs["C1"].handle.provider_job_id
+
+    def poll_many(handles):
+        if handles[0].provider_job_id == hung_job:
+            release.wait(5)
+        return [BaseExecutionStatus(status="RUNNING", eta_seconds=10) for _ in handles]
+
+    monkeypatch.setattr(registry.adapter, "poll_many", poll_many)
+    pt.poll_once(registry)
+    with registry._lock:
+        assert registry._jobs["C0"].last_status == "RUNNING"
+        assert registry._jobs["C2"].last_status == "RUNNING"
+        assert registry._jobs["C1"].last_status != "RUNNING"
+    assert registry._provider_pool.is_busy("C1")
+
+    # The hung call is still outstanding, so C1 is not polled again on the next pass
+    submitted = registry._provider_pool.submitted
+    pt.poll_once(registry)
+    assert registry._provider_pool.submitted == submitted + 2
+    release.set()
+
+
+def _slow_submit(registry, monkeypatch, release):
+    submit = registry.adapter.submit
+
+    def slow_submit(**kwargs):
+        release.wait(5)
+        return submit(**kwargs)
+
+    monkeypatch.setattr(registry.adapter, "submit", slow_submit)
+    registry._provider_pool = ProviderCallPool(max_workers=2, timeout_s=5.0)
+    registry._submit_timeout_s = 0.05
+
+
+def _wait_for(condition, timeout_s=2.0):
+    deadline = time.monotonic() + timeout_s
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_submit_that_returns_after_timeout_is_tracked(registry, http_mock, monkeypatch):
+    release = threading.Event()
+    _slow_submit(registry, monkeypatch, release)
+
+    assert registry.submit("L1", input_data_url="http://qasm", validator_hotkey="vhk", qasm="OPENQASM 2.0;") is False
+    assert not registry.is_tracking("L1")
+    release.set()
+    assert _wait_for(lambda: registry.is_tracking("L1"))
+    assert _wait_for(lambda: registry._state_index.get("L1") == "Queued")
+
+
+def test_late_submit_for_failed_execution_is_cancelled(registry, http_mock, monkeypatch):
+    release = threading.Event()
+    _slow_submit(registry, monkeypatch, release)
+    cancelled = []
+    monkeypatch.setattr(registry.adapter, "cancel", lambda handle: cancelled.append(handle))
+
+    assert registry.submit("L2", input_data_url="http://qasm", validator_hotkey="vhk", qasm="OPENQASM 2.0;") is False
+    registry._state_index.set("L2", "Failed")
+    release.set()
+    assert _wait_for(lambda: len(cancelled) == 1)
+    assert not registry.is_tracking("L2")
@@ -11,9 +11,68 @@ def test_provider_thread_poll_once_handles_unknown_job(registry, http_mock, monk
     def boom(handle):
         raise RuntimeError("poll-failure")
     monkeypatch.setattr(registry.adapter, "poll", boom)
+    monkeypatch.setattr(registry.adapter, "poll_many", lambda handles: boom(None))
     pt.poll_once(registry)
     # Still tracked, but last_status unchanged
     with registry._lock:
         assert exec_id in registry._jobs
 
 
+def _submit(registry, count):
+    for i in range(count):
+        registry.submit(f"P{i}", input_data_url="http://qasm", validator_hotkey="vhk")
+    # Park the background provider thread so only the explicit poll_once below talks to the adapter
+    registry._stop.set()
+    registry._provider_thread.join(timeout=2.0)
+
+
+def test_poll_once_batches_through_poll_many(registry, http_mock):
+    _submit(registry, 5)
+    registry._poll_batch_size = 2
+    registry.adapter.poll_requests = 0
+    pt.poll_once(registry)
+    assert registry.adapter.poll_requests == 3  # 2 + 2 + 1 handles
+    with registry._lock:
+        assert all(tracked.last_status == "QUEUED" for tracked in registry._jobs.values())
+
+
+def test_poll_once_falls_back_to_poll_without_poll_many(registry, http_mock, monkeypatch):
+    from qbittensor.miner.providers.mock import MockProviderAdapter
+
+    class SinglePollAdapter:
+        """Delegates everything except poll_many"""
+        def __init__(self, inner):
+            self._inner = inner
+
+        def __getattr__(self, name):
+            if name == "poll_many":
+                raise AttributeError(name)
+            return getattr(self._inner, name)
+
+    _submit(registry, 3)
+    inner: MockProviderAdapter = registry.adapter
+    registry.adapter = SinglePollAdapter(inner)
+    inner.poll_requests = 0
+    pt.poll_once(registry)
+    assert inner.poll_requests == 3
+
+
+def test_failed_poll_many_chunk_is_polled_individually(registry, http_mock, monkeypatch):
+    _submit(registry, 3)
+    polled = []
+    original_poll = registry.adapter.poll
+
+    def poll_many(handles):
+        raise RuntimeError("batch endpoint down")
+
+    def poll(handle):
+        polled.append(handle.provider_job_id)
+        return original_poll(handle)
+
+    monkeypatch.setattr(registry.adapter, "poll_many", poll_many)
+    monkeypatch.setattr(registry.adapter, "poll", poll)
+    pt.poll_once(registry)
+    assert len(polled) == 3
+    with registry._lock:
+        assert all(tracked.last_status == "QUEUED" for tracked in registry._jobs.values())
+
@@ -0,0 +1,84 @@
+from qbittensor.miner.providers.base import AvailabilityStatus
+from qbittensor.miner.runtime.rate_limiter import CapacityRateLimiter, TokenBucket
+
+
+class FakeRegistry:
+    def __init__(self, inflight=0, max_inflight=100, availability=None, pending=0):
+        self.inflight = inflight
+        self.pending = pending
+        self._max_inflight = max_inflight
+        self.availability = availability
+
+    def get_inflight_count(self):
+        return self.inflight
+
+    def get_pending_count(self):
+        return self.pending
+
+    def get_cached_availability(self):
+        return self.availability
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, capacity=2.0)
+    now = bucket.updated
+    assert bucket.take(now) and bucket.take(now)
+    assert not bucket.take(now)
+    assert bucket.take(now + 0.5)
+    assert not bucket.take(now + 0.5)
+
+
+def test_capacity_checks_reject_without_buckets():
+    registry = FakeRegistry(inflight=100, max_inflight=100)
+    limiter = CapacityRateLimiter(registry, provider_max_pending=50)
+    assert limiter.allow("v1") == "inflight"
+
+    registry.inflight = 0
+    registry.availability = AvailabilityStatus(is_available=False)
+    assert limiter.allow("v1") == "provider_unavailable"
+
+    registry.availability = AvailabilityStatus(is_available=True, pending_jobs=50)
+    assert limiter.allow("v1") == "provider_queue"
+
+    registry.availability = AvailabilityStatus(is_available=True, pending_jobs=10)
+    assert limiter.allow("v1") is None
+    assert limiter.stats() == {"allowed": 1, "refunded": 0, "rejected": {"inflight": 1, "provider_unavailable": 1, "provider_queue": 1}, "validators": 0}
+
+
+def test_inflight_gate_ignores_pending_executions():
+    registry = FakeRegistry(inflight=100, max_inflight=100, pending=1)
+    limiter = CapacityRateLimiter(registry)
+    assert limiter.allow("v1") is None
+    registry.pending = 0
+    assert limiter.allow("v1") == "inflight"
+
+
+def test_validator_buckets_follow_stake():
+    limiter = CapacityRateLimiter(FakeRegistry(), rate_per_s=10.0, burst_s=1.0, min_share=0.1)
+    limiter.update_stakes({"big": 900.0, "small": 100.0})
+
+    unknown = sum(limiter.allow("unknown") is None for _ in range(20))
+    big = sum(limiter.allow("big") is None for _ in range(20))
+    small = sum(limiter.allow("small") is None for _ in range(20))
+
+    # burst of 1 s: the minimum share for unknown hotkeys, 9 tokens for 90% of the stake; the global bucket
+    # (10 tokens) is then empty, so the small validator's own token is not reached
+    assert (unknown, big, small) == (1, 9, 0)
+    assert limiter.stats()["rejected"] == {"validator": 19, "global": 31}
+
+
+def test_global_bucket_caps_all_validators():
+    limiter = CapacityRateLimiter(FakeRegistry(), rate_per_s=4.0, burst_s=1.0, min_share=1.0)
+    accepted = [limiter.allow(f"v{i}") is None for i in range(6)]
+    assert accepted == [True] * 4 + [False] * 2
+    assert limiter.stats()["rejected"] == {"global": 2}
+
+
+def test_refund_returns_tokens_to_global_and_validator_buckets():
+    limiter = CapacityRateLimiter(FakeRegistry(), rate_per_s=2.0, burst_s=1.0, min_share=0.5)
+    assert limiter.allow("v1") is None
+    assert limiter.allow("v1") == "validator"
+
+    limiter.refund("v1")
+    assert limiter.allow("v1") is None
+    assert limiter.stats()["refunded"] == 1
@@ -0,0 +1,86 @@
+from qbittensor.miner.runtime import repository as repo
+from qbittensor.miner.runtime.registry import JobRegistry
+from qbittensor.miner.runtime.state_index import ExecutionStateIndex
+from qbittensor.validator.utils.execution_status import ExecutionStatus
+from tests.conftest import DummyKeypair
+
+
+class DummyHandle:
+    provider_job_id = "prov-1"
+    device_id = "mock_qpu_1"
+
+
+def test_index_counters_follow_transitions():
+    index = ExecutionStateIndex()
+    index.set("a", ExecutionStatus.PENDING, "2025-01-01 00:00:00")
+    index.set("b", "Pending", "2025-01-02 00:00:00")
+    index.update("a", "Queued")
+    index.update("missing", "Queued")  # UPDATE of an unknown row is a no-op
+    assert index.count("Pending") == 1
+    assert index.count(ExecutionStatus.QUEUED) == 1
+    assert index.inflight_count() == 2
+
+    index.set("b", ExecutionStatus.COMPLETED, "2025-01-03 00:00:00")
+    assert index.inflight_count() == 1
+    assert index.get("b") == "Completed"
+
+    assert index.prune_before("2025-01-02") == 1
+    assert "a" not in index
+    assert len(index) == 1
+
+
+def test_registry_counts_are_write_through(registry):
+    repo.insert_pending(registry, execution_id="p1", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    repo.insert_pending(registry, execution_id="p2", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    repo.update_to_queued(registry, execution_id="p2", handle=DummyHandle())
+    assert registry.get_pending_count() == 1
+    assert registry.get_inflight_count() == 2
+
+    repo.update_status(registry, execution_id="p2", status=ExecutionStatus.RUNNING)
+    repo.persist_failed(
+        registry,
+        execution_id="p1",
+        validator_hotkey="vhk",
+        provider="mock",
+        provider_job_id=None,
+        device_id=None,
+        error_message="boom",
+    )
+    assert registry.get_pending_count() == 0
+    assert registry.get_inflight_count() == 1
+
+
+def test_registry_rebuilds_index_from_db(db_manager, mock_adapter):
+    first = JobRegistry(db=db_manager, keypair=DummyKeypair(), adapter=mock_adapter)
+    repo.insert_pending(first, execution_id="r1", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    repo.insert_pending(first, execution_id="r2", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    repo.update_status(first, execution_id="r2", status=ExecutionStatus.RUNNING)
+
+    restarted = JobRegistry(db=db_manager, keypair=DummyKeypair(), adapter=mock_adapter)
+    assert restarted.get_pending_count() == 1
+    assert restarted.get_inflight_count() == 2
+
+
+def test_is_known_answers_from_memory(registry, monkeypatch):
+    repo.insert_pending(registry, execution_id="k1", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    monkeypatch.setattr(registry.store, "exists", lambda execution_id: (_ for _ in ()).throw(AssertionError("store lookup")))
+
+    assert registry.is_known("k1")
+    assert not registry.is_known("never-seen")
+
+
+def test_is_known_checks_store_only_on_bloom_hits(db_manager, mock_adapter, monkeypatch):
+    monkeypatch.setenv("MINER_DEDUP_BLOOM", "1")
+    registry = JobRegistry(db=db_manager, keypair=DummyKeypair(), adapter=mock_adapter)
+    try:
+        repo.insert_pending(registry, execution_id="b1", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+        assert "b1" in registry._seen_filter
+
+        lookups = []
+        monkeypatch.setattr(registry.store, "exists", lambda execution_id: lookups.append(execution_id) or False)
+        # A row the index lost track of is still caught through the filter
+        registry._state_index.remove(["b1"])
+        assert not registry.is_known("b1") and lookups == ["b1"]
+        assert not registry.is_known("never-seen") and lookups == ["b1"]
+    finally:
+        registry.stop()
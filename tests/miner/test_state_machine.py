@@ -0,0 +1,158 @@
+from qbittensor.miner.runtime import repository as repo
+from qbittensor.miner.runtime.state_index import ExecutionStateIndex
+from qbittensor.miner.runtime.state_machine import ExecutionStateMachine
+from qbittensor.miner.runtime.storage import InMemoryExecutionStore
+from qbittensor.validator.utils.execution_status import ExecutionStatus
+
+
+class DummyHandle:
+    provider_job_id = "pj"
+    device_id = "dev"
+
+
+class CountingStore(InMemoryExecutionStore):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def upsert(self, record):
+        self.writes += 1
+        super().upsert(record)
+
+    def update(self, execution_id, **changes):
+        self.writes += 1
+        super().update(execution_id, **changes)
+
+
+class MachineRegistry:
+    def __init__(self):
+        self.store = CountingStore()
+        self._state_index = ExecutionStateIndex()
+        self._state_machine = ExecutionStateMachine(self._state_index)
+        self.events = []
+        self._state_machine.add_listener(self.events.append)
+
+
+def test_repeated_status_is_written_once():
+    r = MachineRegistry()
+    repo.insert_pending(r, execution_id="e1", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    repo.update_to_queued(r, execution_id="e1", handle=DummyHandle())
+    for _ in range(50):
+        repo.update_status(r, execution_id="e1", status=ExecutionStatus.RUNNING)
+
+    assert r.store.writes == 3
+    assert [(e.old_status, e.new_status) for e in r.events] == [(None, "Pending"), ("Pending", "Queued"), ("Queued", "Running")]
+    stats = r._state_machine.stats()
+    assert stats["transitions"] == 3 and stats["unchanged"] == 49 and stats["rejected"] == 0
+    assert set(stats["dwell"]) == {"Pending", "Queued"}
+
+
+def test_concurrent_writers_cannot_both_pass_the_check():
+    """A Queued write racing a slow Pending insert waits for it instead of being overwritten by it."""
+    import threading
+
+    r = MachineRegistry()
+    in_upsert, release = threading.Event(), threading.Event()
+    upsert = r.store.upsert
+
+    def slow_upsert(record):
+        in_upsert.set()
+        release.wait(5)
+        upsert(record)
+
+    r.store.upsert = slow_upsert
+    pending = threading.Thread(target=repo.insert_pending, kwargs=dict(registry=r, execution_id="e1", validator_hotkey="vhk", handle=DummyHandle(), shots=1))
+    pending.start()
+    assert in_upsert.wait(5)
+    queued = threading.Thread(target=repo.update_to_queued, kwargs=dict(registry=r, execution_id="e1", handle=DummyHandle()))
+    queued.start()
+    queued.join(0.1)
+    assert queued.is_alive()  # waiting on the execution's lock
+    release.set()
+    pending.join(5)
+    queued.join(5)
+
+    assert r.store.get("e1").status == "Queued"
+    assert r._state_index.get("e1") == "Queued"
+    assert [(e.old_status, e.new_status) for e in r.events] == [(None, "Pending"), ("Pending", "Queued")]
+
+
+def test_invalid_transitions_are_rejected():
+    r = MachineRegistry()
+    repo.insert_pending(r, execution_id="e1", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    repo.update_status(r, execution_id="e1", status=ExecutionStatus.RUNNING)
+    repo.update_status(r, execution_id="e1", status="Queued")
+    assert r.store.get("e1").status == "Running"
+
+    repo.persist_failed(r, execution_id="e1", validator_hotkey="vhk", provider=None, provider_job_id=None, device_id=None, error_message="boom")
+    repo.update_status(r, execution_id="e1", status=ExecutionStatus.RUNNING)
+    assert r.store.get("e1").status == "Failed"
+    assert r._state_machine.stats()["rejected"] == 2
+
+
+def test_failed_completion_can_be_retried():
+    r = MachineRegistry()
+    repo.insert_pending(r, execution_id="e1", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    repo.persist_failed(r, execution_id="e1", validator_hotkey="vhk", provider=None, provider_job_id=None, device_id=None, error_message="upload")
+
+    class T:
+        execution_id = "e1"
+        validator_hotkey = "vhk"
+
+    repo.persist_completed(r, tracked=T(), receipt=object(), upload_data_id="u1")
+    assert r.store.get("e1").status == "Completed"
+    assert r.events[-1].old_status == "Failed" and r.events[-1].new_status == "Completed"
+
+
+def test_repeated_failure_records_the_latest_error():
+    r = MachineRegistry()
+    repo.insert_pending(r, execution_id="e1", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    repo.persist_failed(r, execution_id="e1", validator_hotkey="vhk", provider=None, provider_job_id=None, device_id=None, error_message="first")
+    repo.persist_failed(r, execution_id="e1", validator_hotkey="vhk", provider=None, provider_job_id=None, device_id=None, error_message="second")
+
+    record = r.store.get("e1")
+    assert record.status == "Failed" and record.error_message == "second"
+    assert [(e.old_status, e.new_status) for e in r.events] == [(None, "Pending"), ("Pending", "Failed")]
+
+
+def test_stuck_executions_are_reported_once():
+    r = MachineRegistry()
+    r._state_machine.stuck_after_s = {"Queued": 10.0}
+    repo.insert_pending(r, execution_id="e1", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    repo.update_to_queued(r, execution_id="e1", handle=DummyHandle())
+    queued_at = r.events[-1].at
+
+    assert r._state_machine.stuck(now=queued_at + 5) == []
+    assert [s[:2] for s in r._state_machine.report_stuck(now=queued_at + 11)] == [("e1", "Queued")]
+    assert r._state_machine.report_stuck(now=queued_at + 20) == []
+    assert r._state_machine.stats(now=queued_at + 20)["stuck"] == 1
+
+
+def test_stuck_reports_are_forgotten_when_execution_moves_on_or_is_pruned():
+    r = MachineRegistry()
+    machine = r._state_machine
+    machine.stuck_after_s = {"Queued": 10.0}
+    for execution_id in ("e1", "e2"):
+        repo.insert_pending(r, execution_id=execution_id, validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+        repo.update_to_queued(r, execution_id=execution_id, handle=DummyHandle())
+    queued_at = r.events[-1].at
+    assert len(machine.report_stuck(now=queued_at + 11)) == 2
+
+    repo.update_status(r, execution_id="e1", status=ExecutionStatus.RUNNING)
+    assert machine._reported_stuck == {("e2", "Queued")}
+
+    r._state_index.remove(["e2"])
+    machine.forget_unindexed()
+    assert machine._reported_stuck == set()
+
+
+def test_registry_forwards_nonterminal_transitions(registry):
+    repo.insert_pending(registry, execution_id="t1", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    repo.update_to_queued(registry, execution_id="t1", handle=DummyHandle())
+    repo.update_to_queued(registry, execution_id="t1", handle=DummyHandle())
+
+    forwarded = []
+    while not registry._transition_queue.empty():
+        forwarded.append(registry._transition_queue.get_nowait().new_status)
+    assert forwarded == ["Queued"]
+    assert registry.state_stats()["unchanged"] == 1
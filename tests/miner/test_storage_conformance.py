@@ -0,0 +1,141 @@
+"""Behaviour every ExecutionStore backend must share."""
+import pytest
+
+from qbittensor.miner.runtime.storage import (
+    ExecutionRecord,
+    InMemoryExecutionStore,
+    MmapExecutionStore,
+    SQLiteExecutionStore,
+    get_execution_store,
+)
+from qbittensor.miner.runtime.write_behind import WriteBehindWriter
+from qbittensor.validator.utils.execution_status import ExecutionStatus
+
+
+@pytest.fixture(params=["sqlite", "sqlite-write-behind", "memory", "mmap"])
+def store(request, db_manager, temp_db):
+    if request.param == "sqlite":
+        s = SQLiteExecutionStore(db_manager)
+    elif request.param == "sqlite-write-behind":
+        s = SQLiteExecutionStore(db_manager, WriteBehindWriter(db_manager, flush_interval_s=60))
+    elif request.param == "memory":
+        s = InMemoryExecutionStore()
+    else:
+        s = MmapExecutionStore(str(temp_db / "executions.log"))
+    s.start()
+    try:
+        yield s
+    finally:
+        s.close()
+
+
+def _record(execution_id, status="Completed", timestamp="2025-01-01 00:00:00", **kwargs):
+    return ExecutionRecord(execution_id=execution_id, status=status, timestamp=timestamp, **kwargs)
+
+
+def test_upsert_and_get_round_trip(store):
+    record = _record(
+        "e1",
+        upload_data_id="up-1",
+        validator_hotkey="vhk",
+        provider="mock",
+        provider_job_id="prov-1",
+        device_id="dev",
+        error_message=None,
+        cost=1.5,
+        shots=100,
+        timestamps_json="{}",
+        metadata_json='{"a": 1}',
+        completed_at="2025-01-01 00:00:00",
+    )
+    store.upsert(record)
+    assert store.get("e1") == record
+    assert store.exists("e1")
+    assert not store.exists("missing")
+    assert store.get("missing") is None
+
+
+def test_upsert_replaces_whole_record(store):
+    store.upsert(_record("e1", shots=10, error_message="old"))
+    store.upsert(_record("e1", status="Failed"))
+    record = store.get("e1")
+    assert record.status == "Failed"
+    assert record.shots is None
+    assert record.error_message is None
+    assert store.count() == 1
+
+
+def test_update_changes_fields_of_known_records_only(store):
+    store.upsert(_record("e1", status="Pending", shots=5))
+    store.update("e1", status=ExecutionStatus.QUEUED, provider_job_id="prov-9", timestamp="2025-01-02 00:00:00")
+    store.update("missing", status="Queued")
+
+    record = store.get("e1")
+    assert record.status == "Queued"
+    assert record.provider_job_id == "prov-9"
+    assert record.shots == 5
+    assert record.timestamp == "2025-01-02 00:00:00"
+    assert not store.exists("missing")
+
+
+def test_update_rejects_unknown_fields(store):
+    store.upsert(_record("e1"))
+    with pytest.raises(ValueError):
+        store.update("e1", colour="blue")
+
+
+def test_enum_statuses_are_stored_as_strings(store):
+    store.upsert(_record("e1", status=ExecutionStatus.COMPLETED))
+    assert store.get("e1").status == "Completed"
+    assert store.states() == [("e1", "Completed", "2025-01-01 00:00:00")]
+
+
+def test_finished_since_filters_by_timestamp_and_running(store):
+    store.upsert(_record("old", timestamp="2025-01-01 00:00:00"))
+    store.upsert(_record("running", status="Running", timestamp="2025-01-03 00:00:00"))
+    store.upsert(_record("failed", status="Failed", timestamp="2025-01-03 00:00:00", error_message="boom"))
+    store.upsert(_record("done", timestamp="2025-01-02 00:00:00"))
+
+    found = store.finished_since("2025-01-01 00:00:00")
+    assert [r.execution_id for r in found] == ["done", "failed"]
+    assert found[1].error_message == "boom"
+
+
+def test_delete_before_removes_only_expired_records(store):
+    for i in range(30):
+        store.upsert(_record(f"old-{i}", timestamp=f"2025-01-01 00:00:{i:02d}"))
+    store.upsert(_record("new", timestamp="2025-02-01 00:00:00"))
+
+    assert store.delete_before("2025-01-15 00:00:00", batch_size=7, max_batches=2) == 14
+    assert store.delete_before("2025-01-15 00:00:00") == 16
+    assert [eid for eid, _, _ in store.states()] == ["new"]
+    assert store.count() == 1
+
+
+def test_writes_are_visible_after_flush_from_other_threads(store):
+    import threading
+
+    threads = [
+        threading.Thread(target=lambda i=i: store.upsert(_record(f"e{i}", timestamp=f"2025-01-01 00:00:{i:02d}")))
+        for i in range(20)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    store.flush()
+    assert store.count() == 20
+
+
+def test_factory_resolves_backends_by_name(db_manager, monkeypatch):
+    assert isinstance(get_execution_store(db_manager), SQLiteExecutionStore)
+    assert isinstance(get_execution_store(db_manager, "memory"), InMemoryExecutionStore)
+    monkeypatch.setenv("MINER_STORAGE_BACKEND", "mmap")
+    mmap_store = get_execution_store(db_manager)
+    try:
+        assert isinstance(mmap_store, MmapExecutionStore)
+        assert mmap_store.path.endswith("miner_test.executions.log")
+    finally:
+        mmap_store.close()
+    with pytest.raises(ValueError):
+        get_execution_store(db_manager, "nope")
@@ -0,0 +1,144 @@
+import threading
+import time
+
+from qbittensor.miner.runtime.submit_pool import SubmitPool
+
+
+class RecordingRegistry:
+    def __init__(self, gate=None):
+        self.order = []
+        self.gate = gate
+
+    def _submit_request(self, request):
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        self.order.append((request.validator_hotkey, request.execution_id))
+        return True
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_backpressure_limits_queue_and_validator_share():
+    gate = threading.Event()
+    pool = SubmitPool(RecordingRegistry(gate), workers=1, max_queue=4, max_per_validator=2)
+    try:
+        assert pool.offer("a1", "u", "A", 1)
+        assert _wait_for(lambda: pool.stats()["active"] == 1)  # a1 is held by the worker
+        assert pool.offer("a2", "u", "A", 1)
+        assert pool.offer("a3", "u", "A", 1)
+        assert not pool.offer("a4", "u", "A", 1)  # A's share is full
+        assert pool.offer("b1", "u", "B", 1)
+        assert pool.offer("c1", "u", "C", 1)
+        assert not pool.offer("d1", "u", "D", 1)  # pool is full
+        assert pool.offer("a2", "u", "A", 1)  # already queued
+        assert pool.stats()["rejected"] == 2
+    finally:
+        gate.set()
+        pool.shutdown()
+
+
+def test_validators_are_served_round_robin():
+    gate = threading.Event()
+    registry = RecordingRegistry(gate)
+    pool = SubmitPool(registry, workers=1, max_queue=10, max_per_validator=10)
+    try:
+        pool.offer("hold", "u", "X", 1)
+        assert _wait_for(lambda: pool.stats()["active"] == 1)
+        for i in range(3):
+            pool.offer(f"a{i}", "u", "A", 1)
+        pool.offer("b0", "u", "B", 1)
+        pool.offer("c0", "u", "C", 1)
+        gate.set()
+        assert _wait_for(lambda: len(registry.order) == 6)
+        assert [eid for _, eid in registry.order] == ["hold", "a0", "b0", "c0", "a1", "a2"]
+        assert pool.stats()["submitted"] == 6
+    finally:
+        pool.shutdown()
+
+
+def test_registry_fails_execution_when_circuit_is_unreachable(registry, monkeypatch):
+    from qbittensor.miner.runtime.io.circuit_fetcher import CircuitFetchError
+
+    def unreachable(url):
+        raise CircuitFetchError("404")
+
+    monkeypatch.setattr(registry, "fetch_circuit", unreachable)
+    assert registry.accept(execution_id="dl-1", input_data_url="http://qasm", validator_hotkey="vhk", shots=1)
+    assert _wait_for(lambda: registry._state_index.get("dl-1") == "Failed")
+    registry.flush_writes()
+    assert "Circuit download failed" in registry.store.get("dl-1").error_message
+
+
+def test_registry_fails_execution_when_provider_submit_fails(registry, monkeypatch):
+    def rejecting_submit(**kwargs):
+        raise RuntimeError("provider rejected the circuit")
+
+    monkeypatch.setattr(registry, "fetch_circuit", lambda url: type("C", (), {"text": "OPENQASM 2.0;"})())
+    monkeypatch.setattr(registry.adapter, "submit", rejecting_submit)
+    for i in range(5):
+        assert registry.accept(execution_id=f"ps-{i}", input_data_url="http://qasm", validator_hotkey="vhk", shots=1)
+    assert _wait_for(lambda: registry.submit_stats()["failed"] == 5)
+    assert all(registry._state_index.get(f"ps-{i}") == "Failed" for i in range(5))
+    assert registry.get_inflight_count() == 0
+    registry.flush_writes()
+    assert "Provider submit failed" in registry.store.get("ps-0").error_message
+
+
+def test_accept_persists_pending_before_workers_see_the_execution(registry, monkeypatch):
+    from qbittensor.miner.runtime import registry as registry_module
+
+    seen = []
+    inserts = []
+    insert_pending = registry_module.insert_pending
+
+    def counting_insert(*args, **kwargs):
+        inserts.append(kwargs["execution_id"])
+        return insert_pending(*args, **kwargs)
+
+    def record_status(request):
+        seen.append(registry._state_index.get(request.execution_id))
+        return registry.submit(request.execution_id, request.input_data_url, request.validator_hotkey, request.shots, qasm="OPENQASM 2.0;", pending_persisted=True)
+
+    monkeypatch.setattr(registry_module, "insert_pending", counting_insert)
+    monkeypatch.setattr(registry, "_submit_request", record_status)
+    assert registry.accept(execution_id="ord-1", input_data_url="http://qasm", validator_hotkey="vhk", shots=1)
+    assert _wait_for(lambda: registry._state_index.get("ord-1") == "Queued")
+    assert seen == ["Pending"]
+    assert inserts == ["ord-1"]
+
+
+def test_accept_fails_execution_when_pool_fills_after_room_check(registry, monkeypatch):
+    monkeypatch.setattr(registry._submit_pool, "offer", lambda *args: False)
+    assert not registry.accept(execution_id="full-1", input_data_url="http://qasm", validator_hotkey="vhk", shots=1)
+    assert registry._state_index.get("full-1") == "Failed"
+
+
+def test_restart_fails_executions_that_were_never_submitted(db_manager, mock_adapter):
+    from qbittensor.miner.runtime import repository as repo
+    from qbittensor.miner.runtime.registry import JobRegistry
+    from tests.conftest import DummyKeypair
+
+    class Handle:
+        def __init__(self, provider_job_id):
+            self.provider_job_id = provider_job_id
+            self.device_id = "dev"
+
+    first = JobRegistry(db=db_manager, keypair=DummyKeypair(), adapter=mock_adapter)
+    repo.insert_pending(first, execution_id="never-submitted", validator_hotkey="vhk", handle=Handle(None), shots=1)
+    repo.insert_pending(first, execution_id="submitted", validator_hotkey="vhk", handle=Handle("pj-1"), shots=1)
+    first.stop()
+
+    second = JobRegistry(db=db_manager, keypair=DummyKeypair(), adapter=mock_adapter)
+    try:
+        assert second._state_index.get("never-submitted") == "Failed"
+        assert second.store.get("never-submitted").error_message == "Miner restarted before submission"
+        assert second._state_index.get("submitted") == "Pending"
+    finally:
+        second.stop()
@@ -0,0 +1,75 @@
+import gzip
+import json
+import random
+
+import pytest
+
+from qbittensor.miner.runtime.io import upload_encoder as ue
+from qbittensor.miner.runtime.types import UploadDataResponse
+
+
+def _counts(qubits=33, distinct=5000, seed=7):
+    rng = random.Random(seed)
+    return {format(rng.getrandbits(qubits), f"0{qubits}b"): rng.randint(1, 300) for _ in range(distinct)}
+
+
+def test_json_body_round_trips_across_chunks():
+    counts = _counts()
+    body = ue.encode_counts(counts, "json")
+    data = body.file.read()
+    body.close()
+    assert json.loads(data) == counts
+    assert body.headers == {"Content-Type": "application/json", "Content-Length": str(len(data))}
+    assert json.loads(b"".join(ue.iter_json({}))) == {}
+
+
+def test_packed_gzip_body_round_trips_and_is_smaller():
+    counts = _counts()
+    body = ue.encode_counts(counts, "packed", "gzip")
+    data = body.file.read()
+    body.close()
+    assert body.headers["Content-Encoding"] == "gzip"
+    assert body.headers["Content-Type"] == ue.PACKED_CONTENT_TYPE
+    assert ue.decode_packed(gzip.decompress(data)) == counts
+    assert len(data) < len(json.dumps(counts)) / 2
+
+
+def test_large_bodies_spool_to_disk(monkeypatch):
+    monkeypatch.setattr(ue, "SPOOL_MAX_MEMORY_BYTES", 1024)
+    body = ue.encode_counts(_counts(), "json")
+    assert body.file._rolled
+    body.close()
+
+
+def test_packed_left_pads_mixed_widths():
+    data = b"".join(ue.iter_packed({"1": 1, "011": 2, "10": 4}))
+    assert ue.decode_packed(data) == {"001": 1, "011": 2, "010": 4}
+    # "1" and "01" become the same key; their counts are summed
+    assert ue.decode_packed(b"".join(ue.iter_packed({"1": 1, "01": 2}))) == {"01": 3}
+
+
+def test_packed_rejects_unknown_options():
+    with pytest.raises(ValueError):
+        ue.encode_counts({"0": 1}, "xml")
+    with pytest.raises(ValueError):
+        ue.encode_counts({"0": 1}, "json", "br")
+
+
+def test_put_follows_the_upload_slot_format(monkeypatch):
+    from qbittensor.miner.runtime.flows import completion_flow as cf
+
+    sent = {}
+
+    class Resp:
+        def raise_for_status(self):
+            pass
+
+    def fake_put(url, data=None, headers=None, timeout=None):
+        sent.update(url=url, body=data.read(), headers=headers)
+        return Resp()
+
+    monkeypatch.setattr(cf.requests, "put", fake_put)
+    slot = UploadDataResponse(upload_url="http://s3/presigned", id="rid", result_format="packed", content_encoding="gzip")
+    cf._attempt_put(slot, {"00": 3, "11": 5})
+    assert ue.decode_packed(gzip.decompress(sent["body"])) == {"00": 3, "11": 5}
+    assert sent["headers"]["Content-Length"] == str(len(sent["body"]))
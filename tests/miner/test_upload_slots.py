@@ -0,0 +1,62 @@
+import itertools
+import time
+
+from qbittensor.miner.runtime import upload_slots as us
+from qbittensor.miner.runtime.types import UploadDataResponse
+from qbittensor.miner.runtime.upload_slots import UploadSlotPool
+
+
+def _fetcher(url="http://s3/presigned"):
+    ids = itertools.count()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return UploadDataResponse(upload_url=url, id=f"rid-{next(ids)}")
+
+    return fetch, calls
+
+
+def test_idle_pool_prefetches_nothing_and_take_falls_back_to_fetch():
+    fetch, calls = _fetcher()
+    pool = UploadSlotPool(fetch, max_slots=8)
+    assert pool.refill() == 0 and calls == []
+    assert pool.take().id == "rid-0"
+    assert pool.stats()["misses"] == 1
+
+
+def test_target_follows_completion_rate_and_take_uses_ready_slots(monkeypatch):
+    monkeypatch.setattr(us, "RATE_WINDOW_S", 10.0)
+    monkeypatch.setattr(us, "HORIZON_S", 5.0)
+    fetch, calls = _fetcher()
+    pool = UploadSlotPool(fetch, max_slots=3)
+    for _ in range(4):
+        pool.take()
+    assert pool.target_size() == 2
+    assert pool.refill() == 2 and pool.size() == 2
+    assert pool.take().id == "rid-4"  # Oldest prefetched slot first
+    assert pool.stats()["hits"] == 1
+
+    for _ in range(20):
+        pool.take()
+    assert pool.target_size() == 3  # Clamped to max_slots
+
+
+def test_slots_are_evicted_by_age_and_url_expiry(monkeypatch):
+    fetch, _ = _fetcher("https://bucket.s3.amazonaws.com/k?X-Amz-Expires=1&X-Amz-Signature=abc")
+    pool = UploadSlotPool(fetch, max_slots=4, min_slots=2, max_age_s=300)
+    assert pool.refill() == 2
+    now = time.monotonic()
+    monkeypatch.setattr(us.time, "monotonic", lambda: now + 0.9)
+    pool.take()
+    assert pool.stats()["evicted"] == 2 and pool.stats()["misses"] == 1
+
+
+def test_completion_uses_prefetched_slot(registry, http_mock, monkeypatch):
+    fetch, calls = _fetcher()
+    registry._upload_slots = UploadSlotPool(fetch, max_slots=4, min_slots=1)
+    registry._upload_slots.refill()
+    posts = []
+    monkeypatch.setattr(registry, "_get_upload_data", lambda: posts.append(1))
+    assert registry._take_upload_data().id == "rid-0"
+    assert posts == [] and len(calls) == 1
@@ -0,0 +1,77 @@
+import time
+
+from qbittensor.miner.runtime import repository as repo
+from qbittensor.miner.runtime.write_behind import WriteBehindWriter
+from qbittensor.validator.utils.execution_status import ExecutionStatus
+
+
+class DummyHandle:
+    provider_job_id = "prov-1"
+    device_id = "mock_qpu_1"
+
+
+class DummyRegistry:
+    def __init__(self, dbm, writer):
+        self.database_manager = dbm
+        self._default_device = type("D", (), {"provider": "mock"})()
+        self._write_behind = writer
+
+
+def _status(dbm, execution_id):
+    with dbm.lock:
+        row = dbm.query_one_with_values("SELECT status FROM executions WHERE execution_id = ?", (execution_id,))
+    return row[0] if row else None
+
+
+def test_writes_are_deferred_until_flush(db_manager):
+    writer = WriteBehindWriter(db_manager, max_batch=1000, flush_interval_s=60)
+    r = DummyRegistry(db_manager, writer)
+    repo.insert_pending(r, execution_id="wb1", validator_hotkey="vhk", handle=DummyHandle(), shots=10)
+    repo.update_status(r, execution_id="wb1", status=ExecutionStatus.RUNNING)
+    assert writer.pending_count() == 2
+    assert _status(db_manager, "wb1") is None
+
+    writer.flush()
+    assert writer.pending_count() == 0
+    assert writer.batches_committed == 1
+    assert _status(db_manager, "wb1") == ExecutionStatus.RUNNING
+
+
+def test_background_thread_flushes_on_size(db_manager):
+    writer = WriteBehindWriter(db_manager, max_batch=5, flush_interval_s=60)
+    writer.start()
+    try:
+        r = DummyRegistry(db_manager, writer)
+        for i in range(5):
+            repo.insert_pending(r, execution_id=f"wb-{i}", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+        deadline = time.time() + 2.0
+        while writer.statements_committed < 5 and time.time() < deadline:
+            time.sleep(0.01)
+        assert writer.statements_committed == 5
+        assert _status(db_manager, "wb-4") == ExecutionStatus.PENDING
+    finally:
+        writer.stop()
+
+
+def test_bad_statement_does_not_drop_batch(db_manager):
+    writer = WriteBehindWriter(db_manager, max_batch=1000, flush_interval_s=60)
+    r = DummyRegistry(db_manager, writer)
+    repo.insert_pending(r, execution_id="ok-1", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    writer.submit("INSERT INTO no_such_table VALUES (?)", (1,))
+    repo.insert_pending(r, execution_id="ok-2", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+    writer.flush()
+    assert _status(db_manager, "ok-1") == ExecutionStatus.PENDING
+    assert _status(db_manager, "ok-2") == ExecutionStatus.PENDING
+
+
+def test_registry_counts_read_own_writes(db_manager, mock_adapter):
+    from qbittensor.miner.runtime.registry import JobRegistry
+    from tests.conftest import DummyKeypair
+
+    reg = JobRegistry(db=db_manager, keypair=DummyKeypair(), adapter=mock_adapter, write_behind=True)
+    reg._write_behind.flush_interval_s = 60
+    try:
+        repo.insert_pending(reg, execution_id="c1", validator_hotkey="vhk", handle=DummyHandle(), shots=1)
+        assert reg.get_pending_count() == 1
+    finally:
+        reg.stop()
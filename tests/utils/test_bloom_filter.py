@@ -0,0 +1,13 @@
+from qbittensor.utils.bloom_filter import BloomFilter
+
+
+def test_added_keys_are_always_found():
+    bloom = BloomFilter.from_keys((f"exec-{i}" for i in range(5000)), capacity=5000, error_rate=0.01)
+    assert all(f"exec-{i}" in bloom for i in range(5000))
+
+
+def test_false_positive_rate_is_near_target():
+    bloom = BloomFilter.from_keys((f"exec-{i}" for i in range(10000)), capacity=10000, error_rate=0.01)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+    assert bloom.nbytes < 13000
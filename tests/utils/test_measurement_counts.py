@@ -0,0 +1,68 @@
+import random
+
+import numpy as np
+import pytest
+
+from qbittensor.utils.measurement_counts import MeasurementCounts
+
+
+def _counts(qubits=37, distinct=3000, seed=3):
+    rng = random.Random(seed)
+    return {format(rng.getrandbits(qubits), f"0{qubits}b"): rng.randint(0, 500) for _ in range(distinct)}
+
+
+def test_dict_round_trip_keeps_order_and_packs_keys():
+    counts = _counts()
+    mc = MeasurementCounts.from_dict(counts)
+    assert mc.to_dict() == counts and list(mc.to_dict()) == list(counts)
+    assert mc.keys.shape == (len(counts), 5) and mc.keys.dtype == np.uint8
+    assert mc.total() == sum(counts.values())
+    # Keys are the big-endian integer value of the bitstring
+    first = next(iter(counts))
+    assert int.from_bytes(mc.keys[0].tobytes(), "big") == int(first, 2)
+
+
+@pytest.mark.parametrize("bad", [
+    {},
+    {"2": 1},
+    {"01": -1},
+    {"01": 1.5},
+    {"01": "3"},
+    {"0 1": 1},
+    {"01": 1, "011": 1},
+    {"0é": 1},
+    {1: 1},
+    {"01": 2**63},
+    {"01": 2**64},
+])
+def test_is_valid_rejects_bad_payloads(bad):
+    assert not MeasurementCounts.is_valid(bad)
+
+
+def test_top_k_and_most_frequent():
+    mc = MeasurementCounts.from_dict({"000": 5, "101": 9, "110": 9, "111": 1})
+    assert mc.top_k(3) == [("101", 9), ("110", 9), ("000", 5)]
+    assert mc.most_frequent() == "101"
+    assert MeasurementCounts.from_dict({}).most_frequent() is None
+
+
+@pytest.mark.parametrize("qubits", [3, 30, 70])
+def test_from_measurements_collapses_shots_by_value(qubits):
+    rng = random.Random(qubits)
+    pool = [format(rng.getrandbits(qubits), f"0{qubits}b") for _ in range(50)]
+    shots = [rng.choice(pool) for _ in range(2000)]
+    expected = {}
+    for shot in shots:
+        expected[shot] = expected.get(shot, 0) + 1
+    mc = MeasurementCounts.from_measurements(shots)
+    assert mc.to_dict() == expected
+    assert mc.bitstrings() == sorted(expected)
+    assert MeasurementCounts.from_bits(np.array([[int(c) for c in s] for s in shots])).to_dict() == expected
+
+
+@pytest.mark.parametrize("counts", [_counts(), {"0101": 200, "1111": 100000, "0000": 3}, {"": 4}])
+def test_packed_wire_format_round_trips(counts):
+    mc = MeasurementCounts.from_dict(counts)
+    data = mc.to_packed_bytes()
+    assert MeasurementCounts.from_packed_bytes(data).to_dict() == counts
+    assert b"".join(mc.iter_packed(chunk_entries=7)) == data
@@ -0,0 +1,34 @@
+import numpy as np
+
+from qbittensor.utils.results_normalizer import largest_remainder_counts, normalize_measurement_counts
+
+
+def test_counts_forms_pass_through():
+    counts, best = normalize_measurement_counts({"counts": {"00": "3", "11": 5}}, shots=None)
+    assert counts == {"00": 3, "11": 5} and best == "11"
+
+
+def test_probabilities_keep_the_shot_total():
+    probs = {"000": 1 / 3, "011": 1 / 3, "111": 1 / 3}
+    counts, best = normalize_measurement_counts({"probabilities": probs}, shots=100)
+    assert sum(counts.values()) == 100
+    assert counts == {"000": 34, "011": 33, "111": 33} and best == "000"
+
+
+def test_largest_remainder_rescales_and_clips():
+    assert largest_remainder_counts(np.array([0.2, 0.2, -0.1, 0.1]), 7).tolist() == [3, 3, 0, 1]
+    assert largest_remainder_counts(np.array([0.0, 0.0]), 10).tolist() == [0, 0]
+
+
+def test_measurements_collapse_strings_and_bit_rows():
+    shots = ["11", "00", "11", "01", "11"]
+    counts, best = normalize_measurement_counts({"measurements": shots}, shots=5)
+    assert counts == {"00": 1, "01": 1, "11": 3} and best == "11"
+    rows = [[int(c) for c in s] for s in shots]
+    assert normalize_measurement_counts({"measurements": rows}, shots=5) == (counts, best)
+
+
+def test_irregular_measurements_are_counted_as_strings():
+    counts, best = normalize_measurement_counts({"measurements": ["1", "10", "10"]}, shots=3)
+    assert counts == {"1": 1, "10": 2} and best == "10"
+    assert normalize_measurement_counts("bad", shots=1) == (None, None)
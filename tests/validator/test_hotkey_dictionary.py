@@ -0,0 +1,44 @@
+from pkg.database.database_manager import DatabaseManager
+from qbittensor.utils.timestamping import timestamp_epoch
+from qbittensor.validator.utils.hotkey_dictionary import HotkeyDictionary
+from qbittensor.validator.vali_table_initializer import ValidatorTableInitializer
+from qbittensor.validator.weights.WeightSetter import WeightSetter
+
+
+def _database(name: str) -> DatabaseManager:
+    dbm = DatabaseManager(name)
+    ValidatorTableInitializer(dbm).create_tables()
+    return dbm
+
+
+def test_ids_are_stable_and_shared_through_the_table(temp_db):
+    dbm = _database("hotkey_dictionary")
+    hotkeys = HotkeyDictionary(dbm)
+    first = hotkeys.id_for("hk_a")
+    assert hotkeys.id_for("hk_a") == first
+    assert hotkeys.ids_for(["hk_b", "hk_a", "hk_b"]) == {"hk_b": first + 1, "hk_a": first}
+
+    # A second dictionary (e.g. another component) resolves the same ids from the table
+    other = HotkeyDictionary(dbm)
+    assert other.id_for("hk_b") == first + 1
+    assert other.hotkey_for(first) == "hk_a"
+    assert other.hotkey_for(999) is None
+    assert dbm.get_size_of_table("hotkey") == 2
+
+
+def test_weight_lookback_joins_through_the_dictionary(temp_db):
+    dbm = _database("hotkey_weights")
+    hotkeys = HotkeyDictionary(dbm)
+    now = timestamp_epoch()
+    rows = [
+        (hotkeys.id_for("hk_a"), "e1", now - 60, 100),
+        (hotkeys.id_for("hk_a"), "e2", now - 60, 50),
+        (hotkeys.id_for("hk_b"), "e3", now - 60, None),  # Not yet costed
+        (hotkeys.id_for("hk_b"), "e4", now - 30 * 24 * 3600, 999),  # Outside the lookback
+        (hotkeys.id_for("hk_c"), "e5", now - 60, 25),
+    ]
+    dbm.query_and_commit_many("INSERT INTO successful_job (hotkey_id, execution_id, created_at, cost) VALUES (?, ?, ?, ?)", rows)
+
+    ws = WeightSetter.__new__(WeightSetter)
+    ws.database_manager = dbm
+    assert sorted(ws._get_execution_costs_per_hotkey()) == [("hk_a", 150), ("hk_c", 25)]
@@ -276,3 +276,26 @@ class TestPatchJobRejectedSerialization:
             body = mock_patch.call_args[0][1]
             assert body["message"] == error
             assert body["status"] == ExecutionStatus.FAILED
+
+
+def test_responses_written_through_database_thread(temp_db, synapse, compute_request, mock_axon, monkeypatch):
+    """With an AsyncDatabaseManager, response bookkeeping is queued on the database thread and lands after a flush."""
+    from pkg.database.async_database_manager import AsyncDatabaseManager
+    from qbittensor.validator.vali_table_initializer import ValidatorTableInitializer
+
+    database_manager = DatabaseManager("validator_async_scorer")
+    ValidatorTableInitializer(database_manager).create_tables()
+    async_db = AsyncDatabaseManager(database_manager)
+    monkeypatch.setattr(RequestManager, "patch", lambda *a, **k: None)
+    scorer = Scorer(database_manager, get_mock_metagraph(5), RequestManager(get_mock_keypair()), async_db)
+    monkeypatch.setattr(scorer.telemetry_service, "_enqueue_datapoint", lambda *a, **k: None)
+    try:
+        scorer.process_miner_responses([synapse], BasicMiner(hotkey="miner_hotkey_1", uid=2, axon=mock_axon), compute_request)
+        async_db.flush(5)
+        assert database_manager.query(
+            "SELECT h.hotkey, j.execution_id FROM successful_job j JOIN hotkey h ON h.id = j.hotkey_id"
+        ) == [("miner_hotkey_1", "job123")]
+        assert database_manager.query("SELECT timestamp FROM last_circuit") == [(synapse.last_circuit,)]
+        assert database_manager.query("SELECT time_received IS NOT NULL FROM execution_metrics") == [(1,)]
+    finally:
+        async_db.close()